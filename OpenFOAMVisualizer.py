@@ -1,12 +1,38 @@
+import functools
 import os
+import threading
+from contextlib import contextmanager
 import numpy as np
 import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
 from pathlib import Path
+from time import monotonic
 import pandas as pd
 import pyvista as pv
 from foamlib import FoamCase
-from typing import List, Dict, Tuple, Optional, Union, Any
+from typing import Callable, List, Dict, Tuple, Optional, Union, Any
+
+from foam_io import component_names, mesh_signature
+from postprocessing.catalog import CatalogEntry, PostProcessingCatalog
+from postprocessing.derived import DERIVED_FIELDS, DerivedContext, add_derived_array, available_derived_fields
+from postprocessing.envelopes import EnvelopeStore
+from postprocessing.export import MANIFEST_NAME, ExportStore, export_dir
+from postprocessing.glyphs import uniform_sample_ids
+from postprocessing.locator import CellLocator, probe_time_series, read_internal_mesh
+from postprocessing.probes import ProbeSeriesReader
+from postprocessing.regions import MultiRegionReader
+from postprocessing.sets import read_xy_files
+from postprocessing.spacetime import SpaceTimeLine, cumulative_distance, resample_polyline, stack_profiles
+from postprocessing.statistics import field_range, load_field_statistics, stats_index_path
+
+
+def _synchronized(method):
+    """Run a visualizer method under the visualizer's lock; visualizers are shared by all sessions."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class OpenFOAMVisualizer:
@@ -27,17 +53,26 @@ class OpenFOAMVisualizer:
         "colorblind": mcolors.LinearSegmentedColormap.from_list("colorblind", ["#0072B2", "#009E73", "#D55E00", "#CC79A7", "#F0E442", "#56B4E9"])
     }
 
-    def __init__(self, case_path: Union[str, Path], region: Optional[str] = None):
+    # Default triangle budget for level-of-detail surfaces sent to the browser
+    LOD_TARGET_TRIANGLES = 200_000
+
+    def __init__(self, case_path: Union[str, Path], region: Optional[str] = None,
+                 region_readers: Optional[Callable[[Path], MultiRegionReader]] = None):
         """
         Initialize the OpenFOAM visualization backend.
 
         Parameters:
             case_path: Path to the OpenFOAM case directory
+            region_readers: Returns the multi-region reader of a .foam file, so visualizers
+                of several regions can share one (default is a reader of their own)
         """
         self.case_path = Path(case_path)
         if not self.case_path.exists():
             raise FileNotFoundError(f"Case directory not found: {self.case_path}")
 
+        # Guards the caches below; shared visualizers are used by several sessions at once
+        self._lock = threading.RLock()
+
         # Initialize instance variables
         self.foam_case = None
         self.foam_file = None
@@ -54,9 +89,18 @@ class OpenFOAMVisualizer:
         # Data caches
         self._data_cache = {}
 
+        # Incremental readers for probe files, kept across refreshes
+        self._probe_readers = {}
+
+        # Index of postProcessing outputs, refreshed incrementally
+        self._catalog = PostProcessingCatalog(self.case_path)
+
+        self._region_readers = region_readers
+
         # Initialize everything
         self.refresh()
 
+    @_synchronized
     def refresh(self):
         """
         Refresh all case data, clearing any cached information.
@@ -65,6 +109,9 @@ class OpenFOAMVisualizer:
         # Clear caches
         self._data_cache = {}
         self.cache_timestamps = {}
+        self._region_reader = None
+        self._derived_context = DerivedContext(self.case_path, self.region or "")
+        self._mesh_signature = mesh_signature(self.case_path)
 
         # Reinitialize foamlib case
         self.foam_case = FoamCase(self.case_path)
@@ -177,6 +224,27 @@ class OpenFOAMVisualizer:
         # Default (no region or region directory doesn't exist)
         return self.case_path / time_dir
 
+    @_synchronized
+    def get_post_processing_entry(self, name: str, label: str = "Sample") -> CatalogEntry:
+        """
+        Look up a function-object output in the postProcessing catalog.
+
+        The catalog is refreshed incrementally on every lookup, so new time
+        directories are picked up without rescanning unchanged ones.
+
+        Parameters:
+            name: Name of the output directory below postProcessing
+            label: Description used in the error message
+
+        Returns:
+            Catalog entry with kind, time directory names, files and fields
+        """
+        entry = self._catalog.refresh().get(name)
+        if entry is None:
+            raise FileNotFoundError(f"{label} directory not found: {self.case_path / 'postProcessing' / name}")
+        return entry
+
+    @_synchronized
     def read_line_sample(self, sample_name: str, time: Optional[str] = None, force_reload: bool = False) -> pd.DataFrame:
         """
         Read a line sample from postProcessing directory.
@@ -197,68 +265,24 @@ class OpenFOAMVisualizer:
         if not force_reload and cache_key in self._data_cache:
             return self._data_cache[cache_key]
 
-        # Find the matching time directory
-        pp_dir = self.case_path / "postProcessing" / sample_name
-        if not pp_dir.exists():
-            raise FileNotFoundError(f"Sample directory not found: {pp_dir}")
-
-        # Find the closest time directory
-        time_dirs = [d.name for d in pp_dir.iterdir() if self._is_time_dir(d.name)]
-        if not time_dirs:
-            raise FileNotFoundError(f"No time directories found in {pp_dir}")
-        float_time_dirs = [float(d) for d in time_dirs]
-
-        closest_time = min(float_time_dirs, key=lambda x: abs(x - float(time)))
-        closest_time_index = float_time_dirs.index(closest_time)
+        # Find the closest time directory under its original name
+        entry = self.get_post_processing_entry(sample_name, "Sample")
+        time_dir = entry.path / entry.nearest(time)
 
         # Check if the directory has been modified since last read
-        time_dir = pp_dir / time_dirs[closest_time_index]
         if not force_reload and not self.has_case_changed(time_dir):
             if cache_key in self._data_cache:
                 return self._data_cache[cache_key]
 
-        # Read the data file
-        data_files = list(time_dir.glob("*.xy"))
-        if not data_files:
-            raise FileNotFoundError(f"No .xy files found in {time_dir}")
-
         # Read all data files in the directory
-        dataframes = []
-        for data_file in data_files:
-            # Extract field name from filename
-            field_name = data_file.stem.split('_')[-1]
-
-            # Read the data
-            df = pd.read_csv(data_file, delim_whitespace=True, comment='#', header=None)
-
-            # Determine if this is positional data (assuming first file contains coordinates)
-            if len(dataframes) == 0:
-                # First file - assume first 3 columns are x, y, z
-                if df.shape[1] >= 3:
-                    df.columns = ['x', 'y', 'z'] + [f'{field_name}_{i}' for i in range(df.shape[1]-3)]
-                else:
-                    df.columns = [f'pos_{i}' for i in range(df.shape[1]-1)] + [field_name]
-
-                base_df = df
-                dataframes.append(df)
-            else:
-                # For subsequent files, just add the field columns to the base dataframe
-                if df.shape[1] > 3:  # Has positional data and field data
-                    field_cols = df.iloc[:, 3:].values
-                    for i in range(field_cols.shape[1]):
-                        col_name = f'{field_name}_{i}' if field_cols.shape[1] > 1 else field_name
-                        base_df[col_name] = field_cols[:, i]
-                else:  # Only field data
-                    field_cols = df.iloc[:, -1].values
-                    base_df[field_name] = field_cols
-
-        result = base_df if dataframes else pd.DataFrame()
+        result = read_xy_files(time_dir)
 
         # Cache the result
         self._data_cache[cache_key] = result
 
         return result
 
+    @_synchronized
     def plot_line_sample(self, sample_name: str, field_name: Optional[str] = None,
                          time: Optional[float] = None, ax=None, force_reload: bool = False, **kwargs):
         """
@@ -282,21 +306,7 @@ class OpenFOAMVisualizer:
             fig, ax = plt.subplots(figsize=(10, 6))
 
         # Calculate distance along the line
-        if 'x' in data.columns and 'y' in data.columns:
-            distance = np.zeros(len(data))
-            for i in range(1, len(data)):
-                if 'z' in data.columns:
-                    dx = data['x'][i] - data['x'][i-1]
-                    dy = data['y'][i] - data['y'][i-1]
-                    dz = data['z'][i] - data['z'][i-1]
-                    distance[i] = distance[i-1] + np.sqrt(dx**2 + dy**2 + dz**2)
-                else:
-                    dx = data['x'][i] - data['x'][i-1]
-                    dy = data['y'][i] - data['y'][i-1]
-                    distance[i] = distance[i-1] + np.sqrt(dx**2 + dy**2)
-        else:
-            # Use index as distance if no coordinate columns
-            distance = data.index
+        distance = self._line_distance(data)
 
         # Filter to only data columns (not coordinate columns)
         data_columns = [col for col in data.columns if col not in ['x', 'y', 'z']]
@@ -322,6 +332,76 @@ class OpenFOAMVisualizer:
 
         return ax
 
+    @staticmethod
+    def _line_distance(data: pd.DataFrame) -> np.ndarray:
+        """Distance along a line sample from its coordinate columns, or the row index without them."""
+        if 'x' in data.columns and 'y' in data.columns:
+            coordinates = [axis for axis in ('x', 'y', 'z') if axis in data.columns]
+            return cumulative_distance(data[coordinates].to_numpy(dtype=float))
+        # Use index as distance if no coordinate columns
+        return np.asarray(data.index, dtype=float)
+
+    @_synchronized
+    def read_line_over_time(self, sample_name: str, field_name: str,
+                            force_reload: bool = False) -> SpaceTimeLine:
+        """
+        Stack the .xy sets of a line sample from all of its time directories.
+
+        Parameters:
+            sample_name: Name of the line sample
+            field_name: Name of the field (matched against the data columns like plot_line_sample)
+            force_reload: Force reloading data from disk even if cached
+
+        Returns:
+            SpaceTimeLine with a (time × distance × component) value array
+        """
+        entry = self.get_post_processing_entry(sample_name, "Sample")
+        time_dirs = entry.times
+        if not time_dirs:
+            raise FileNotFoundError(f"No time directories found in {entry.path}")
+
+        distances, profiles, columns = [], [], []
+        for time_dir in time_dirs:
+            data = self.read_line_sample(sample_name, time_dir, force_reload)
+            columns = [col for col in data.columns if col not in ['x', 'y', 'z'] and field_name in col]
+            if not columns:
+                raise ValueError(f"Field '{field_name}' not found in data columns: {data.columns.tolist()}")
+            distances.append(self._line_distance(data))
+            profiles.append(data[columns].to_numpy(dtype=float))
+
+        times, distance, values = stack_profiles([float(t) for t in time_dirs], distances, profiles)
+        return SpaceTimeLine(field=field_name, times=times, distance=distance, values=values,
+                             components=tuple(columns))
+
+    def plot_space_time(self, line: SpaceTimeLine, component: Optional[str] = None,
+                        ax=None, cmap: str = 'viridis', **kwargs):
+        """
+        Plot a space-time heatmap of a line over time, e.g. pore-pressure dissipation.
+
+        Parameters:
+            line: Result of read_line_over_time or sample_line_over_time
+            component: Component to plot (default is the value or the magnitude)
+            ax: Matplotlib axis to plot on (creates new if None)
+            cmap: Matplotlib colormap
+            **kwargs: Additional arguments passed to matplotlib pcolormesh
+
+        Returns:
+            Matplotlib axis object
+        """
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(10, 6))
+
+        mesh = ax.pcolormesh(line.distance, line.times, line.component(component),
+                             shading='nearest', cmap=cmap, **kwargs)
+        label = line.field if component is None else f"{line.field} ({component})"
+        ax.figure.colorbar(mesh, ax=ax, label=label)
+        ax.set_xlabel('Distance [m]')
+        ax.set_ylabel('Time [s]')
+        ax.set_title(f'Space-Time: {label}')
+
+        return ax
+
+    @_synchronized
     def read_slice(self, slice_name: str, time: Optional[float] = None, force_reload: bool = False) -> pv.DataSet:
         """
         Read a slice from postProcessing directory using PyVista.
@@ -342,18 +422,10 @@ class OpenFOAMVisualizer:
         if not force_reload and cache_key in self._data_cache:
             return self._data_cache[cache_key]
 
-        # Find the slice directory
-        pp_dir = self.case_path / "postProcessing" / slice_name
-        if not pp_dir.exists():
-            raise FileNotFoundError(f"Slice directory not found: {pp_dir}")
-
-        # Find the closest time directory
-        time_dirs = [float(d.name) for d in pp_dir.iterdir() if self._is_time_dir(d.name)]
-        if not time_dirs:
-            raise FileNotFoundError(f"No time directories found in {pp_dir}")
-
-        closest_time = min(time_dirs, key=lambda x: abs(x - time))
-        time_dir = pp_dir / str(closest_time)
+        # Find the closest time directory under its original name
+        entry = self.get_post_processing_entry(slice_name, "Slice")
+        time_name = entry.nearest(time)
+        time_dir = entry.path / time_name
 
         # Check if the directory has been modified since last read
         if not force_reload and not self.has_case_changed(time_dir):
@@ -361,25 +433,23 @@ class OpenFOAMVisualizer:
                 return self._data_cache[cache_key]
 
         # Check for VTK files
-        vtk_files = list(time_dir.glob("*.vtk"))
-        if not vtk_files:
-            vtk_files = list(time_dir.glob("*.vtp"))
-
+        vtk_files = entry.file_paths(time_name, {".vtk"}) or entry.file_paths(time_name, {".vtp"})
         if not vtk_files:
             raise FileNotFoundError(f"No VTK files found in {time_dir}")
 
         # Use PyVista to read the VTK file
         mesh = pv.read(vtk_files[0])
-        mesh.time_value = closest_time  # Attach time value as metadata
+        mesh.time_value = float(time_name)  # Attach time value as metadata
 
         # Cache the result
         self._data_cache[cache_key] = mesh
 
         return mesh
 
+    @_synchronized
     def plot_slice(self, slice_name: str, field_name: Optional[str] = None,
                    vector_field: Optional[str] = None, time: Optional[float] = None,
-                   plotter=None, force_reload: bool = False, **kwargs):
+                   plotter=None, force_reload: bool = False, n_arrows: int = 100, **kwargs):
         """
         Plot a slice from OpenFOAM case.
 
@@ -390,6 +460,7 @@ class OpenFOAMVisualizer:
             time: Time to plot (default is latest time)
             plotter: PyVista plotter to use (creates new if None)
             force_reload: Force reloading data from disk even if cached
+            n_arrows: Target number of spatially uniform arrows for the vector field
             **kwargs: Additional arguments passed to PyVista
 
         Returns:
@@ -417,12 +488,9 @@ class OpenFOAMVisualizer:
             if vector_field in mesh.array_names:
                 vector_data = mesh[vector_field]
                 if len(vector_data.shape) > 1 and vector_data.shape[1] == 3:
-                    # Get a subset of points for arrows (too many makes visualization cluttered)
-                    n_points = len(mesh.points)
-                    skip = max(1, n_points // 100)  # Aim for around 100 arrows
-
-                    arrow_mesh = mesh.extract_subset(np.arange(0, n_points, skip))
-                    arrows = arrow_mesh.glyph(
+                    arrow_points = self.get_glyph_points(mesh, vector_field, n_arrows,
+                                                         cache_key=f"{slice_name}_{mesh.time_value}")
+                    arrows = arrow_points.glyph(
                         orient=vector_field,
                         scale=vector_field,
                         factor=0.05,  # Adjust scale factor as needed
@@ -442,10 +510,52 @@ class OpenFOAMVisualizer:
 
         return plotter
 
+    @_synchronized
+    def get_glyph_points(self, mesh: pv.DataSet, vector_field: str, n_arrows: int = 100,
+                         cache_key: Optional[str] = None) -> pv.PolyData:
+        """
+        Select spatially uniform glyph locations for a vector field.
+
+        One representative per voxel of an adaptive grid is chosen, so arrows are
+        evenly spread even where the mesh is refined. The selection is cached per
+        mesh and target count.
+
+        Parameters:
+            mesh: Dataset holding the vector field as point or cell data
+            vector_field: Name of the vector field
+            n_arrows: Target number of glyphs
+            cache_key: Key identifying the mesh in the cache (no caching if None)
+
+        Returns:
+            PyVista PolyData of the selected locations carrying the vector field
+        """
+        if vector_field in mesh.point_data:
+            locations = np.asarray(mesh.points)
+            vectors = mesh.point_data[vector_field]
+        else:
+            locations = np.asarray(mesh.cell_centers().points)
+            vectors = mesh.cell_data[vector_field]
+
+        ids_key = f"glyph_ids_{cache_key}_{vector_field in mesh.point_data}_{n_arrows}"
+        if cache_key is not None and ids_key in self._data_cache:
+            ids = self._data_cache[ids_key]
+        else:
+            ids = uniform_sample_ids(locations, n_arrows)
+            if cache_key is not None:
+                self._data_cache[ids_key] = ids
+
+        glyph_points = pv.PolyData(locations[ids])
+        glyph_points[vector_field] = vectors[ids]
+        return glyph_points
+
+    @_synchronized
     def read_point_sample(self, sample_name: str, force_reload: bool = False) -> pd.DataFrame:
         """
         Read a point sample from postProcessing directory.
 
+        The probe file is read incrementally: only lines appended since the last
+        call are parsed, and restarted runs in new start-time subfolders are merged.
+
         Parameters:
             sample_name: Name of the point sample
             force_reload: Force reloading data from disk even if cached
@@ -453,53 +563,131 @@ class OpenFOAMVisualizer:
         Returns:
             DataFrame containing the point sample data over time
         """
-        # Check cache first (unless force_reload is True)
         cache_key = f"point_sample_{sample_name}"
-        pp_dir = self.case_path / "postProcessing" / sample_name
-
-        if not force_reload:
-            # Check if the directory has been modified
-            if not self.has_case_changed(pp_dir):
-                if cache_key in self._data_cache:
-                    return self._data_cache[cache_key]
-
-        if not pp_dir.exists():
-            raise FileNotFoundError(f"Point sample directory not found: {pp_dir}")
-
-        # Look for data files
-        data_files = list(pp_dir.glob("*.dat"))
-        if not data_files:
-            raise FileNotFoundError(f"No .dat files found in {pp_dir}")
-
-        # Read the data file
-        data_file = data_files[0]
-
-        # Read header to determine columns
-        with open(data_file, 'r') as f:
-            header_line = None
-            for line in f:
-                if line.startswith('#'):
-                    header_line = line.strip('# \n')
-                else:
-                    break
+        pp_dir = self.get_post_processing_entry(sample_name, "Point sample").path
 
-        # Read the data
-        data = pd.read_csv(data_file, delim_whitespace=True, comment='#', header=None)
+        reader = self._probe_readers.get(sample_name)
+        if reader is None or force_reload:
+            reader = ProbeSeriesReader(pp_dir)
+            self._probe_readers[sample_name] = reader
 
-        # Assign column names if available
-        if header_line:
-            columns = header_line.split()
-            if len(columns) == data.shape[1]:
-                data.columns = columns
-        else:
-            # Default column names
-            data.columns = ['time'] + [f'field_{i}' for i in range(data.shape[1]-1)]
+        # Only newly appended rows are parsed here
+        if not reader.update() and cache_key in self._data_cache:
+            return self._data_cache[cache_key]
+
+        data = pd.DataFrame(reader.data, columns=reader.columns)
 
         # Cache the result
         self._data_cache[cache_key] = data
 
         return data
 
+    @_synchronized
+    def get_cell_locator(self) -> CellLocator:
+        """
+        Get the cell locator of the current mesh (or region), building it on first use.
+
+        The locator is kept until the polyMesh files change.
+        """
+        poly_mesh = self.get_region_path('constant') / 'polyMesh'
+        signature = tuple(
+            (path.name, path.stat().st_mtime_ns) for path in sorted(poly_mesh.glob('*')) if path.is_file()
+        )
+        cache_key = f"cell_locator_{self.region or ''}"
+        cached = self._data_cache.get(cache_key)
+        if cached is None or cached[0] != signature:
+            locator = CellLocator(read_internal_mesh(self.foam_file, self.region))
+            cached = (signature, locator)
+            self._data_cache[cache_key] = cached
+        return cached[1]
+
+    @_synchronized
+    def probe_points(self, points: np.ndarray, field_names: List[str],
+                     times: Optional[List[str]] = None, max_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Sample fields at arbitrary points over time, after the simulation has run.
+
+        The cells containing the points are found once with the cached cell locator;
+        from every time step only the values at those cells are kept. Points
+        outside the mesh and missing field files give NaN.
+
+        Parameters:
+            points: Array of shape (n_points, 3)
+            field_names: Fields to sample
+            times: Time directories to read (default is all time directories)
+            max_workers: Number of worker processes for reading the time steps
+
+        Returns:
+            DataFrame with a 'Time' column and one column per point and component,
+            named like probe output (e.g. 'p_rgh0', 'D0x')
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        times = list(times) if times is not None else [t for t in self.time_dirs if t != 'constant']
+        cell_ids = self.get_cell_locator().locate(points)
+
+        data = {'Time': [float(t) for t in times]}
+        for field in field_names:
+            samples = self._sample_cells(cell_ids, field, times, max_workers)
+            suffixes = component_names(samples.shape[2]) if samples.shape[2] > 1 else ('',)
+            for point in range(len(points)):
+                for component, suffix in enumerate(suffixes):
+                    data[f"{field}{point}{suffix}"] = samples[:, point, component]
+
+        return pd.DataFrame(data)
+
+    def _sample_cells(self, cell_ids: np.ndarray, field_name: str, times: List[str],
+                      max_workers: Optional[int] = None) -> np.ndarray:
+        """Values of a field at the given cells as a (time × cell × component) array, NaN where missing."""
+        inside = cell_ids >= 0
+        paths = [self.get_region_path(t) / field_name for t in times]
+
+        # Exported results are read directly when they are up to date
+        exported = self.get_export_store().read_cells(self.region or "", field_name, cell_ids[inside], times, paths)
+        if exported is not None:
+            samples = np.full((len(times), len(cell_ids), exported.shape[2]), np.nan)
+            samples[:, inside] = exported
+            return samples
+
+        series = probe_time_series([p if p.is_file() else None for p in paths], cell_ids[inside], max_workers)
+
+        n_components = next((values.shape[1] for values in series if values is not None), 1)
+        samples = np.full((len(times), len(cell_ids), n_components), np.nan)
+        for index, values in enumerate(series):
+            if values is not None:
+                samples[index, inside] = values
+        return samples
+
+    @_synchronized
+    def sample_line_over_time(self, vertices: np.ndarray, field_name: str, n_points: int = 100,
+                              times: Optional[List[str]] = None,
+                              max_workers: Optional[int] = None) -> SpaceTimeLine:
+        """
+        Sample a field along an arbitrary polyline for every time step.
+
+        Parameters:
+            vertices: Polyline vertices, shape (n_vertices, 3)
+            field_name: Field to sample
+            n_points: Number of equally spaced sample points along the polyline
+            times: Time directories to read (default is all time directories)
+            max_workers: Number of worker processes for reading the time steps
+
+        Returns:
+            SpaceTimeLine with a (time × distance × component) value array
+        """
+        times = list(times) if times is not None else [t for t in self.time_dirs if t != 'constant']
+        points = resample_polyline(vertices, n_points)
+        cell_ids = self.get_cell_locator().locate(points)
+        samples = self._sample_cells(cell_ids, field_name, times, max_workers)
+
+        return SpaceTimeLine(
+            field=field_name,
+            times=np.array([float(t) for t in times]),
+            distance=cumulative_distance(points),
+            values=samples,
+            components=component_names(samples.shape[2]),
+        )
+
+    @_synchronized
     def plot_point_sample(self, sample_name: str, field_names: Optional[List[str]] = None,
                           ax=None, force_reload: bool = False, **kwargs):
         """
@@ -545,6 +733,7 @@ class OpenFOAMVisualizer:
 
         return ax
 
+    @_synchronized
     def read_full_case(self, time: Optional[str] = None, force_reload: bool = False) -> pv.MultiBlock:
         """
         Read the full OpenFOAM case using PyVista's OpenFOAMReader.
@@ -558,18 +747,23 @@ class OpenFOAMVisualizer:
         """
         if time is None or time == 'constant':
             time = self.latest_time
+        self._check_mesh()
 
         # Check cache first (unless force_reload is True)
         cache_key = f"full_case_{time}"
         if self.region:
             cache_key += f"_{self.region}"
 
-        if not force_reload:
-            # Check if the case has been modified
-            if not self.has_case_changed(self.case_path / "constant") and \
-            (time == 'constant' or not self.has_case_changed(self.case_path / time)):
-                if cache_key in self._data_cache:
-                    return self._data_cache[cache_key]
+        # Check if the case has been modified
+        changed = self._has_time_changed(time)
+        if not force_reload and not changed and cache_key in self._data_cache:
+            return self._data_cache[cache_key]
+
+        if self.region:
+            # Only decode the requested region instead of the whole case
+            data = self.read_region(self.region, time, force_reload=force_reload or changed)
+            self._data_cache[cache_key] = data
+            return data
 
         # Use PyVista's OpenFOAMReader
         reader = pv.OpenFOAMReader(str(self.foam_file))
@@ -601,22 +795,283 @@ class OpenFOAMVisualizer:
         # Read all data
         data = reader.read()
 
+        if 'defaultRegion' in data.keys():
+            data = data['defaultRegion']
+
         # Cache the result
         self._data_cache[cache_key] = data
 
+        return data
+
+    def _has_time_changed(self, time: str) -> bool:
+        """Check whether the mesh or the given time directory changed since the last read."""
+        return self.has_case_changed(self.case_path / "constant") or \
+            (time != 'constant' and self.has_case_changed(self.case_path / time))
+
+    def _check_mesh(self) -> None:
+        """
+        Drop all cached reads when a polyMesh file changed, e.g. after remeshing,
+        an archive import, a layered mesh or renumbering. Directory modification
+        times miss files that are rewritten in place.
+        """
+        signature = mesh_signature(self.case_path)
+        if signature != self._mesh_signature:
+            self._data_cache = {}
+            self._region_reader = None
+            self._derived_context = DerivedContext(self.case_path, self.region or "")
+            self._mesh_signature = signature
+
+    @_synchronized
+    def get_region_reader(self) -> MultiRegionReader:
+        """Get the shared multi-region reader, creating it on first use."""
+        if self._region_reader is None:
+            if self._region_readers is not None:
+                self._region_reader = self._region_readers(self.foam_file)
+            else:
+                self._region_reader = MultiRegionReader(self.foam_file)
+        return self._region_reader
+
+    @_synchronized
+    def read_region(self, region: str, time: Optional[str] = None, force_reload: bool = False) -> pv.MultiBlock:
+        """
+        Read a single mesh region, independent of the region this visualizer was created for.
+
+        Decoded regions are cached per time, so switching between regions is instant.
+
+        Parameters:
+            region: Name of the region (e.g. 'solid' or 'poroFluid')
+            time: Time to read (default is latest time)
+            force_reload: Force reloading data from disk even if cached
+
+        Returns:
+            PyVista MultiBlock dataset of the region
+        """
+        if time is None or time == 'constant':
+            time = self.latest_time
+        self._check_mesh()
+
+        reader = self.get_region_reader()
+        if force_reload:
+            reader.invalidate(time)
+        return reader.read_region(region, time)
+
+    @_synchronized
+    def read_regions(self, time: Optional[str] = None, regions: Optional[List[str]] = None,
+                     force_reload: bool = False) -> pv.MultiBlock:
+        """
+        Read several mesh regions concurrently at one shared time.
+
+        Parameters:
+            time: Time to read (default is latest time)
+            regions: Regions to read (default is all regions of the case)
+            force_reload: Force reloading data from disk even if cached
+
+        Returns:
+            PyVista MultiBlock dataset with one block per region
+        """
+        if time is None or time == 'constant':
+            time = self.latest_time
+        self._check_mesh()
+
+        reader = self.get_region_reader()
+        if force_reload or self._has_time_changed(time):
+            reader.invalidate(time)
+        return reader.read(time, regions)
+
+    @_synchronized
+    def get_export_store(self) -> ExportStore:
+        """
+        Get read access to the columnar export of the case (see postprocessing.export).
+
+        The store is reloaded when its manifest changes, so exports that finish
+        later are served without a refresh.
+        """
+        path = export_dir(self.case_path) / MANIFEST_NAME
+        signature = (path.stat().st_size, path.stat().st_mtime_ns) if path.exists() else None
+        cached = self._data_cache.get("export_store")
+        if cached is None or cached[0] != signature:
+            cached = (signature, ExportStore(self.case_path))
+            self._data_cache["export_store"] = cached
+        return cached[1]
+
+    @_synchronized
+    def read_zone_means(self) -> pd.DataFrame:
+        """
+        Get the exported cellZone means of all fields and time steps.
+
+        Returns:
+            DataFrame with columns time, region, field, zone, component and mean
+        """
+        means = self.get_export_store().read_zone_means()
         if self.region:
-            data = data[self.region]
-        elif 'defaultRegion' in data.keys():
-            data = data['defaultRegion']
+            means = means[means["region"] == self.region]
+        return means
 
-        return data
+    @_synchronized
+    def get_available_fields(self, time: Optional[str] = None) -> List[str]:
+        """
+        Get the fields that can be visualized at a time.
+
+        Parameters:
+            time: Time to read (default is latest time)
+
+        Returns:
+            Names of the arrays written by the solver, followed by the derived
+            fields that can be computed from them (see postprocessing.derived)
+        """
+        data = self.read_full_case(time)
+        names: List[str] = []
+        for i in range(data.n_blocks):
+            block = data[i]
+            if hasattr(block, 'array_names'):
+                names.extend(name for name in block.array_names if name not in names)
+        return names + available_derived_fields(names) + EnvelopeStore(self.case_path).array_names(self.region or "")
+
+    @_synchronized
+    def add_derived_field(self, data: pv.MultiBlock, field_name: str) -> bool:
+        """
+        Compute a derived field on every block of the case data that holds its inputs.
+
+        The arrays are added to the cached datasets, so they are computed once per
+        time step and region until the case changes.
+
+        Parameters:
+            data: Case data as returned by read_full_case
+            field_name: Name of a registered derived field
+
+        Returns:
+            True if at least one block has the field
+        """
+        added = False
+        for name, block in zip(data.keys(), data):
+            if hasattr(block, 'point_data'):
+                added |= add_derived_array(block, field_name, self._derived_context,
+                                           internal_mesh=name == 'internalMesh')
+        return added
+
+    @_synchronized
+    def add_envelope_field(self, data: pv.MultiBlock, field_name: str) -> bool:
+        """
+        Add a computed envelope (see postprocessing.envelopes) to the cell data of the internal mesh.
+
+        Parameters:
+            data: Case data as returned by read_full_case
+            field_name: Envelope array name, e.g. 'max(p_rgh)' or 'timeOfMin(D_z)'
+
+        Returns:
+            True if the internal mesh has the field
+        """
+        if 'internalMesh' not in data.keys():
+            return False
+        internal_mesh = data['internalMesh']
+        if field_name in internal_mesh.cell_data:
+            return True
+        values = EnvelopeStore(self.case_path).read_array(self.region or "", field_name)
+        if values is None or len(values) != internal_mesh.n_cells:
+            return False
+        internal_mesh.cell_data[field_name] = values
+        return True
+
+    @_synchronized
+    def get_field_range(self, field_name: str, component: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """
+        Get the range of a field over all time steps from the statistics index.
+
+        The index is only read, not updated; see postprocessing.statistics.update_field_statistics.
+
+        Parameters:
+            field_name: Name of the field
+            component: Component name (default is the magnitude for vectors and tensors)
+
+        Returns:
+            (min, max) tuple, or None if the field has not been indexed
+        """
+        # Reloaded whenever the Post Processing page has updated the index
+        path = stats_index_path(self.case_path)
+        signature = (path.stat().st_size, path.stat().st_mtime_ns) if path.exists() else None
+        cached = self._data_cache.get("field_statistics")
+        if cached is None or cached[0] != signature:
+            cached = (signature, load_field_statistics(self.case_path))
+            self._data_cache["field_statistics"] = cached
+        return field_range(cached[1], field_name, self.region or "", component)
+
+    @_synchronized
+    def get_lod_blocks(self, blocks: List[pv.DataSet], block_names: List[str],
+                       time: Optional[str] = None,
+                       target_triangles: Optional[int] = None) -> List[pv.PolyData]:
+        """
+        Reduce mesh blocks to lightweight surfaces for browser export.
+
+        Each block is reduced to its outer surface, triangulated and decimated so
+        that all blocks together stay within the triangle budget. Coordinates are
+        quantised to float32 and data arrays are dropped. Results are cached per
+        mesh signature, time, region, block and budget, so an edited mesh is
+        decimated again without a refresh.
+
+        Parameters:
+            blocks: Blocks returned from read_full_case
+            block_names: Names of the blocks (used for caching)
+            time: Time the blocks were read for (default is latest time)
+            target_triangles: Triangle budget shared by all blocks
+
+        Returns:
+            List of decimated PyVista PolyData surfaces in the order of blocks
+        """
+        if time is None or time == 'constant':
+            time = self.latest_time
+        if target_triangles is None:
+            target_triangles = self.LOD_TARGET_TRIANGLES
+
+        # Rewritten polyMesh files change the key even if the case was not refreshed
+        mesh_key = hash(mesh_signature(self.case_path))
+        surfaces = []
+        for block, block_name in zip(blocks, block_names):
+            cache_key = f"lod_surface_{mesh_key}_{time}_{self.region}_{block_name}"
+            if cache_key not in self._data_cache:
+                surface = block.extract_surface().triangulate()
+                surface.clear_data()
+                self._data_cache[cache_key] = surface
+            surfaces.append(self._data_cache[cache_key])
+
+        total_triangles = sum(surface.n_cells for surface in surfaces)
+
+        lod_blocks = []
+        for surface, block_name in zip(surfaces, block_names):
+            # Split the budget proportionally to the size of each surface
+            block_target = max(1, int(target_triangles * surface.n_cells / max(1, total_triangles)))
+            cache_key = f"lod_{mesh_key}_{time}_{self.region}_{block_name}_{block_target}"
+            if cache_key not in self._data_cache:
+                self._data_cache[cache_key] = decimate_surface(surface, block_target)
+            lod_blocks.append(self._data_cache[cache_key])
+
+        return lod_blocks
+
+    def get_patch_colors(self, n_patches: int, palette: str = 'deep') -> List[Tuple[float, ...]]:
+        """
+        Sample evenly spaced colors for patches from a color palette.
+
+        Parameters:
+            n_patches: Number of colors to generate
+            palette: Name of the palette (falls back to plasma if unknown)
+
+        Returns:
+            List of RGBA tuples
+        """
+        if palette in self.COLOR_PALETTES:
+            cmap = self.COLOR_PALETTES[palette]
+        else:
+            cmap = plt.cm.plasma  # Default fallback
+
+        return [cmap(i / max(1, n_patches - 1)) for i in range(n_patches)]
 
+    @_synchronized
     def visualize_mesh(self, time: Optional[str] = None, plotter=None,
                        show_edges: bool = True, color: Optional[str] = None,
                        style: str = 'surface', color_patches: bool = False,
                        show_boundaries: bool = True, only_boundaries: bool = False,
                        opacity: float = 1.0, edge_color: str = 'black',
-                       boundary_palette: str = 'deep', force_reload: bool = False, **kwargs):
+                       boundary_palette: str = 'deep', force_reload: bool = False,
+                       lod_target: Optional[int] = None, **kwargs):
         """
         Visualize only the mesh geometry from the OpenFOAM case.
 
@@ -633,6 +1088,7 @@ class OpenFOAMVisualizer:
             edge_color: Color of mesh edges when show_edges is True
             boundary_palette: Color palette to use when color_patches is True
             force_reload: Force reloading data from disk even if cached
+            lod_target: Triangle budget for decimated surfaces (None shows full resolution)
             **kwargs: Additional arguments passed to PyVista
 
         Returns:
@@ -670,14 +1126,13 @@ class OpenFOAMVisualizer:
         if not blocks:
             raise ValueError("No valid blocks found in the case data to visualize")
 
+        # Replace the blocks by their decimated outer surfaces if requested
+        if lod_target is not None:
+            blocks = self.get_lod_blocks(blocks, patch_names, time, lod_target)
+
         # Generate colors for patches if requested
         if color_patches:
-            if boundary_palette in self.COLOR_PALETTES:
-                cmap = self.COLOR_PALETTES[boundary_palette]
-            else:
-                cmap = plt.cm.plasma  # Default fallback
-
-            colors = [cmap(i / max(1, len(blocks) - 1)) for i in range(len(blocks))]
+            colors = self.get_patch_colors(len(blocks), boundary_palette)
 
         # Add the meshes to the plotter
         for i, (block, patch_name) in enumerate(zip(blocks, patch_names)):
@@ -706,6 +1161,7 @@ class OpenFOAMVisualizer:
                 edge_color=edge_color,
                 opacity=opacity,
                 label=patch_name,
+                name=patch_name,
                 **kwargs
             )
 
@@ -721,17 +1177,18 @@ class OpenFOAMVisualizer:
 
         return plotter
 
+    @_synchronized
     def visualize_3d(self, field_name: Optional[str] = None, time: Optional[float] = None,
                     clip_plane: bool = False, slice_origin: Optional[List[float]] = None,
                     slice_normal: Optional[List[float]] = None, plotter=None,
                     show_edges: bool = False, edge_color: str = 'black',
                     color_palette: str = 'plasma', opacity: float = 1.0,
-                    force_reload: bool = False, **kwargs):
+                    force_reload: bool = False, stable_colorbar: bool = True, **kwargs):
         """
         Create a 3D visualization of the OpenFOAM case.
 
         Parameters:
-            field_name: Name of the field to visualize
+            field_name: Name of the field to visualize, written by the solver or derived (see get_available_fields)
             time: Time to visualize (default is latest time)
             clip_plane: Whether to add a clip plane
             slice_origin: Origin point for slicing plane [x,y,z]
@@ -742,12 +1199,18 @@ class OpenFOAMVisualizer:
             color_palette: Color palette to use for the scalar field
             opacity: Opacity of the mesh (0.0-1.0)
             force_reload: Force reloading data from disk even if cached
+            stable_colorbar: Use the field's range over all time steps from the statistics
+                             index (if available) instead of the range of this frame
             **kwargs: Additional arguments passed to PyVista
 
         Returns:
             PyVista plotter object
         """
         data = self.read_full_case(time, force_reload)
+        if field_name in DERIVED_FIELDS:
+            self.add_derived_field(data, field_name)
+        elif field_name and '(' in field_name:
+            self.add_envelope_field(data, field_name)
 
         # Create a new plotter if not provided
         if plotter is None:
@@ -819,6 +1282,12 @@ class OpenFOAMVisualizer:
         if cmap in self.COLOR_PALETTES:
             cmap = self.COLOR_PALETTES[cmap]
 
+        # Keep the colour range fixed across time steps
+        if stable_colorbar and field_name and 'clim' not in kwargs:
+            field_limits = self.get_field_range(field_name)
+            if field_limits is not None:
+                kwargs['clim'] = field_limits
+
         # Add all patches to plotter
         for patch in patches:
             if field_name and field_name in patch.array_names:
@@ -841,12 +1310,172 @@ class OpenFOAMVisualizer:
                 )
 
         # Add time information to title
-        current_time = data._get_attrs().get('time', time if time is not None else self.latest_time)
+        current_time = time if time is not None else self.latest_time
         plotter.add_text(f'Time: {current_time}s', position='upper_edge')
 
         return plotter
 
 
+class VisualizerRegistry:
+    """
+    Process-wide registry of visualizers, shared by all Streamlit sessions and helpers.
+
+    Visualizers are keyed by resolved case path and region, so every caller works
+    on the same cached reads. Callers that use a visualizer for longer than one
+    call hold a reference with ``acquire``/``release``; unreferenced visualizers
+    are evicted after ``idle_timeout`` seconds without use. Each visualizer has its
+    own re-entrant lock, taken by every method that reads or fills its caches, so
+    visualizers returned by ``get`` are safe to use from several sessions; ``use``
+    holds it for a whole ``with`` block and ``invalidate`` while refreshing.
+
+    The visualizers of all regions of a case share one ``MultiRegionReader``, so
+    every region is decoded once per time however many visualizers show it.
+    """
+
+    # Seconds an unreferenced visualizer stays cached
+    IDLE_TIMEOUT = 900.0
+
+    def __init__(self, idle_timeout: float = IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # (mesh signature, reader) per resolved .foam file
+        self._region_readers: Dict[str, Tuple[Any, MultiRegionReader]] = {}
+        self._reader_lock = threading.Lock()
+
+    @staticmethod
+    def _key(case_path: Union[str, Path], region: Optional[str] = None) -> Tuple[str, str]:
+        return str(Path(case_path).resolve()), region or ""
+
+    def _entry(self, case_path: Union[str, Path], region: Optional[str]) -> Dict[str, Any]:
+        key = self._key(case_path, region)
+        now = monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is None or not entry["visualizer"].case_path.exists():
+                visualizer = OpenFOAMVisualizer(key[0], region or None, self.region_reader)
+                entry = {"visualizer": visualizer, "lock": visualizer._lock, "refs": 0}
+                self._entries[key] = entry
+            entry["last_used"] = now
+            return entry
+
+    def region_reader(self, foam_file: Union[str, Path]) -> MultiRegionReader:
+        """Get the multi-region reader shared by all visualizers of a case, recreated when its mesh changed."""
+        foam_file = Path(foam_file).resolve()
+        signature = mesh_signature(foam_file.parent)
+        with self._reader_lock:
+            cached = self._region_readers.get(str(foam_file))
+            if cached is None or cached[0] != signature:
+                cached = (signature, MultiRegionReader(foam_file))
+                self._region_readers[str(foam_file)] = cached
+            return cached[1]
+
+    def _drop_region_readers(self, case_keys: set) -> None:
+        with self._reader_lock:
+            for foam_file in [foam_file for foam_file in self._region_readers
+                              if str(Path(foam_file).parent) in case_keys]:
+                del self._region_readers[foam_file]
+
+    def get(self, case_path: Union[str, Path], region: Optional[str] = None) -> OpenFOAMVisualizer:
+        """Get the shared visualizer of a case and region, creating it if needed."""
+        return self._entry(case_path, region)["visualizer"]
+
+    def acquire(self, case_path: Union[str, Path], region: Optional[str] = None) -> OpenFOAMVisualizer:
+        """Get the shared visualizer and keep it cached until ``release`` is called."""
+        entry = self._entry(case_path, region)
+        with self._lock:
+            entry["refs"] += 1
+        return entry["visualizer"]
+
+    def release(self, case_path: Union[str, Path], region: Optional[str] = None) -> None:
+        """Drop a reference taken with ``acquire``."""
+        with self._lock:
+            entry = self._entries.get(self._key(case_path, region))
+            if entry is not None:
+                entry["refs"] = max(entry["refs"] - 1, 0)
+                entry["last_used"] = monotonic()
+
+    @contextmanager
+    def use(self, case_path: Union[str, Path], region: Optional[str] = None):
+        """Hold a reference and the visualizer's lock for the duration of a ``with`` block."""
+        entry = self._entry(case_path, region)
+        with self._lock:
+            entry["refs"] += 1
+        try:
+            with entry["lock"]:
+                yield entry["visualizer"]
+        finally:
+            self.release(case_path, region)
+
+    def invalidate(self, case_path: Union[str, Path]) -> List[OpenFOAMVisualizer]:
+        """
+        Refresh every visualizer of a case, for all regions, so no session keeps stale data.
+
+        Returns:
+            The refreshed visualizers
+        """
+        case_key = self._key(case_path)[0]
+        with self._lock:
+            entries = [entry for key, entry in self._entries.items() if key[0] == case_key]
+        self._drop_region_readers({case_key})
+        for entry in entries:
+            with entry["lock"]:
+                entry["visualizer"].refresh()
+        return [entry["visualizer"] for entry in entries]
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Remove unreferenced visualizers that have been idle for longer than the timeout."""
+        with self._lock:
+            return self._evict_idle(monotonic() if now is None else now)
+
+    def _evict_idle(self, now: float) -> int:
+        idle = [
+            key for key, entry in self._entries.items()
+            if entry["refs"] == 0 and now - entry["last_used"] > self.idle_timeout
+        ]
+        for key in idle:
+            del self._entries[key]
+        if idle:
+            self._drop_region_readers({key[0] for key in idle} - {key[0] for key in self._entries})
+        return len(idle)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        with self._reader_lock:
+            self._region_readers.clear()
+
+
+# Shared by every session of the Streamlit server process
+VISUALIZER_REGISTRY = VisualizerRegistry()
+
+
+def decimate_surface(surface: pv.PolyData, target_triangles: int) -> pv.PolyData:
+    """
+    Decimate a triangulated surface to a triangle budget and quantise it to float32.
+
+    Parameters:
+        surface: Triangulated PyVista surface
+        target_triangles: Maximum number of triangles to keep
+
+    Returns:
+        Decimated PyVista PolyData with float32 points
+    """
+    lod = surface
+    if surface.n_cells > target_triangles and surface.n_points > 0:
+        reduction = 1.0 - target_triangles / surface.n_cells
+        try:
+            lod = surface.decimate(reduction)
+        except Exception:
+            # Surfaces with non-manifold or degenerate cells may fail in vtkQuadricDecimation
+            lod = surface.decimate_pro(reduction, preserve_topology=False)
+
+    lod = lod.copy()
+    lod.points = np.asarray(lod.points, dtype=np.float32)
+    return lod
+
+
 # Convenience functions for easy access
 def plot_openfoam_line_sample(case_path: Union[str, Path], sample_name: str,
                              field_name: Optional[str] = None, time: Optional[float] = None,
@@ -866,8 +1495,8 @@ def plot_openfoam_line_sample(case_path: Union[str, Path], sample_name: str,
     Returns:
         Matplotlib axis object
     """
-    visualizer = OpenFOAMVisualizer(case_path)
-    return visualizer.plot_line_sample(sample_name, field_name, time, ax, force_reload, **kwargs)
+    with VISUALIZER_REGISTRY.use(case_path) as visualizer:
+        return visualizer.plot_line_sample(sample_name, field_name, time, ax, force_reload, **kwargs)
 
 def plot_openfoam_slice(case_path: Union[str, Path], slice_name: str,
                        field_name: Optional[str] = None, vector_field: Optional[str] = None,
@@ -888,8 +1517,8 @@ def plot_openfoam_slice(case_path: Union[str, Path], slice_name: str,
     Returns:
         PyVista plotter object
     """
-    visualizer = OpenFOAMVisualizer(case_path)
-    return visualizer.plot_slice(slice_name, field_name, vector_field, time, plotter, force_reload, **kwargs)
+    with VISUALIZER_REGISTRY.use(case_path) as visualizer:
+        return visualizer.plot_slice(slice_name, field_name, vector_field, time, plotter, force_reload, **kwargs)
 
 def plot_openfoam_point_sample(case_path: Union[str, Path], sample_name: str,
                               field_names: Optional[List[str]] = None, ax=None,
@@ -908,8 +1537,8 @@ def plot_openfoam_point_sample(case_path: Union[str, Path], sample_name: str,
     Returns:
         Matplotlib axis object
     """
-    visualizer = OpenFOAMVisualizer(case_path)
-    return visualizer.plot_point_sample(sample_name, field_names, ax, force_reload, **kwargs)
+    with VISUALIZER_REGISTRY.use(case_path) as visualizer:
+        return visualizer.plot_point_sample(sample_name, field_names, ax, force_reload, **kwargs)
 
 def visualize_openfoam_mesh(case_path: Union[str, Path], time: Optional[float] = None,
                           show_edges: bool = True, color: Optional[str] = None,
@@ -940,22 +1569,22 @@ def visualize_openfoam_mesh(case_path: Union[str, Path], time: Optional[float] =
     Returns:
         PyVista plotter object
     """
-    visualizer = OpenFOAMVisualizer(case_path)
-    return visualizer.visualize_mesh(
-        time=time,
-        plotter=plotter,
-        show_edges=show_edges,
-        color=color,
-        style=style,
-        color_patches=color_patches,
-        show_boundaries=show_boundaries,
-        only_boundaries=only_boundaries,
-        opacity=opacity,
-        edge_color=edge_color,
-        boundary_palette=boundary_palette,
-        force_reload=force_reload,
-        **kwargs
-    )
+    with VISUALIZER_REGISTRY.use(case_path) as visualizer:
+        return visualizer.visualize_mesh(
+            time=time,
+            plotter=plotter,
+            show_edges=show_edges,
+            color=color,
+            style=style,
+            color_patches=color_patches,
+            show_boundaries=show_boundaries,
+            only_boundaries=only_boundaries,
+            opacity=opacity,
+            edge_color=edge_color,
+            boundary_palette=boundary_palette,
+            force_reload=force_reload,
+            **kwargs
+        )
 
 def visualize_openfoam_3d(case_path: Union[str, Path], field_name: Optional[str] = None,
                          time: Optional[float] = None, clip_plane: bool = False,
@@ -985,31 +1614,33 @@ def visualize_openfoam_3d(case_path: Union[str, Path], field_name: Optional[str]
     Returns:
         PyVista plotter object
     """
-    visualizer = OpenFOAMVisualizer(case_path)
-    return visualizer.visualize_3d(
-        field_name=field_name,
-        time=time,
-        clip_plane=clip_plane,
-        slice_origin=slice_origin,
-        slice_normal=slice_normal,
-        plotter=plotter,
-        show_edges=show_edges,
-        edge_color=edge_color,
-        color_palette=color_palette,
-        opacity=opacity,
-        force_reload=force_reload,
-        **kwargs
-    )
+    with VISUALIZER_REGISTRY.use(case_path) as visualizer:
+        return visualizer.visualize_3d(
+            field_name=field_name,
+            time=time,
+            clip_plane=clip_plane,
+            slice_origin=slice_origin,
+            slice_normal=slice_normal,
+            plotter=plotter,
+            show_edges=show_edges,
+            edge_color=edge_color,
+            color_palette=color_palette,
+            opacity=opacity,
+            force_reload=force_reload,
+            **kwargs
+        )
 
 def refresh_openfoam_case(case_path: Union[str, Path]) -> OpenFOAMVisualizer:
     """
     Refresh an OpenFOAM case by clearing caches and rereading data.
 
+    All shared visualizers of the case, for every region, are refreshed together.
+
     Parameters:
         case_path: Path to the OpenFOAM case directory
 
     Returns:
         Updated OpenFOAMVisualizer instance
     """
-    visualizer = OpenFOAMVisualizer(case_path)
-    return visualizer.refresh()
+    VISUALIZER_REGISTRY.invalidate(case_path)
+    return VISUALIZER_REGISTRY.get(case_path)
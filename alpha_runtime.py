@@ -6,7 +6,6 @@ from datetime import datetime, timezone
 import json
 import os
 from pathlib import Path
-import re
 import shutil
 import signal
 import subprocess
@@ -113,18 +112,16 @@ def collect_missing_paths(case_dir: Path | str, keys: list[str]) -> list[Path]:
 
 
 def load_cell_zones(case_dir: Path | str) -> dict[str, dict[str, Any]]:
+    # foam_io imports alpha_runtime, so it is imported here
+    from foam_io import scan_zones
+
     cell_zone_path = case_path(case_dir, "cellZones")
     if not cell_zone_path.exists():
         return {}
 
-    content = cell_zone_path.read_text(encoding="utf-8")
-    match = re.search(r"FoamFile\s*\{.*?\}\s*(.*)", content, re.DOTALL)
-    if not match:
-        return {}
-
     cell_zones: dict[str, dict[str, Any]] = {}
-    for zone_name in re.findall(r"(\w+)\s*\{", match.group(1)):
-        cell_zones[zone_name] = {"type": None, "parameters": {}}
+    for zone in scan_zones(cell_zone_path):
+        cell_zones[zone.name] = {"type": None, "parameters": {}}
     return cell_zones
 
 
@@ -0,0 +1,212 @@
+"""
+Benchmarks of OpenFOAMVisualizer on synthetic cases of growing size.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.run --sizes 1e3 1e4 1e5 --times 5
+
+Every measurement runs in a fresh process, so timings and peak memory are not
+influenced by earlier benchmarks. Results are appended to a JSON history and
+compared with the previous run of the same benchmark and size.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+import multiprocessing
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.synthetic import REGIONS, write_synthetic_case
+from foam_io import read_mesh_counts
+
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "history.json"
+
+# Slowdown relative to the previous run that is reported as a regression
+REGRESSION_THRESHOLD = 0.2
+
+# Differences below this many seconds are timer noise, not regressions
+REGRESSION_MIN_SECONDS = 0.01
+
+
+def _visualize_mesh(visualizer) -> None:
+    import pyvista as pv
+
+    plotter = pv.Plotter(off_screen=True)
+    visualizer.visualize_mesh(plotter=plotter, force_reload=True)
+    plotter.close()
+
+
+BENCHMARKS: dict[str, Callable[[Any], Any]] = {
+    "read_full_case": lambda visualizer: visualizer.read_full_case(force_reload=True),
+    "visualize_mesh": _visualize_mesh,
+    "read_line_sample": lambda visualizer: visualizer.read_line_sample("line", force_reload=True),
+    "read_point_sample": lambda visualizer: visualizer.read_point_sample("probes", force_reload=True),
+    "has_case_changed": lambda visualizer: visualizer.has_case_changed(),
+}
+
+
+def _peak_rss_mb() -> float | None:
+    # VmHWM starts fresh in every process, ru_maxrss is inherited across exec on Linux
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _measure(case_dir: str, name: str, repeat: int, queue) -> None:
+    """Run one benchmark in a child process and report its timings and memory."""
+    try:
+        from OpenFOAMVisualizer import OpenFOAMVisualizer
+
+        # The GUI always shows one region of the coupled case
+        visualizer = OpenFOAMVisualizer(case_dir, region=REGIONS[0])
+        baseline_rss = _peak_rss_mb()
+        timings = []
+        tracemalloc.start()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            BENCHMARKS[name](visualizer)
+            timings.append(time.perf_counter() - start)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        queue.put({
+            "seconds": min(timings),
+            "first_seconds": timings[0],
+            "mean_seconds": statistics.fmean(timings),
+            "python_peak_mb": traced_peak / (1024 * 1024),
+            "peak_rss_mb": _peak_rss_mb(),
+            "baseline_rss_mb": baseline_rss,
+        })
+    except Exception as exc:
+        queue.put({"error": f"{type(exc).__name__}: {exc}"})
+
+
+def run_benchmark(case_dir: Path, name: str, repeat: int) -> dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(str(case_dir), name, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return []
+
+
+def find_regressions(history: list[dict[str, Any]], run: dict[str, Any],
+                     threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """Compare a run with the latest earlier result of every benchmark and size."""
+    previous: dict[tuple[str, int], dict[str, Any]] = {}
+    for earlier in history:
+        for result in earlier["results"]:
+            if "seconds" in result:
+                previous[(result["benchmark"], result["cells"])] = dict(result, commit=earlier.get("commit"))
+
+    messages = []
+    for result in run["results"]:
+        before = previous.get((result["benchmark"], result["cells"]))
+        if before is None or "seconds" not in result:
+            continue
+        slowdown = result["seconds"] - before["seconds"]
+        if slowdown > REGRESSION_MIN_SECONDS and slowdown > before["seconds"] * threshold:
+            messages.append(
+                f"{result['benchmark']} at {result['cells']} cells: {result['seconds']:.3f}s "
+                f"vs {before['seconds']:.3f}s at {before['commit'] or 'previous run'}"
+            )
+    return messages
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e3, 1e4, 1e5], help="Approximate cell counts")
+    parser.add_argument("--times", type=int, default=5, help="Time steps per synthetic case")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (the fastest is kept)")
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep the synthetic cases in this directory")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    run = {
+        "commit": _commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = args.workdir or Path(tmpdir)
+        for size in args.sizes:
+            case_dir = workdir / f"synthetic_{int(size)}"
+            start = time.perf_counter()
+            # Written in a child process so the memory it takes does not count for the benchmarks
+            writer = multiprocessing.get_context("spawn").Process(
+                target=write_synthetic_case, args=(case_dir, int(size), args.times))
+            writer.start()
+            writer.join()
+            n_cells = read_mesh_counts(case_dir / "constant" / REGIONS[0] / "polyMesh")["nCells"]
+            print(f"Case with {n_cells} cells per region written in {time.perf_counter() - start:.2f}s")
+
+            for name in args.benchmarks:
+                result = {"benchmark": name, "cells": n_cells, "times": args.times}
+                result.update(run_benchmark(case_dir, name, args.repeat))
+                run["results"].append(result)
+                if "error" in result:
+                    print(f"  {name:<18} failed: {result['error']}")
+                else:
+                    rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "n/a"
+                    print(f"  {name:<18} {result['seconds']:8.3f}s (first {result['first_seconds']:.3f}s)  peak RSS {rss}  "
+                          f"Python peak {result['python_peak_mb']:.1f} MB")
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, run, args.threshold)
+    history.append(run)
+    args.history.write_text(json.dumps(history, indent=1), encoding="utf-8")
+    print(f"Results appended to {args.history}")
+
+    for message in regressions:
+        print(f"Regression: {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from foam_io import foam_header, write_binary_field
+from stages.mesh.structured import hex_mesh, write_poly_mesh
+
+REGIONS = ("solid", "poroFluid")
+PATCHES = ("left", "right", "front", "back", "bottom", "top")
+
+
+def grid_shape(n_cells: int) -> tuple[int, int, int]:
+    """Near-cubic (nx, ny, nz) with about ``n_cells`` cells in total."""
+    n = max(int(round(n_cells ** (1.0 / 3.0))), 1)
+    nz = max(int(round(n_cells / (n * n))), 1)
+    return n, n, nz
+
+
+def write_synthetic_case(case_dir: Path | str, n_cells: int, n_times: int = 5,
+                         regions: tuple[str, ...] = REGIONS, n_probes: int = 10,
+                         n_line_points: int = 100) -> Path:
+    """
+    Write a synthetic case for benchmarks: one structured hex mesh per region,
+    ``n_times`` time steps with D in solid and p_rgh in poroFluid, a line set
+    and probes in postProcessing.
+    """
+    case_dir = Path(case_dir)
+    nx, ny, nz = grid_shape(n_cells)
+    points, faces, owner, neighbour, patches = hex_mesh(nx, ny, nz)
+    total = nx * ny * nz
+    zones = {"upper": np.flatnonzero(np.arange(total) % nz >= nz // 2), "lower": np.flatnonzero(np.arange(total) % nz < nz // 2)}
+    for region in regions:
+        write_poly_mesh(case_dir / "constant" / region / "polyMesh", points, faces, owner, neighbour, patches, zones,
+                        location=f"constant/{region}/polyMesh")
+    (case_dir / "system").mkdir(parents=True, exist_ok=True)
+    (case_dir / "system" / "controlDict").write_text(
+        foam_header("dictionary", "controlDict", "system", binary=False).decode()
+        + "application poroMechanicalFoam;\nstartTime 0;\nendTime 1;\ndeltaT 1;\n", encoding="utf-8"
+    )
+    (case_dir / f"{case_dir.name}.foam").touch()
+
+    centres_z = (np.arange(total) % nz + 0.5) / nz
+    boundary = {name: "zeroGradient" for name in patches}
+    times = [str(step) for step in range(n_times)]
+    for step, time in enumerate(times):
+        decay = np.exp(-step / max(n_times - 1, 1))
+        pressure = 1e4 * (1.0 - centres_z) * decay
+        for region in regions:
+            region_dir = case_dir / time / region
+            region_dir.mkdir(parents=True, exist_ok=True)
+            if region == "solid":
+                displacement = np.zeros((total, 3))
+                displacement[:, 2] = -1e-3 * centres_z * (1.0 - decay)
+                write_binary_field(region_dir / "D", "volVectorField", displacement, "[0 1 0 0 0 0 0]", boundary, time)
+            else:
+                write_binary_field(region_dir / "p_rgh", "volScalarField", pressure, "[1 -1 -2 0 0 0 0]", boundary, time)
+
+        line_dir = case_dir / "postProcessing" / "line" / time
+        line_dir.mkdir(parents=True, exist_ok=True)
+        z = np.linspace(0.0, 1.0, n_line_points)
+        np.savetxt(line_dir / "line_p_rgh.xy",
+                   np.column_stack([np.full_like(z, 0.5), np.full_like(z, 0.5), z, 1e4 * (1.0 - z) * decay]))
+
+    probe_dir = case_dir / "postProcessing" / "probes" / "0"
+    probe_dir.mkdir(parents=True, exist_ok=True)
+    probe_z = np.linspace(0.05, 0.95, n_probes)
+    header = "".join(f"# Probe {index} (0.5 0.5 {z:g})\n" for index, z in enumerate(probe_z))
+    header += "# Time" + "".join(f" p_rgh{index}" for index in range(n_probes)) + "\n"
+    steps = np.arange(max(n_times, 1) * 100) / 100.0
+    values = 1e4 * (1.0 - probe_z)[None, :] * np.exp(-steps / max(n_times - 1, 1))[:, None]
+    rows = "\n".join(" ".join(f"{value:g}" for value in row) for row in np.column_stack([steps, values]))
+    (probe_dir / "p_rgh.dat").write_text(header + rows + "\n", encoding="utf-8")
+    return case_dir
@@ -0,0 +1,708 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gzip
+from pathlib import Path
+import re
+
+import numpy as np
+from foamlib import FoamFieldFile
+
+from alpha_runtime import list_time_directories
+
+# Directories inside a time directory that never hold region fields
+NON_REGION_DIRS = {"uniform", "polyMesh"}
+
+COMPONENT_NAMES = {
+    1: ("value",),
+    3: ("x", "y", "z"),
+    6: ("xx", "xy", "xz", "yy", "yz", "zz"),
+    9: ("xx", "xy", "xz", "yx", "yy", "yz", "zx", "zy", "zz"),
+}
+
+# Components per value of the List<...> types in an internalField
+LIST_COMPONENTS = {
+    "scalar": 1,
+    "vector": 3,
+    "sphericalTensor": 1,
+    "symmTensor": 6,
+    "tensor": 9,
+}
+
+# The header and dimensions always fit in this many bytes
+HEADER_BYTES = 64 * 1024
+
+_HEADER_ENTRY = re.compile(rb'(\w+)\s+("[^"]*"|[^;{}]*);')
+_BINARY_INTERNAL_FIELD = re.compile(rb"internalField\s+nonuniform\s+List<(\w+)>\s*(\d+)\s*\(")
+_ZONE_START = re.compile(rb"([A-Za-z_][\w.:-]*)\s*\{")
+_LIST_START = re.compile(rb"(\d+)\s*\(")
+_NESTED_LIST_END = re.compile(rb"\)\s*\)")
+
+
+@dataclass(frozen=True)
+class FieldFile:
+    time: str
+    region: str
+    field: str
+    path: Path
+
+
+def is_field_file(path: Path | str) -> bool:
+    """Check the header of a file for a volume field class without parsing the payload."""
+    try:
+        with open(path, "rb") as handle:
+            head = handle.read(2048)
+    except OSError:
+        return False
+    return b"FoamFile" in head and b"class" in head and b"vol" in head.split(b"class", 1)[1][:64]
+
+
+def list_field_files(case_dir: Path | str, times: list[str] | None = None) -> list[FieldFile]:
+    """
+    List all volume field files of a case.
+
+    Fields directly in a time directory get the region "", fields in a region
+    subdirectory (e.g. ``1/solid/D``) get the region name.
+    """
+    case_dir = Path(case_dir)
+    if times is None:
+        times = list_time_directories(case_dir)
+
+    field_files: list[FieldFile] = []
+    for time_name in times:
+        time_dir = case_dir / time_name
+        for child in sorted(time_dir.iterdir()):
+            if child.is_file() and is_field_file(child):
+                field_files.append(FieldFile(time_name, "", child.name, child))
+            elif child.is_dir() and child.name not in NON_REGION_DIRS:
+                for region_child in sorted(child.iterdir()):
+                    if region_child.is_file() and is_field_file(region_child):
+                        field_files.append(FieldFile(time_name, child.name, region_child.name, region_child))
+    return field_files
+
+
+def read_header(path: Path | str) -> dict[str, str]:
+    """Entries of the FoamFile header dictionary, e.g. {"format": "binary", "class": "volVectorField"}."""
+    with open(path, "rb") as handle:
+        head = handle.read(HEADER_BYTES)
+    return parse_header(head)
+
+
+def parse_header(content: bytes) -> dict[str, str]:
+    start = content.find(b"FoamFile")
+    if start < 0:
+        return {}
+    body_start = content.find(b"{", start)
+    body_end = content.find(b"}", body_start)
+    if body_start < 0 or body_end < 0:
+        return {}
+    return {
+        key.decode("ascii", errors="replace"): value.strip().strip(b'"').decode("ascii", errors="replace")
+        for key, value in _HEADER_ENTRY.findall(content[body_start + 1:body_end])
+    }
+
+
+def binary_dtype(header: dict[str, str]) -> np.dtype:
+    """Scalar dtype of a binary file from its ``arch`` entry, e.g. "LSB;label=32;scalar=64"."""
+    arch = header.get("arch", "LSB;label=32;scalar=64")
+    byte_order = ">" if "MSB" in arch else "<"
+    scalar_bits = re.search(r"scalar=(\d+)", arch)
+    scalar_bytes = int(scalar_bits.group(1)) // 8 if scalar_bits else 8
+    return np.dtype(f"{byte_order}f{scalar_bytes}")
+
+
+def read_mesh_counts(poly_mesh_dir: Path | str) -> dict[str, int]:
+    """
+    Mesh sizes from the note in the owner header, e.g. {"nPoints": 75, "nCells": 32, ...}.
+
+    Returns an empty dict when the owner file or its note is missing.
+    """
+    owner = Path(poly_mesh_dir) / "owner"
+    if not owner.exists():
+        return {}
+    note = read_header(owner).get("note", "")
+    return {key: int(value) for key, value in re.findall(r"(\w+):\s*(\d+)", note)}
+
+
+def mesh_signature(case_dir: Path | str) -> tuple:
+    """Modification times of all polyMesh files, used to invalidate cached mesh views."""
+    signature = []
+    for mesh_file in sorted(Path(case_dir).glob("constant/**/polyMesh/*")):
+        if mesh_file.is_file():
+            signature.append((str(mesh_file), mesh_file.stat().st_mtime_ns))
+    return tuple(signature)
+
+
+def time_signature(case_dir: Path | str) -> tuple:
+    """Modification times of the time directories and their region subdirectories, which change as a solver writes."""
+    case_dir = Path(case_dir)
+    signature = []
+    for time_name in list_time_directories(case_dir):
+        time_dir = case_dir / time_name
+        signature.append((time_name, time_dir.stat().st_mtime_ns))
+        for child in sorted(time_dir.iterdir()):
+            if child.is_dir() and child.name not in NON_REGION_DIRS:
+                signature.append((f"{time_name}/{child.name}", child.stat().st_mtime_ns))
+    return tuple(signature)
+
+
+def label_dtype(header: dict[str, str]) -> np.dtype:
+    """Label dtype of a binary file from its ``arch`` entry."""
+    arch = header.get("arch", "LSB;label=32;scalar=64")
+    byte_order = ">" if "MSB" in arch else "<"
+    label_bits = re.search(r"label=(\d+)", arch)
+    label_bytes = int(label_bits.group(1)) // 8 if label_bits else 4
+    return np.dtype(f"{byte_order}i{label_bytes}")
+
+
+def read_cell_zones(path: Path | str) -> dict[str, np.ndarray]:
+    """
+    Read the cell labels of every zone in a cellZones file, ASCII or binary.
+
+    The file is tokenized like in ``scan_zones``, so comments are skipped.
+    Zones without a cellLabels entry get an empty label array.
+    """
+    labels: dict[str, np.ndarray] = {}
+    return {zone.name: labels.get(zone.name, np.empty(0, dtype=np.int64))
+            for zone in _scan_zones(path, labels)}
+
+
+@dataclass(frozen=True)
+class ZoneSummary:
+    name: str
+    type: str | None
+    size: int
+
+
+class _TokenStream:
+    """
+    Tokenizer over a binary file handle that reads in chunks.
+
+    Only dictionary keywords and punctuation are tokenized one by one; list
+    payloads are skipped in bulk with ``skip_ascii_list`` or ``skip_bytes``.
+    """
+
+    CHUNK = 64 * 1024
+    PUNCTUATION = b"{}();"
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.buffer = b""
+        self.position = 0
+
+    def _fill(self) -> bool:
+        chunk = self.handle.read(self.CHUNK)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def _peek(self) -> bytes:
+        if self.position >= len(self.buffer) and not self._fill():
+            return b""
+        return self.buffer[self.position:self.position + 1]
+
+    def _skip_space_and_comments(self) -> None:
+        while True:
+            char = self._peek()
+            if char.isspace():
+                self.position += 1
+            elif char == b"/":
+                if self.position + 1 >= len(self.buffer):
+                    self._fill()
+                following = self.buffer[self.position + 1:self.position + 2]
+                if following == b"/":
+                    self._skip_past(b"\n")
+                elif following == b"*":
+                    self.position += 2
+                    self._skip_past(b"*/")
+                else:
+                    return
+            else:
+                return
+
+    def _skip_past(self, marker: bytes) -> None:
+        while True:
+            found = self.buffer.find(marker, self.position)
+            if found >= 0:
+                self.position = found + len(marker)
+                return
+            # Keep a possible partial marker at the end of the buffer
+            self.position = max(self.position, len(self.buffer) - len(marker) + 1)
+            if not self._fill():
+                self.position = len(self.buffer)
+                return
+
+    def token(self) -> bytes:
+        """Next word, number, quoted string or punctuation character; b"" at the end of the file."""
+        self._skip_space_and_comments()
+        char = self._peek()
+        if not char or char in self.PUNCTUATION:
+            self.position += len(char)
+            return char
+        start = self.position
+        quoted = char == b'"'
+        self.position += 1
+        while True:
+            while self.position < len(self.buffer):
+                char = self.buffer[self.position:self.position + 1]
+                if quoted:
+                    self.position += 1
+                    if char == b'"':
+                        return self.buffer[start:self.position]
+                elif char.isspace() or char in self.PUNCTUATION:
+                    return self.buffer[start:self.position]
+                else:
+                    self.position += 1
+            # The token continues into the next chunk
+            length = self.position - start
+            self.position = start
+            if not self._fill():
+                self.position = len(self.buffer)
+                return self.buffer[start:]
+            start, self.position = 0, length
+
+    def skip_ascii_list(self) -> None:
+        """Skip past the ")" closing a list of plain numbers."""
+        self._skip_past(b")")
+
+    def read_ascii_list(self) -> bytes:
+        """The content of a list of plain numbers up to its closing ")"."""
+        parts = []
+        while True:
+            found = self.buffer.find(b")", self.position)
+            if found >= 0:
+                parts.append(self.buffer[self.position:found])
+                self.position = found + 1
+                return b"".join(parts)
+            parts.append(self.buffer[self.position:])
+            self.position = len(self.buffer)
+            if not self._fill():
+                return b"".join(parts)
+
+    def read_bytes(self, count: int) -> bytes:
+        data = self.buffer[self.position:self.position + count]
+        self.position += len(data)
+        if len(data) < count:
+            data += self.handle.read(count - len(data))
+            self.buffer, self.position = b"", 0
+        return data
+
+    def skip_bytes(self, count: int) -> None:
+        remaining = len(self.buffer) - self.position
+        if count <= remaining:
+            self.position += count
+            return
+        self.handle.seek(count - remaining, 1)
+        self.buffer, self.position = b"", 0
+
+
+def _skip_block(tokens: _TokenStream, closing: bytes) -> None:
+    opening = {b"}": b"{", b")": b"("}[closing]
+    depth = 1
+    while depth:
+        token = tokens.token()
+        if not token:
+            return
+        if token == opening:
+            depth += 1
+        elif token == closing:
+            depth -= 1
+
+
+def _scan_zone(tokens: _TokenStream, name: str, header: dict[str, str],
+               labels: dict[str, np.ndarray] | None = None) -> ZoneSummary:
+    """
+    Read the entries of one zone dictionary up to its closing brace.
+
+    The label list is skipped, or read into ``labels`` under the zone name when given.
+    """
+    zone_type, size = None, 0
+    while True:
+        key = tokens.token()
+        if not key or key == b"}":
+            return ZoneSummary(name, zone_type, size)
+        if key == b"{":
+            _skip_block(tokens, b"}")
+            continue
+        if key in (b";", b"(", b")"):
+            continue
+
+        value = tokens.token()
+        if key == b"type":
+            zone_type = value.decode("ascii", errors="replace")
+        elif key.endswith(b"Labels"):
+            if value.startswith(b"List<"):
+                value = tokens.token()
+            size = int(value) if value.isdigit() else 0
+            opening = tokens.token()
+            binary = header.get("format") == "binary"
+            if opening == b"(":
+                if labels is None:
+                    if binary:
+                        tokens.skip_bytes(size * label_dtype(header).itemsize)
+                    else:
+                        tokens.skip_ascii_list()
+                elif binary:
+                    dtype = label_dtype(header)
+                    labels[name] = np.frombuffer(tokens.read_bytes(size * dtype.itemsize), dtype=dtype).astype(np.int64)
+                else:
+                    labels[name] = np.array(tokens.read_ascii_list().split(), dtype=np.int64)
+                if binary:
+                    tokens.token()
+            elif opening == b"{":
+                # Uniform list, e.g. 10{0}
+                value = tokens.token()
+                if labels is not None and value.isdigit():
+                    labels[name] = np.full(size, int(value), dtype=np.int64)
+                if value != b"}":
+                    _skip_block(tokens, b"}")
+            continue
+
+        # Skip the rest of any other entry
+        while value and value != b";":
+            if value == b"{":
+                _skip_block(tokens, b"}")
+                break
+            if value == b"(":
+                _skip_block(tokens, b")")
+            elif value == b"}":
+                return ZoneSummary(name, zone_type, size)
+            value = tokens.token()
+
+
+def scan_zones(path: Path | str) -> list[ZoneSummary]:
+    """
+    List the zones of a cellZones (or faceZones/pointZones) file with their type and size.
+
+    The file is streamed: label lists are skipped by byte length in binary
+    files and by a search for the closing parenthesis in ASCII files, so
+    listing the zones of a large mesh reads almost nothing.
+    """
+    return _scan_zones(path)
+
+
+def _scan_zones(path: Path | str, labels: dict[str, np.ndarray] | None = None) -> list[ZoneSummary]:
+    path = Path(path)
+    compressed = path.with_name(path.name + ".gz")
+    if not path.exists() and compressed.exists():
+        opener = gzip.open(compressed, "rb")
+    else:
+        opener = open(path, "rb")
+
+    zones: list[ZoneSummary] = []
+    header: dict[str, str] = {}
+    with opener as handle:
+        tokens = _TokenStream(handle)
+        previous = b""
+        while True:
+            token = tokens.token()
+            if not token:
+                break
+            if token == b"{":
+                name = previous.decode("ascii", errors="replace")
+                if name == "FoamFile":
+                    header = _scan_header(tokens)
+                elif previous and previous not in _TokenStream.PUNCTUATION:
+                    zones.append(_scan_zone(tokens, name, header, labels))
+                else:
+                    _skip_block(tokens, b"}")
+                previous = b""
+                continue
+            previous = token
+    return zones
+
+
+def _scan_header(tokens: _TokenStream) -> dict[str, str]:
+    header: dict[str, str] = {}
+    while True:
+        key = tokens.token()
+        if not key or key == b"}":
+            return header
+        values = []
+        value = tokens.token()
+        while value and value not in (b";", b"}"):
+            values.append(value)
+            value = tokens.token()
+        header[key.decode("ascii", errors="replace")] = b" ".join(values).strip(b'"').decode("ascii", errors="replace")
+        if value == b"}":
+            return header
+
+
+def read_foam_bytes(path: Path | str) -> bytes:
+    """Content of an OpenFOAM file, read from ``<name>.gz`` when only the compressed file exists."""
+    path = Path(path)
+    compressed = path.with_name(path.name + ".gz")
+    if not path.exists() and compressed.exists():
+        return gzip.decompress(compressed.read_bytes())
+    return path.read_bytes()
+
+
+def _data_start(content: bytes) -> int:
+    """Position right after the FoamFile header dictionary."""
+    start = content.find(b"FoamFile")
+    return content.find(b"}", start) + 1 if start >= 0 else 0
+
+
+def _read_list(content: bytes, position: int, header: dict[str, str], kind: str,
+               n_components: int = 1) -> tuple[np.ndarray, int]:
+    """
+    Parse the next list at or after ``position``, ASCII or binary.
+
+    Parameters:
+        kind: "label" for integer lists, "scalar" for floating point lists
+        n_components: Values per entry, 3 for points; ASCII entries may be
+            parenthesised, e.g. ``(0 1 2)`` or ``4(0 1 2 3)``
+
+    Returns:
+        The flat values and the position after the closing parenthesis
+    """
+    match = _LIST_START.search(content, position)
+    if match is None:
+        raise ValueError("No list found")
+    count = int(match.group(1))
+
+    if header.get("format") == "binary":
+        dtype = label_dtype(header) if kind == "label" else binary_dtype(header)
+        values = np.frombuffer(content, dtype=dtype, count=count * n_components, offset=match.end())
+        return values.astype(np.int64 if kind == "label" else float), match.end() + values.nbytes + 1
+
+    if count == 0:
+        return np.empty(0, dtype=np.int64 if kind == "label" else float), content.find(b")", match.end()) + 1
+    first_close = content.find(b")", match.end())
+    if content.find(b"(", match.end(), first_close) >= 0:
+        end = _NESTED_LIST_END.search(content, match.end())
+        if end is None:
+            raise ValueError("Unterminated list")
+        body, position = content[match.end():end.start() + 1], end.end()
+    else:
+        body, position = content[match.end():first_close], first_close + 1
+    tokens = body.replace(b"(", b" ").replace(b")", b" ").split()
+    return np.array(tokens, dtype=np.int64 if kind == "label" else float), position
+
+
+def read_label_list(path: Path | str) -> np.ndarray:
+    """Read a labelList such as ``owner`` or ``neighbour``."""
+    content = read_foam_bytes(path)
+    values, _ = _read_list(content, _data_start(content), parse_header(content), "label")
+    return values
+
+
+def read_points(path: Path | str) -> np.ndarray:
+    """Read a vectorField such as ``points`` as an array of shape (n, 3)."""
+    content = read_foam_bytes(path)
+    values, _ = _read_list(content, _data_start(content), parse_header(content), "scalar", 3)
+    return values.reshape(-1, 3)
+
+
+def read_faces(path: Path | str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read a faceList or faceCompactList.
+
+    Returns:
+        (offsets, point_labels) where the points of face i are
+        ``point_labels[offsets[i]:offsets[i + 1]]``
+    """
+    content = read_foam_bytes(path)
+    header = parse_header(content)
+    if header.get("class") == "faceCompactList":
+        offsets, position = _read_list(content, _data_start(content), header, "label")
+        labels, _ = _read_list(content, position, header, "label")
+        return offsets, labels
+
+    # ASCII faceList: every face is written as <size>(<labels>)
+    match = _LIST_START.search(content, _data_start(content))
+    count = int(match.group(1)) if match else 0
+    tokens, _ = _read_list(content, _data_start(content), header, "label")
+    if count == 0:
+        return np.zeros(1, dtype=np.int64), tokens
+    size = int(tokens[0])
+    if len(tokens) == count * (size + 1) and (tokens[::size + 1] == size).all():
+        return np.arange(count + 1, dtype=np.int64) * size, tokens.reshape(count, size + 1)[:, 1:].ravel()
+
+    heads = np.empty(count, dtype=np.int64)
+    flat = tokens.tolist()
+    position = 0
+    for face in range(count):
+        heads[face] = position
+        position += flat[position] + 1
+    sizes = tokens[heads]
+    keep = np.ones(len(tokens), dtype=bool)
+    keep[heads] = False
+    return np.concatenate([[0], np.cumsum(sizes)]), tokens[keep]
+
+
+def read_boundary(path: Path | str) -> dict[str, dict[str, str]]:
+    """Entries of every patch in a polyMesh ``boundary`` file, e.g. {"top": {"type": "patch", "nFaces": "16", ...}}."""
+    content = read_foam_bytes(path)
+    position = _data_start(content)
+    patches: dict[str, dict[str, str]] = {}
+    while True:
+        patch = _ZONE_START.search(content, position)
+        if patch is None:
+            break
+        end = content.find(b"}", patch.end())
+        if end < 0:
+            break
+        patches[patch.group(1).decode("ascii", errors="replace")] = {
+            key.decode("ascii", errors="replace"): value.strip().decode("ascii", errors="replace")
+            for key, value in _HEADER_ENTRY.findall(content[patch.end():end])
+        }
+        position = end + 1
+    return patches
+
+
+def map_internal_field(path: Path | str) -> np.memmap | None:
+    """
+    Map the internalField of a binary field file without reading it.
+
+    The payload offset is located from the text before it, and the values are
+    exposed as a read-only ``np.memmap`` of shape (n, n_components), so only the
+    pages actually indexed are read from disk.
+
+    Returns:
+        The mapped array, or None if the file is not binary or its internalField
+        is not a nonuniform list
+    """
+    header = read_header(path)
+    if header.get("format") != "binary":
+        return None
+
+    with open(path, "rb") as handle:
+        head = handle.read(HEADER_BYTES)
+    match = _BINARY_INTERNAL_FIELD.search(head)
+    if match is None:
+        return None
+    list_type = match.group(1).decode("ascii")
+    if list_type not in LIST_COMPONENTS:
+        return None
+
+    n_values = int(match.group(2))
+    n_components = LIST_COMPONENTS[list_type]
+    dtype = binary_dtype(header)
+    offset = match.end()
+    payload_bytes = n_values * n_components * dtype.itemsize
+
+    # The payload must be closed right after its announced size
+    with open(path, "rb") as handle:
+        handle.seek(offset + payload_bytes)
+        if handle.read(1) != b")":
+            return None
+    if n_values == 0:
+        return np.empty((0, n_components), dtype=dtype)
+
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n_values, n_components))
+
+
+def read_internal_field(path: Path | str) -> np.ndarray:
+    """
+    Read the internalField of a volume field as a 2D array of shape (n, n_components).
+
+    Binary nonuniform fields are memory-mapped instead of parsed, so indexing
+    the result only touches the bytes needed. Uniform fields are returned as a
+    single row.
+    """
+    mapped = map_internal_field(path)
+    if mapped is not None:
+        return mapped
+
+    values = np.asarray(FoamFieldFile(path).internal_field, dtype=float)
+    if values.ndim == 0:
+        return values.reshape(1, 1)
+    if values.ndim == 1:
+        # A uniform vector/tensor is a single row, a nonuniform scalar field a column
+        if values.size in COMPONENT_NAMES and _internal_field_kind(path) == "uniform":
+            return values.reshape(1, -1)
+        return values.reshape(-1, 1)
+    return values
+
+
+def _internal_field_kind(path: Path | str) -> str:
+    with open(path, "rb") as handle:
+        head = handle.read(64 * 1024)
+    marker = head.find(b"internalField")
+    if marker < 0:
+        return ""
+    return head[marker:marker + 64].split()[1].decode("ascii", errors="replace").rstrip(";")
+
+
+def component_names(n_components: int) -> tuple[str, ...]:
+    return COMPONENT_NAMES.get(n_components, tuple(str(i) for i in range(n_components)))
+
+
+# Architecture of every binary file written by the GUI
+BINARY_ARCH = "LSB;label=32;scalar=64"
+
+
+def foam_header(cls: str, obj: str, location: str = "", binary: bool = True, note: str = "") -> bytes:
+    """FoamFile header dictionary for a file written by the GUI."""
+    lines = ["FoamFile", "{", "    version 2.0;", f"    format {'binary' if binary else 'ascii'};"]
+    if binary:
+        lines.append(f'    arch "{BINARY_ARCH}";')
+    lines.append(f"    class {cls};")
+    if location:
+        lines.append(f'    location "{location}";')
+    if note:
+        lines.append(f'    note "{note}";')
+    lines += [f"    object {obj};", "}", ""]
+    return "\n".join(lines).encode("ascii")
+
+
+def binary_list(values: np.ndarray, kind: str = "scalar") -> bytes:
+    """
+    A list in binary format: count, then the raw little-endian payload in parentheses.
+
+    ``kind`` is "label" for 32-bit integers or "scalar" for 64-bit floats; rows
+    of a 2D array (e.g. points) are written contiguously.
+    """
+    dtype = "<i4" if kind == "label" else "<f8"
+    values = np.ascontiguousarray(values, dtype=dtype)
+    return b"%d\n(" % len(values) + values.tobytes() + b")\n"
+
+
+def write_binary_field(path: Path | str, cls: str, values: np.ndarray, dimensions: str,
+                       boundary: dict[str, str], location: str = "") -> None:
+    """
+    Write a volume field in binary format.
+
+    Parameters:
+        path: Target file; its name is the field name
+        cls: Field class, e.g. "volScalarField" or "volVectorField"
+        values: Array of shape (n_cells,) or (n_cells, n_components)
+        dimensions: Dimension set, e.g. "[1 -1 -2 0 0 0 0]"
+        boundary: Boundary condition type per patch name
+        location: Time directory, written to the header
+    """
+    path = Path(path)
+    values = np.asarray(values, dtype=float)
+    n_components = 1 if values.ndim == 1 else values.shape[1]
+    list_type = {value: key for key, value in LIST_COMPONENTS.items() if key != "sphericalTensor"}[n_components]
+    boundary_entries = "".join(f"    {name}\n    {{\n        type {kind};\n    }}\n" for name, kind in boundary.items())
+    with open(path, "wb") as handle:
+        handle.write(foam_header(cls, path.name, location))
+        handle.write(f"dimensions {dimensions};\n\ninternalField nonuniform List<{list_type}> ".encode("ascii"))
+        handle.write(binary_list(values))
+        handle.write(f";\n\nboundaryField\n{{\n{boundary_entries}}}\n".encode("ascii"))
+
+
+def cell_zones_bytes(cell_zones: dict[str, np.ndarray], location: str = "constant/polyMesh") -> bytes:
+    """Content of a binary cellZones file."""
+    content = [foam_header("regIOobject", "cellZones", location), b"%d\n(\n" % len(cell_zones)]
+    for name, labels in cell_zones.items():
+        content.append(f"{name}\n{{\n    type cellZone;\ncellLabels List<label> ".encode("ascii"))
+        content.append(binary_list(labels, "label") + b";\n}\n")
+    return b"".join(content) + b")\n"
+
+
+def write_cell_zones(path: Path | str, cell_zones: dict[str, np.ndarray], location: str = "constant/polyMesh") -> None:
+    """
+    Write a cellZones file in binary format.
+
+    The file is written next to ``path`` and then renamed, so a file that is
+    hardlinked elsewhere is replaced rather than rewritten.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(cell_zones_bytes(cell_zones, location))
+    tmp_path.replace(path)
@@ -1,13 +1,12 @@
 import streamlit as st
-from OpenFOAMVisualizer import OpenFOAMVisualizer
+from OpenFOAMVisualizer import VISUALIZER_REGISTRY
 
 
-# Create a singleton visualizer to ensure we only create one instance
-# This helps with caching and performance
-#@st.cache_resource
-def get_openfoam_visualizer(case_path):
-    """Get a cached OpenFOAM visualizer for the case."""
-    return OpenFOAMVisualizer(case_path)
+# Visualizers are shared through a process-wide registry, so all sessions
+# and helpers reuse the same cached reads of a case
+def get_openfoam_visualizer(case_path, region=None):
+    """Get the shared OpenFOAM visualizer for the case."""
+    return VISUALIZER_REGISTRY.get(case_path, region)
 
 # Define custom color palettes
 COLOR_PALETTES = [
@@ -76,3 +75,9 @@ def add_visu_sidebar():
             value=vis["opacity"],
             step=0.1
         )
+
+        vis["full_resolution"] = st.toggle(
+            "Full Resolution Mesh",
+            value=vis.get("full_resolution", False),
+            help="Send every cell to the browser instead of the decimated outer surface. Slow for large meshes."
+        )
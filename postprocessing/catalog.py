@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+import os
+from pathlib import Path
+import re
+
+from postprocessing.sets import set_field_names
+
+SET_SUFFIXES = {".xy", ".csv", ".raw"}
+SURFACE_SUFFIXES = {".vtk", ".vtp", ".obj", ".stl"}
+PROBE_SUFFIXES = {".dat"}
+
+_VTP_ARRAY_NAME = re.compile(rb'<DataArray[^>]*\sName="([^"]+)"')
+
+
+def _time_value(name: str) -> float | None:
+    try:
+        return float(name)
+    except ValueError:
+        return None
+
+
+def _surface_fields(path: Path) -> list[str]:
+    """Field names of a surface file, from the XML header of .vtp files or the legacy ``<field>_<surface>`` name."""
+    if path.suffix == ".vtp":
+        try:
+            with open(path, "rb") as handle:
+                head = handle.read(64 * 1024)
+        except OSError:
+            return []
+        return [name.decode("utf-8", errors="replace") for name in _VTP_ARRAY_NAME.findall(head)]
+    if "_" in path.stem:
+        return [path.stem.rsplit("_", 1)[0]]
+    return []
+
+
+@dataclass
+class CatalogEntry:
+    """One function-object output directory below ``postProcessing``."""
+
+    name: str
+    path: Path
+    kind: str = "other"
+    times: list[str] = field(default_factory=list)
+    files: dict[str, list[str]] = field(default_factory=dict)
+    fields: list[str] = field(default_factory=list)
+    _time_mtimes: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def exact(self, time: str | float) -> str | None:
+        """Original name of the time directory matching a time exactly, e.g. 100 for '100.0'."""
+        if str(time) in self.files:
+            return str(time)
+        value = _time_value(str(time))
+        if value is None:
+            return None
+        for name in self.times:
+            if math.isclose(float(name), value, rel_tol=1e-9, abs_tol=1e-12):
+                return name
+        return None
+
+    def nearest(self, time: str | float | None = None) -> str:
+        """Original name of the time directory closest to a time (default is the latest)."""
+        if not self.times:
+            raise FileNotFoundError(f"No time directories found in {self.path}")
+        if time is None:
+            return self.times[-1]
+        exact = self.exact(time)
+        if exact is not None:
+            return exact
+        value = _time_value(str(time))
+        if value is None:
+            return self.times[-1]
+        return min(self.times, key=lambda name: abs(float(name) - value))
+
+    def file_paths(self, time: str, suffixes: set[str] | None = None) -> list[Path]:
+        names = self.files.get(time, [])
+        return [self.path / time / name for name in names if suffixes is None or Path(name).suffix in suffixes]
+
+    def _scan_time(self, time: str) -> None:
+        self.files[time] = sorted(entry.name for entry in os.scandir(self.path / time) if entry.is_file())
+
+    def _classify(self) -> None:
+        suffixes = {Path(name).suffix for names in self.files.values() for name in names}
+        if suffixes & SET_SUFFIXES:
+            self.kind = "sets"
+        elif suffixes & SURFACE_SUFFIXES:
+            self.kind = "surfaces"
+        elif suffixes & PROBE_SUFFIXES or self._has_probe_header():
+            self.kind = "probes"
+        else:
+            self.kind = "other"
+
+        fields: set[str] = set()
+        latest = self.files.get(self.times[-1], []) if self.times else []
+        if self.kind == "sets":
+            # <setName>_<field1>_<field2>...xy
+            fields.update(set_field_names([Path(name).stem for name in latest
+                                           if Path(name).suffix in SET_SUFFIXES]).values())
+        for name in latest:
+            path = Path(name)
+            if self.kind == "surfaces" and path.suffix in SURFACE_SUFFIXES:
+                fields.update(_surface_fields(self.path / self.times[-1] / name))
+            elif self.kind == "probes" and path.suffix in PROBE_SUFFIXES | {""}:
+                fields.add(path.stem)
+        self.fields = sorted(fields)
+
+    def _has_probe_header(self) -> bool:
+        """Older OpenFOAM versions write probes to files named after the field, without a suffix."""
+        for path in self.file_paths(self.times[-1]) if self.times else []:
+            if not path.suffix:
+                with open(path, "rb") as handle:
+                    if handle.read(7) == b"# Probe":
+                        return True
+        return False
+
+    def refresh(self) -> bool:
+        """Rescan only time directories that are new or whose mtime changed."""
+        current = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir() and _time_value(entry.name) is not None:
+                    current[entry.name] = entry.stat().st_mtime_ns
+
+        changed = [time for time, mtime in current.items() if self._time_mtimes.get(time) != mtime]
+        removed = [time for time in self._time_mtimes if time not in current]
+        if not changed and not removed:
+            return False
+
+        for time in removed:
+            self.files.pop(time, None)
+        for time in changed:
+            self._scan_time(time)
+        self._time_mtimes = current
+        self.times = sorted(current, key=float)
+        self._classify()
+        return True
+
+
+class PostProcessingCatalog:
+    """
+    Index of all function-object outputs below ``postProcessing``.
+
+    Each output is listed with its kind (sets, surfaces, probes or other), its
+    time directories under their original names, the files of every time and
+    the fields found in the latest time. ``refresh`` only rescans time
+    directories that are new or changed.
+    """
+
+    def __init__(self, case_dir: Path | str):
+        self.path = Path(case_dir) / "postProcessing"
+        self.entries: dict[str, CatalogEntry] = {}
+
+    def refresh(self) -> "PostProcessingCatalog":
+        if not self.path.is_dir():
+            self.entries.clear()
+            return self
+
+        names = set()
+        with os.scandir(self.path) as children:
+            for child in children:
+                if child.is_dir():
+                    names.add(child.name)
+                    entry = self.entries.setdefault(child.name, CatalogEntry(child.name, Path(child.path)))
+                    entry.refresh()
+
+        for name in [name for name in self.entries if name not in names]:
+            del self.entries[name]
+        return self
+
+    def get(self, name: str) -> CatalogEntry | None:
+        return self.entries.get(name)
+
+    def names(self, kind: str | None = None) -> list[str]:
+        return sorted(name for name, entry in self.entries.items() if kind is None or entry.kind == kind)
@@ -0,0 +1,275 @@
+"""
+Fields derived from the arrays the solver wrote, computed with NumPy over whole arrays.
+
+Derived fields are registered by name with the arrays they need. They are
+computed on the datasets returned by the OpenFOAM reader, so symmetric tensors
+arrive in VTK component order (xx, yy, zz, xy, yz, xz).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+from foam_io import read_cell_zones
+from models.hydraulic_laws import HYDRAULIC_LAWS
+
+# Specific weight of water [N/m^3], used when poroHydraulicProperties has no gamma
+GAMMA_WATER = 9.81e3
+
+# Component order of symmetric tensors in VTK arrays
+VTK_SYMM_TENSOR = ("xx", "yy", "zz", "xy", "yz", "xz")
+
+
+@dataclass(frozen=True)
+class SaturationModel:
+    law: str
+    coeffs: dict[str, float] = field(default_factory=dict)
+
+
+def _number(value: Any) -> Any:
+    """Plain value of a foamlib entry, e.g. the value of a Dimensioned."""
+    value = getattr(value, "value", value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return np.asarray(value, dtype=float)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _saturation_model(entries: Mapping[str, Any]) -> SaturationModel | None:
+    law = entries.get("SWCC")
+    if not isinstance(law, str):
+        return None
+    coeffs = entries.get(f"{law}Coeffs", {})
+    return SaturationModel(law, {key: _number(value) for key, value in coeffs.items()})
+
+
+@dataclass
+class HydraulicProperties:
+    """Parameters of poroHydraulicProperties used by derived fields."""
+
+    gamma_water: float = GAMMA_WATER
+    href: float = 0.0
+    saturation: SaturationModel | None = None
+    zone_saturation: dict[str, SaturationModel] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, entries: Mapping[str, Any]) -> "HydraulicProperties":
+        """
+        Parse the dictionary of either layout: one global SWCC entry (as in the
+        template) or one subdictionary per cellZone (as written by the GUI).
+        """
+        gamma = _number(entries.get("gamma", GAMMA_WATER))
+        gamma_water = float(np.linalg.norm(gamma)) if isinstance(gamma, np.ndarray) else float(gamma)
+        zone_saturation = {
+            name: model for name, value in entries.items()
+            if isinstance(value, Mapping) and (model := _saturation_model(value)) is not None
+        }
+        return cls(gamma_water or GAMMA_WATER, float(_number(entries.get("href", 0.0))),
+                   _saturation_model(entries), zone_saturation)
+
+    @classmethod
+    def from_case(cls, case_dir: Path | str) -> "HydraulicProperties":
+        path = Path(case_dir) / "constant" / "poroFluid" / "poroHydraulicProperties"
+        if not path.exists():
+            return cls()
+        from foamlib import FoamFile
+
+        return cls.from_dict(FoamFile(path).as_dict())
+
+
+def swcc_coefficients(model: SaturationModel) -> dict[str, Any]:
+    """Coefficients of a SWCC, with the defaults of the hydraulics page for entries the case does not set."""
+    law = HYDRAULIC_LAWS["SWCC"].get(model.law)
+    if law is None:
+        raise ValueError(f"Unknown SWCC law: {model.law}")
+    return {name: parameter.default_value for name, parameter in law.parameters.items()} | model.coeffs
+
+
+def saturation(pressure: np.ndarray, model: SaturationModel | None) -> np.ndarray:
+    """
+    Degree of saturation from the pore pressure with a soil-water characteristic curve.
+
+    Suction is negative pressure; without a model or with the "saturated" law
+    the soil is fully saturated. Missing coefficients default to the values
+    in models/hydraulic_laws.py.
+    """
+    pressure = np.asarray(pressure, dtype=float)
+    if model is None or model.law == "saturated":
+        return np.ones_like(pressure)
+    coeffs = swcc_coefficients(model)
+
+    if model.law == "vanGenuchten":
+        n = coeffs["n"]
+        s_0, s_r = coeffs["S_0"], coeffs["S_r"]
+        suction = np.maximum(-pressure, 0.0)
+        return s_r + (s_0 - s_r) * (1.0 + (coeffs["alpha"] * suction) ** n) ** (1.0 / n - 1.0)
+
+    if model.law == "brooksCorey":
+        n, p_e = coeffs["n"], coeffs["p_e"]
+        s_e, s_r = coeffs.get("S_e", coeffs["S_0"]), coeffs["S_r"]
+        result = np.full_like(pressure, s_e)
+        dry = pressure < p_e
+        result[dry] = s_r + (s_e - s_r) * (p_e / pressure[dry]) ** n
+        return result
+
+    raise ValueError(f"Unknown SWCC law: {model.law}")
+
+
+@dataclass
+class DerivedContext:
+    """
+    Case data derived fields may need besides the arrays, loaded on first use.
+
+    ``n_cells`` is only set while computing cell data of the full internal
+    mesh, whose cells can be mapped to cellZones.
+    """
+
+    case_dir: Path
+    region: str = ""
+    n_cells: int | None = None
+    _hydraulics: HydraulicProperties | None = field(default=None, repr=False)
+    _cell_zones: dict[str, np.ndarray] | None = field(default=None, repr=False)
+
+    @property
+    def hydraulics(self) -> HydraulicProperties:
+        if self._hydraulics is None:
+            self._hydraulics = HydraulicProperties.from_case(self.case_dir)
+        return self._hydraulics
+
+    @property
+    def cell_zones(self) -> dict[str, np.ndarray] | None:
+        """Cell labels of every cellZone, or None if the current values are not per cell of the internal mesh."""
+        if self.n_cells is None:
+            return None
+        if self._cell_zones is None:
+            constant = Path(self.case_dir) / "constant"
+            path = (constant / self.region if self.region else constant) / "polyMesh" / "cellZones"
+            self._cell_zones = read_cell_zones(path) if path.exists() else {}
+        if any(len(labels) and labels.max() >= self.n_cells for labels in self._cell_zones.values()):
+            return None
+        return self._cell_zones
+
+
+@dataclass(frozen=True)
+class DerivedField:
+    name: str
+    requires: tuple[str, ...]
+    compute: Callable[[Mapping[str, np.ndarray], DerivedContext], np.ndarray | None]
+    description: str = ""
+
+
+DERIVED_FIELDS: dict[str, DerivedField] = {}
+
+
+def register_derived_field(name: str, requires: tuple[str, ...], description: str = ""):
+    """Register a function ``(arrays, context) -> values`` as a derived field."""
+    def decorator(compute):
+        DERIVED_FIELDS[name] = DerivedField(name, tuple(requires), compute, description)
+        return compute
+    return decorator
+
+
+def available_derived_fields(array_names) -> list[str]:
+    """Derived fields that can be computed from the given arrays and are not written by the solver."""
+    array_names = set(array_names)
+    return [
+        name for name, derived in DERIVED_FIELDS.items()
+        if name not in array_names and array_names.issuperset(derived.requires)
+    ]
+
+
+def _symm_components(values: np.ndarray) -> dict[str, np.ndarray]:
+    """Components of symmetric tensors, from 6 VTK-ordered or 9 row-major components."""
+    values = np.asarray(values, dtype=float)
+    if values.shape[1] == 9:
+        return {
+            "xx": values[:, 0], "yy": values[:, 4], "zz": values[:, 8],
+            "xy": 0.5 * (values[:, 1] + values[:, 3]),
+            "yz": 0.5 * (values[:, 5] + values[:, 7]),
+            "xz": 0.5 * (values[:, 2] + values[:, 6]),
+        }
+    return {name: values[:, index] for index, name in enumerate(VTK_SYMM_TENSOR)}
+
+
+@register_derived_field("mag(D)", ("D",), "Displacement magnitude")
+def displacement_magnitude(arrays, context):
+    displacement = np.asarray(arrays["D"], dtype=float)
+    return np.sqrt(np.einsum("ij,ij->i", displacement, displacement))
+
+
+@register_derived_field("vonMises(sigmaEff)", ("sigmaEff",), "von Mises equivalent of the effective stress")
+def von_mises(arrays, context):
+    s = _symm_components(arrays["sigmaEff"])
+    mean = (s["xx"] + s["yy"] + s["zz"]) / 3.0
+    deviatoric = (s["xx"] - mean) ** 2 + (s["yy"] - mean) ** 2 + (s["zz"] - mean) ** 2
+    shear = s["xy"] ** 2 + s["yz"] ** 2 + s["xz"] ** 2
+    return np.sqrt(1.5 * deviatoric + 3.0 * shear)
+
+
+@register_derived_field("meanEffectiveStress", ("sigmaEff",), "Mean effective stress p', compression positive")
+def mean_effective_stress(arrays, context):
+    s = _symm_components(arrays["sigmaEff"])
+    return -(s["xx"] + s["yy"] + s["zz"]) / 3.0
+
+
+@register_derived_field("totalHead", ("p_rgh",), "Total head p_rgh / gamma_w + href")
+def total_head(arrays, context):
+    hydraulics = context.hydraulics
+    return np.asarray(arrays["p_rgh"], dtype=float).ravel() / hydraulics.gamma_water + hydraulics.href
+
+
+@register_derived_field("saturation", ("p_rgh",), "Degree of saturation from the SWCC of each cellZone")
+def degree_of_saturation(arrays, context):
+    hydraulics = context.hydraulics
+    pressure = np.asarray(arrays["p_rgh"], dtype=float).ravel()
+    if not hydraulics.zone_saturation:
+        return saturation(pressure, hydraulics.saturation)
+
+    models = list(hydraulics.zone_saturation.values())
+    if all(model == models[0] for model in models) and hydraulics.saturation in (None, models[0]):
+        return saturation(pressure, models[0])
+    if context.cell_zones is None:
+        # Zones differ and these values cannot be mapped to cells
+        return None
+
+    result = saturation(pressure, hydraulics.saturation)
+    for zone, model in hydraulics.zone_saturation.items():
+        labels = context.cell_zones.get(zone)
+        if labels is not None and len(labels):
+            result[labels] = saturation(pressure[labels], model)
+    return result
+
+
+def add_derived_array(dataset, name: str, context: DerivedContext, internal_mesh: bool = False) -> bool:
+    """
+    Add a derived field to the point and cell data of a dataset that holds its inputs.
+
+    Arrays already present are kept, so a dataset that stays cached also keeps its
+    derived arrays. Set ``internal_mesh`` for the complete internal mesh, whose cells
+    are in OpenFOAM order and can be mapped to cellZones.
+
+    Returns:
+        True if the dataset has the array afterwards
+    """
+    derived = DERIVED_FIELDS[name]
+    added = False
+    for association, data in (("point", dataset.point_data), ("cell", dataset.cell_data)):
+        if name in data:
+            added = True
+            continue
+        if not all(required in data for required in derived.requires):
+            continue
+        context.n_cells = dataset.n_cells if association == "cell" and internal_mesh else None
+        try:
+            values = derived.compute({key: data[key] for key in derived.requires}, context)
+        finally:
+            context.n_cells = None
+        if values is not None:
+            data[name] = values
+            added = True
+    return added
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from foam_io import component_names, list_field_files, read_internal_field, read_mesh_counts
+from postprocessing.export import ExportJob
+
+ENVELOPE_DIR_NAME = ".pmf_envelopes"
+ENVELOPE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Stored arrays of every envelope, each of shape (n_cells, n_quantities)
+STATISTICS = ("min", "max", "time_of_min", "time_of_max")
+
+# Array names the envelopes are shown under, e.g. "max(p_rgh)" or "timeOfMin(D_z)"
+ARRAY_PREFIXES = {"min": "min", "max": "max", "time_of_min": "timeOfMin", "time_of_max": "timeOfMax"}
+
+
+def envelope_dir(case_dir: Path | str) -> Path:
+    return Path(case_dir) / ENVELOPE_DIR_NAME
+
+
+def _key(region: str, field: str) -> str:
+    return f"{region or '_'}/{field}"
+
+
+def _signature(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(case_dir: Path | str) -> dict[str, Any]:
+    path = envelope_dir(case_dir) / MANIFEST_NAME
+    if path.exists():
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            manifest = {}
+        if manifest.get("version") == ENVELOPE_VERSION:
+            return manifest
+    return {"version": ENVELOPE_VERSION, "envelopes": {}}
+
+
+def _write_manifest(case_dir: Path | str, manifest: dict[str, Any]) -> None:
+    path = envelope_dir(case_dir) / MANIFEST_NAME
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def quantity_names(field: str, n_components: int) -> list[str]:
+    """Reduced quantities of a field: the field itself, or every component and the magnitude."""
+    if n_components == 1:
+        return [field]
+    return [f"{field}_{component}" for component in component_names(n_components)] + [f"mag({field})"]
+
+
+def _quantities(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    if values.shape[1] == 1:
+        return values
+    return np.column_stack([values, np.sqrt(np.einsum("ij,ij->i", values, values))])
+
+
+def _poly_mesh_dir(case_dir: Path, region: str) -> Path:
+    return case_dir / "constant" / region / "polyMesh" if region else case_dir / "constant" / "polyMesh"
+
+
+def _reduce_field(case_dir: Path, region: str, field: str, times: list[str], paths: list[Path],
+                  previous: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Stream the time steps of one field and update its envelope in bounded memory.
+
+    Only the running envelope and one time step are held at once. Times already
+    reduced in ``previous`` are skipped, so new time steps are folded into the
+    stored envelope. Time steps that cannot be read, such as files a running
+    solver is still writing, are left out and folded in on a later run.
+    """
+    target = envelope_dir(case_dir) / (region or "_") / field
+    state: dict[str, np.ndarray] | None = None
+    done: dict[str, list[int]] = {}
+    if previous is not None:
+        try:
+            state = {name: np.load(target / f"{name}.npy") for name in STATISTICS}
+            done = dict(previous["times"])
+        except (OSError, ValueError, KeyError):
+            state, done = None, {}
+
+    n_cells = read_mesh_counts(_poly_mesh_dir(case_dir, region)).get("nCells")
+    n_components = previous["components"] if previous and state is not None else None
+    for time, path in zip(times, paths):
+        if time in done:
+            continue
+        try:
+            values = read_internal_field(path)
+        except Exception:
+            # Exceptions of foamlib are not all ValueErrors
+            continue
+        if n_cells and len(values) not in (1, n_cells):
+            continue
+        if n_components is None:
+            n_components = values.shape[1]
+        if len(values) == 1 and n_cells and n_cells > 1:
+            # Uniform field
+            values = np.broadcast_to(values, (n_cells, values.shape[1]))
+        current = _quantities(values)
+        time_value = float(time)
+        if state is None:
+            state = {
+                "min": current.copy(), "max": current.copy(),
+                "time_of_min": np.full(current.shape, time_value), "time_of_max": np.full(current.shape, time_value),
+            }
+        elif current.shape != state["min"].shape:
+            raise ValueError(f"{path} has {current.shape[0]} values, earlier time steps have {state['min'].shape[0]}")
+        else:
+            lower = current < state["min"]
+            np.copyto(state["min"], current, where=lower)
+            state["time_of_min"][lower] = time_value
+            higher = current > state["max"]
+            np.copyto(state["max"], current, where=higher)
+            state["time_of_max"][higher] = time_value
+        done[time] = _signature(path)
+
+    target.mkdir(parents=True, exist_ok=True)
+    if state is not None:
+        for name, values in state.items():
+            tmp_path = target / f"{name}.tmp.npy"
+            np.save(tmp_path, values)
+            tmp_path.replace(target / f"{name}.npy")
+    return {"times": done, "components": n_components or 1,
+            "quantities": quantity_names(field, n_components or 1), "region": region, "field": field}
+
+
+def compute_envelopes(case_dir: Path | str, fields: list[str] | None = None, max_workers: int | None = None,
+                      progress: Callable[[int, int], None] | None = None) -> dict[str, Any]:
+    """
+    Compute per-cell envelopes over all time steps into ``.pmf_envelopes``.
+
+    For every region and field, the minimum and maximum of each component (and
+    the magnitude of vectors and tensors) are kept with the time at which they
+    were reached. Time directories are streamed one at a time through the
+    memory-mapped field reader, and fields are reduced in parallel processes.
+
+    Envelopes are updated incrementally: when time steps were only added, the
+    stored envelope is extended; when a reduced time step changed or was
+    removed, the envelope of that field is recomputed.
+
+    Parameters:
+        case_dir: Path to the OpenFOAM case directory
+        fields: Field names to reduce (default is all volume fields)
+        max_workers: Number of worker processes
+        progress: Called with (done, total) after every reduced field
+
+    Returns:
+        The updated manifest
+    """
+    case_dir = Path(case_dir)
+    envelope_dir(case_dir).mkdir(exist_ok=True)
+    manifest = load_manifest(case_dir)
+
+    grouped: dict[str, tuple[str, str, list[str], list[Path]]] = {}
+    for field_file in list_field_files(case_dir):
+        if fields is not None and field_file.field not in fields:
+            continue
+        key = _key(field_file.region, field_file.field)
+        entry = grouped.setdefault(key, (field_file.region, field_file.field, [], []))
+        entry[2].append(field_file.time)
+        entry[3].append(field_file.path)
+
+    tasks = []
+    for key, (region, field, times, paths) in grouped.items():
+        previous = manifest["envelopes"].get(key)
+        if previous is not None:
+            current = {time: _signature(path) for time, path in zip(times, paths)}
+            if any(current.get(time) != signature for time, signature in previous["times"].items()):
+                # A reduced time step changed or disappeared
+                previous = None
+            elif set(current) == set(previous["times"]):
+                continue
+        tasks.append((key, region, field, times, paths, previous))
+
+    total = len(tasks)
+    if tasks:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_reduce_field, *zip(*[
+                (case_dir, region, field, times, paths, previous)
+                for _, region, field, times, paths, previous in tasks
+            ]))
+            for done, ((key, *_), entry) in enumerate(zip(tasks, results), start=1):
+                manifest["envelopes"][key] = entry
+                _write_manifest(case_dir, manifest)
+                if progress:
+                    progress(done, total)
+
+    _write_manifest(case_dir, manifest)
+    return manifest
+
+
+class EnvelopeJob(ExportJob):
+    """Runs ``compute_envelopes`` in a background thread and reports its progress."""
+
+    def _run(self) -> None:
+        try:
+            self.manifest = compute_envelopes(self.case_dir, self.fields, self.max_workers, self._progress)
+        except Exception as exc:
+            self.error = str(exc)
+
+
+class EnvelopeStore:
+    """Read access to computed envelopes; the arrays are memory-mapped."""
+
+    def __init__(self, case_dir: Path | str):
+        self.case_dir = Path(case_dir)
+        self.path = envelope_dir(case_dir)
+        self.manifest = load_manifest(case_dir)
+
+    def entries(self, region: str | None = None) -> list[dict[str, Any]]:
+        return [entry for entry in self.manifest["envelopes"].values() if region is None or entry["region"] == region]
+
+    def array_names(self, region: str) -> list[str]:
+        return [
+            f"{prefix}({quantity})"
+            for entry in self.entries(region) for quantity in entry["quantities"]
+            for prefix in ARRAY_PREFIXES.values()
+        ]
+
+    def read(self, region: str, field: str) -> dict[str, np.ndarray] | None:
+        """The envelope arrays of a field by statistic, or None if it was not computed."""
+        if _key(region, field) not in self.manifest["envelopes"]:
+            return None
+        target = self.path / (region or "_") / field
+        try:
+            return {name: np.load(target / f"{name}.npy", mmap_mode="r") for name in STATISTICS}
+        except (OSError, ValueError):
+            return None
+
+    def read_array(self, region: str, name: str) -> np.ndarray | None:
+        """One envelope array by its display name, e.g. "max(p_rgh)" or "timeOfMin(D_z)"."""
+        for entry in self.entries(region):
+            for statistic, prefix in ARRAY_PREFIXES.items():
+                for index, quantity in enumerate(entry["quantities"]):
+                    if name == f"{prefix}({quantity})":
+                        arrays = self.read(region, entry["field"])
+                        return None if arrays is None else np.asarray(arrays[statistic][:, index])
+        return None
+
+    def summary(self, region: str | None = None) -> list[dict[str, Any]]:
+        """Extreme values of every quantity over all cells and the time they were reached."""
+        rows = []
+        for entry in self.entries(region):
+            arrays = self.read(entry["region"], entry["field"])
+            if arrays is None:
+                continue
+            for index, quantity in enumerate(entry["quantities"]):
+                low, high = arrays["min"][:, index], arrays["max"][:, index]
+                low_cell, high_cell = int(np.argmin(low)), int(np.argmax(high))
+                rows.append({
+                    "region": entry["region"], "quantity": quantity,
+                    "min": float(low[low_cell]), "time of min": float(arrays["time_of_min"][low_cell, index]),
+                    "max": float(high[high_cell]), "time of max": float(arrays["time_of_max"][high_cell, index]),
+                })
+        return rows
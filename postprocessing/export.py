@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import json
+from pathlib import Path
+import threading
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from foam_io import FieldFile, component_names, list_field_files, read_cell_zones, read_internal_field, read_mesh_counts
+from postprocessing.probes import ProbeSeriesReader
+from postprocessing.sets import read_xy_files
+
+EXPORT_DIR_NAME = ".pmf_export"
+EXPORT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+FIELDS_FILE_NAME = "fields.h5"
+ZONE_MEANS_FILE_NAME = "zone_means.parquet"
+
+# Cells per HDF5 chunk; one chunk never spans more than one time step
+CHUNK_CELLS = 65536
+
+# Field files written between two manifest checkpoints
+CHECKPOINT_INTERVAL = 32
+
+
+def export_dir(case_dir: Path | str) -> Path:
+    return Path(case_dir) / EXPORT_DIR_NAME
+
+
+def _require_h5py():
+    try:
+        import h5py
+    except ImportError as exc:
+        raise ImportError("Exporting per-cell fields requires h5py (pip install h5py)") from exc
+    return h5py
+
+
+def _group_name(region: str, field: str) -> str:
+    """HDF5 group of a field; fields outside any region live under '_'."""
+    return f"{region or '_'}/{field}"
+
+
+def _signature(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(case_dir: Path | str) -> dict[str, Any]:
+    path = export_dir(case_dir) / MANIFEST_NAME
+    if path.exists():
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            manifest = {}
+        if manifest.get("version") == EXPORT_VERSION:
+            return manifest
+    return {"version": EXPORT_VERSION, "fields": {}, "probes": {}, "lines": {}}
+
+
+def _write_manifest(case_dir: Path | str, manifest: dict[str, Any]) -> None:
+    path = export_dir(case_dir) / MANIFEST_NAME
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _poly_mesh_dir(case_dir: Path, region: str) -> Path:
+    return case_dir / "constant" / region / "polyMesh" if region else case_dir / "constant" / "polyMesh"
+
+
+# Cell zones of every region, set once per worker process
+_WORKER_ZONES: dict[str, dict[str, np.ndarray]] = {}
+
+
+def _init_worker(zones: dict[str, dict[str, np.ndarray]]) -> None:
+    global _WORKER_ZONES
+    _WORKER_ZONES = zones
+
+
+def _read_export_item(path: Path, region: str) -> tuple[np.ndarray, dict[str, list[float]]]:
+    """Read one field file in a worker and reduce it to its cellZone means."""
+    values = np.asarray(read_internal_field(path))
+    means = {}
+    for zone, labels in _WORKER_ZONES.get(region, {}).items():
+        if len(labels):
+            zone_values = values if len(values) == 1 else values[labels]
+            means[zone] = zone_values.mean(axis=0).tolist()
+    return values, means
+
+
+class _FieldWriter:
+    """
+    Appends per-time cell arrays to chunked, compressed HDF5 datasets.
+
+    Datasets written for a mesh of another size are dropped and recreated; their
+    group names are collected in ``recreated``, so the caller can forget the
+    times exported into them.
+    """
+
+    def __init__(self, path: Path, n_cells: dict[str, int]):
+        h5py = _require_h5py()
+        self.file = h5py.File(path, "a")
+        self.n_cells = n_cells
+        self.recreated: set[str] = set()
+        self._checked: set[str] = set()
+        self._string = h5py.string_dtype()
+
+    def write(self, field_file: FieldFile, values: np.ndarray) -> bool:
+        """
+        Write the values of one field file.
+
+        Returns:
+            False if a uniform field cannot be placed yet, because the mesh size is unknown
+
+        Raises:
+            ValueError: If the number of values matches neither the mesh nor earlier time steps
+        """
+        name = _group_name(field_file.region, field_file.field)
+        n_components = values.shape[1]
+        if name in self.file and name not in self._checked:
+            mesh_cells = self.n_cells.get(field_file.region)
+            if mesh_cells and self.file[name]["values"].shape[1] != mesh_cells:
+                # Exported before the mesh changed
+                del self.file[name]
+                self.recreated.add(name)
+        self._checked.add(name)
+        if name in self.file:
+            group = self.file[name]
+            n_rows = group["values"].shape[1]
+        else:
+            n_rows = self.n_cells.get(field_file.region) or len(values)
+            if len(values) == 1 and n_rows == 1 and field_file.region not in self.n_cells:
+                # A uniform field of a mesh with unknown size cannot be placed yet
+                return False
+            group = self.file.create_group(name)
+            group.create_dataset(
+                "values", shape=(0, n_rows, n_components), maxshape=(None, n_rows, n_components),
+                dtype=values.dtype if values.dtype.kind == "f" else float,
+                chunks=(1, min(n_rows, CHUNK_CELLS), n_components),
+                compression="gzip", compression_opts=4, shuffle=True,
+            )
+            group.create_dataset("times", shape=(0,), maxshape=(None,), dtype=self._string)
+            group.attrs["components"] = list(component_names(n_components))
+
+        if len(values) == 1 and n_rows > 1:
+            values = np.broadcast_to(values, (n_rows, n_components))
+        if values.shape != group["values"].shape[1:]:
+            raise ValueError(f"{field_file.path} has {values.shape[0]} values with {n_components} components, "
+                             f"the export of {name} has {n_rows} cells with {group['values'].shape[2]}")
+
+        times = [time.decode() if isinstance(time, bytes) else time for time in group["times"][:]]
+        if field_file.time in times:
+            row = times.index(field_file.time)
+        else:
+            row = len(times)
+            group["values"].resize(row + 1, axis=0)
+            group["times"].resize(row + 1, axis=0)
+            group["times"][row] = field_file.time
+        group["values"][row] = values
+        return True
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _export_zone_means(path: Path, rows: list[dict[str, Any]], replaced: set[tuple[str, str, str]]) -> None:
+    """Merge new zone mean rows into the Parquet table, replacing re-exported (region, field, time) rows."""
+    new = pd.DataFrame(rows, columns=["time", "region", "field", "zone", "component", "mean"])
+    if path.exists():
+        old = pd.read_parquet(path)
+        keys = list(zip(old["region"], old["field"], old["time"]))
+        old = old[[key not in replaced for key in keys]]
+        new = pd.concat([old, new], ignore_index=True)
+    new.to_parquet(path, index=False, compression="zstd")
+
+
+def _sample_dirs(case_dir: Path) -> tuple[list[Path], list[Path]]:
+    """Probe and line sample directories below postProcessing."""
+    post_processing = case_dir / "postProcessing"
+    probes, lines = [], []
+    if post_processing.is_dir():
+        for child in sorted(post_processing.iterdir()):
+            if not child.is_dir():
+                continue
+            if any(child.glob("*/*.xy")):
+                lines.append(child)
+            elif any(child.glob("*.dat")) or any(child.glob("*/*.dat")):
+                probes.append(child)
+    return probes, lines
+
+
+def export_case(case_dir: Path | str, fields: list[str] | None = None, max_workers: int | None = None,
+                progress: Callable[[int, int], None] | None = None) -> dict[str, Any]:
+    """
+    Export results of all time steps into columnar files below ``.pmf_export``.
+
+    Per-cell field values go to ``fields.h5``, one chunked and compressed
+    (time × cell × component) dataset per region and field. CellZone means of
+    those fields go to ``zone_means.parquet``, probes to ``probes/<name>.parquet``
+    and line samples to ``lines/<name>.parquet``.
+
+    Field files are parsed in a process pool. The manifest records the size and
+    mtime of every exported file and is checkpointed while the export runs, so an
+    interrupted export resumes where it left off and unchanged files are skipped.
+
+    Parameters:
+        case_dir: Path to the OpenFOAM case directory
+        fields: Field names to export (default is all volume fields)
+        max_workers: Number of worker processes
+        progress: Called with (done, total) after every exported item
+
+    Returns:
+        The updated manifest
+    """
+    case_dir = Path(case_dir)
+    target = export_dir(case_dir)
+    target.mkdir(exist_ok=True)
+    manifest = load_manifest(case_dir)
+
+    pending = []
+    for field_file in list_field_files(case_dir):
+        if fields is not None and field_file.field not in fields:
+            continue
+        key = _group_name(field_file.region, field_file.field)
+        if manifest["fields"].get(key, {}).get(field_file.time) != _signature(field_file.path):
+            pending.append(field_file)
+
+    probe_dirs, line_dirs = _sample_dirs(case_dir)
+    total = len(pending) + len(probe_dirs) + len(line_dirs)
+    done = 0
+
+    if pending:
+        regions = sorted({field_file.region for field_file in pending})
+        zones, n_cells = {}, {}
+        for region in regions:
+            poly_mesh = _poly_mesh_dir(case_dir, region)
+            if (poly_mesh / "cellZones").exists():
+                zones[region] = read_cell_zones(poly_mesh / "cellZones")
+            counts = read_mesh_counts(poly_mesh)
+            if "nCells" in counts:
+                n_cells[region] = counts["nCells"]
+
+        writer = _FieldWriter(target / FIELDS_FILE_NAME, n_cells)
+        zone_rows: list[dict[str, Any]] = []
+        replaced: set[tuple[str, str, str]] = set()
+        written: list[FieldFile] = []
+
+        def checkpoint() -> None:
+            writer.flush()
+            if zone_rows or replaced:
+                _export_zone_means(target / ZONE_MEANS_FILE_NAME, zone_rows, replaced)
+                zone_rows.clear()
+                replaced.clear()
+            for name in writer.recreated:
+                manifest["fields"].pop(name, None)
+            writer.recreated.clear()
+            for field_file in written:
+                manifest["fields"].setdefault(_group_name(field_file.region, field_file.field), {})[
+                    field_file.time] = _signature(field_file.path)
+            written.clear()
+            _write_manifest(case_dir, manifest)
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(zones,)) as executor:
+                # Results arrive in time order, so rows of a dataset are sorted by time
+                results = executor.map(_read_export_item, [field_file.path for field_file in pending],
+                                       [field_file.region for field_file in pending])
+                for field_file, (values, means) in zip(pending, results):
+                    if writer.write(field_file, values):
+                        replaced.add((field_file.region, field_file.field, field_file.time))
+                        names = component_names(values.shape[1])
+                        for zone, mean in means.items():
+                            for component, value in zip(names, mean):
+                                zone_rows.append({
+                                    "time": field_file.time, "region": field_file.region, "field": field_file.field,
+                                    "zone": zone, "component": component, "mean": value,
+                                })
+                        written.append(field_file)
+                    done += 1
+                    if len(written) >= CHECKPOINT_INTERVAL:
+                        checkpoint()
+                    if progress:
+                        progress(done, total)
+            checkpoint()
+        finally:
+            writer.close()
+
+    for probe_dir in probe_dirs:
+        reader = ProbeSeriesReader(probe_dir)
+        reader.update()
+        if manifest["probes"].get(probe_dir.name) != len(reader.data):
+            (target / "probes").mkdir(exist_ok=True)
+            pd.DataFrame(reader.data, columns=reader.columns).to_parquet(
+                target / "probes" / f"{probe_dir.name}.parquet", index=False, compression="zstd")
+            manifest["probes"][probe_dir.name] = len(reader.data)
+            _write_manifest(case_dir, manifest)
+        done += 1
+        if progress:
+            progress(done, total)
+
+    for line_dir in line_dirs:
+        time_dirs = sorted((child for child in line_dir.iterdir() if child.is_dir() and any(child.glob("*.xy"))),
+                           key=lambda child: float(child.name))
+        signatures = {
+            child.name: [[path.name, *_signature(path)] for path in sorted(child.glob("*.xy"))]
+            for child in time_dirs
+        }
+        if manifest["lines"].get(line_dir.name) != signatures:
+            frames = [read_xy_files(child).assign(time=float(child.name)) for child in time_dirs]
+            (target / "lines").mkdir(exist_ok=True)
+            pd.concat(frames, ignore_index=True).to_parquet(
+                target / "lines" / f"{line_dir.name}.parquet", index=False, compression="zstd")
+            manifest["lines"][line_dir.name] = signatures
+            _write_manifest(case_dir, manifest)
+        done += 1
+        if progress:
+            progress(done, total)
+
+    _write_manifest(case_dir, manifest)
+    return manifest
+
+
+class ExportJob:
+    """Runs ``export_case`` in a background thread and reports its progress."""
+
+    def __init__(self, case_dir: Path | str, fields: list[str] | None = None, max_workers: int | None = None):
+        self.case_dir = Path(case_dir)
+        self.fields = fields
+        self.max_workers = max_workers
+        self.done = 0
+        self.total = 0
+        self.error: str | None = None
+        self.manifest: dict[str, Any] | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "ExportJob":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _progress(self, done: int, total: int) -> None:
+        self.done, self.total = done, total
+
+    def _run(self) -> None:
+        try:
+            self.manifest = export_case(self.case_dir, self.fields, self.max_workers, self._progress)
+        except Exception as exc:
+            self.error = str(exc)
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class ExportStore:
+    """
+    Read access to an exported case, used as a fast path instead of parsing field files.
+
+    Values are only served for time steps whose source files are unchanged since
+    they were exported.
+    """
+
+    def __init__(self, case_dir: Path | str):
+        self.case_dir = Path(case_dir)
+        self.path = export_dir(case_dir)
+        self.manifest = load_manifest(case_dir)
+
+    @property
+    def available(self) -> bool:
+        if not (self.path / FIELDS_FILE_NAME).exists():
+            return False
+        try:
+            _require_h5py()
+        except ImportError:
+            return False
+        return True
+
+    def is_current(self, region: str, field: str, time: str, path: Path) -> bool:
+        exported = self.manifest["fields"].get(_group_name(region, field), {}).get(time)
+        return exported is not None and path.exists() and exported == _signature(path)
+
+    def read_cells(self, region: str, field: str, cell_ids: np.ndarray, times: list[str],
+                   paths: list[Path]) -> np.ndarray | None:
+        """
+        Values at the given cells as a (time × cell × component) array.
+
+        Returns None unless every requested time step is exported and current.
+        """
+        if not self.available or not all(
+                self.is_current(region, field, time, path) for time, path in zip(times, paths)):
+            return None
+
+        h5py = _require_h5py()
+        cell_ids = np.asarray(cell_ids, dtype=np.int64)
+        unique_ids, inverse = np.unique(cell_ids, return_inverse=True)
+        try:
+            with h5py.File(self.path / FIELDS_FILE_NAME, "r") as handle:
+                group = handle[_group_name(region, field)]
+                stored = [time.decode() if isinstance(time, bytes) else time for time in group["times"][:]]
+                dataset = group["values"]
+                result = np.empty((len(times), len(cell_ids), dataset.shape[2]))
+                for index, time in enumerate(times):
+                    result[index] = dataset[stored.index(time), unique_ids, :][inverse]
+        except (KeyError, ValueError, OSError):
+            return None
+        return result
+
+    def read_zone_means(self) -> pd.DataFrame:
+        path = self.path / ZONE_MEANS_FILE_NAME
+        if not path.exists():
+            return pd.DataFrame(columns=["time", "region", "field", "zone", "component", "mean"])
+        return pd.read_parquet(path)
+
+    def read_probes(self, name: str) -> pd.DataFrame | None:
+        path = self.path / "probes" / f"{name}.parquet"
+        return pd.read_parquet(path) if path.exists() else None
+
+    def read_line(self, name: str) -> pd.DataFrame | None:
+        path = self.path / "lines" / f"{name}.parquet"
+        return pd.read_parquet(path) if path.exists() else None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Bisection steps used to find a voxel size that meets the target count
+VOXEL_SEARCH_STEPS = 24
+
+
+def _voxel_keys(points: np.ndarray, origin: np.ndarray, size: float) -> tuple[np.ndarray, np.ndarray]:
+    """Integer voxel key of every point and the point's offset from its voxel centre."""
+    scaled = (points - origin) / size
+    cells = np.floor(scaled).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    return keys, scaled - cells - 0.5
+
+
+def _count_voxels(points: np.ndarray, origin: np.ndarray, size: float) -> int:
+    keys, _ = _voxel_keys(points, origin, size)
+    return len(np.unique(keys))
+
+
+def _voxel_representatives(points: np.ndarray, origin: np.ndarray, size: float) -> np.ndarray:
+    """Index of the point closest to the centre of each occupied voxel."""
+    keys, offsets = _voxel_keys(points, origin, size)
+    distance = np.einsum("ij,ij->i", offsets, offsets)
+
+    # Sort by voxel, then by distance, and keep the first point of each voxel
+    order = np.lexsort((distance, keys))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = keys[order][1:] != keys[order][:-1]
+    return np.sort(order[first])
+
+
+def uniform_sample_ids(points: np.ndarray, target: int) -> np.ndarray:
+    """
+    Pick up to ``target`` spatially uniform points, one per voxel.
+
+    A voxel grid is laid over the bounding box and the point nearest to each
+    occupied voxel centre is kept. The voxel size is found by bisection so that
+    the number of occupied voxels is as close to the target as possible without
+    exceeding it, independent of how the points are ordered or refined.
+
+    Parameters:
+        points: Array of shape (n_points, 3)
+        target: Maximum number of points to return
+
+    Returns:
+        Sorted array of point indices
+    """
+    points = np.asarray(points, dtype=float)
+    n_points = len(points)
+    if target <= 0 or n_points == 0:
+        return np.empty(0, dtype=np.int64)
+    if n_points <= target:
+        return np.arange(n_points)
+
+    origin = points.min(axis=0)
+    extent = points.max(axis=0) - origin
+    active = extent[extent > 0]
+    if active.size == 0:
+        return np.array([0])
+
+    # Initial guess from the bounding box measure in its active dimensions
+    guess = float(np.prod(active) / target) ** (1.0 / active.size)
+    low, high = 0.0, max(guess, float(active.max()))
+    while _count_voxels(points, origin, high) > target:
+        low, high = high, 2.0 * high
+
+    for _ in range(VOXEL_SEARCH_STEPS):
+        size = 0.5 * (low + high) if low > 0 else min(guess, 0.5 * high)
+        count = _count_voxels(points, origin, size)
+        if count > target:
+            low = size
+        else:
+            high = size
+            if count >= 0.9 * target:
+                break
+    return _voxel_representatives(points, origin, high)
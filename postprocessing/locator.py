@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pyvista as pv
+from vtkmodules.vtkCommonCore import reference, vtkIdList
+from vtkmodules.vtkCommonDataModel import vtkGenericCell, vtkKdTreePointLocator, vtkPolyData
+
+from foam_io import read_header, read_internal_field
+
+# Nearest cell centres checked for containment before a point counts as outside
+CANDIDATE_CELLS = 8
+
+
+def read_internal_mesh(foam_file: Path | str, region: str | None = None) -> pv.UnstructuredGrid:
+    """
+    Read only the internal mesh geometry of a case or region, without any fields.
+
+    Polyhedra are kept intact, so cell ids are OpenFOAM cell labels and index
+    directly into the internalField of a field file.
+    """
+    reader = pv.OpenFOAMReader(str(foam_file))
+    if hasattr(reader.reader, "SetDecomposePolyhedra"):
+        reader.reader.SetDecomposePolyhedra(False)
+    internal = f"/{region}/internalMesh" if region else "internalMesh"
+    if internal not in reader.patch_array_names:
+        raise ValueError(f"No internal mesh found for region '{region}'")
+    reader.disable_all_patch_arrays()
+    reader.enable_patch_array(internal)
+    reader.disable_all_cell_arrays()
+    reader.disable_all_point_arrays()
+    if reader.time_values:
+        reader.set_active_time_value(reader.time_values[0])
+
+    data = reader.read()
+    if region:
+        data = data[region]
+    return data["internalMesh"]
+
+
+class CellLocator:
+    """
+    Finds the cells containing arbitrary points of a mesh.
+
+    A k-d tree over the cell centres is built once; each query point is then
+    tested for containment against its nearest cell centres only.
+    """
+
+    def __init__(self, mesh: pv.UnstructuredGrid, n_candidates: int = CANDIDATE_CELLS):
+        self.mesh = mesh
+        self.n_candidates = min(n_candidates, mesh.n_cells)
+
+        centres = vtkPolyData()
+        centres.SetPoints(mesh.cell_centers().GetPoints())
+        self._tree = vtkKdTreePointLocator()
+        self._tree.SetDataSet(centres)
+        self._tree.BuildLocator()
+        self._centres = centres
+
+    def locate(self, points: np.ndarray) -> np.ndarray:
+        """
+        Cell id containing each point, or -1 for points outside the mesh.
+
+        Parameters:
+            points: Array of shape (n_points, 3)
+
+        Returns:
+            Integer array of shape (n_points,)
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        cell_ids = np.full(len(points), -1, dtype=np.int64)
+
+        candidates = vtkIdList()
+        cell = vtkGenericCell()
+        closest = [0.0, 0.0, 0.0]
+        pcoords = [0.0, 0.0, 0.0]
+        weights = [0.0] * max(self.mesh.GetMaxCellSize(), 1)
+        sub_id = reference(0)
+        dist2 = reference(0.0)
+
+        for index, point in enumerate(points):
+            self._tree.FindClosestNPoints(self.n_candidates, point, candidates)
+            for k in range(candidates.GetNumberOfIds()):
+                cell_id = candidates.GetId(k)
+                self.mesh.GetCell(cell_id, cell)
+                if cell.EvaluatePosition(point, closest, sub_id, pcoords, dist2, weights) == 1:
+                    cell_ids[index] = cell_id
+                    break
+        return cell_ids
+
+
+def read_cell_values(path: Path | str, cell_ids: np.ndarray) -> np.ndarray:
+    """
+    Values of a field file at the given cells, as an array of shape (n_cells, n_components).
+
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    values = read_internal_field(path)
+    if len(values) == 1:
+        # Uniform field: the same value everywhere
+        return np.repeat(values, len(cell_ids), axis=0)
+    return np.asarray(values[cell_ids])
+
+
+def probe_time_series(paths: list[Path | None], cell_ids: np.ndarray,
+                      max_workers: int | None = None) -> list[np.ndarray | None]:
+    """
+    Read the values at the given cells from a series of field files in parallel.
+
+    Missing files (``None``) give ``None`` in the result. ASCII files are
+    parsed in a process pool; binary files are read through memory maps.
+    """
+    existing = [path for path in paths if path is not None]
+    if not existing:
+        return [None] * len(paths)
+
+    # Binary fields are memory-mapped, which is cheaper than starting worker processes
+    if len(existing) == 1 or max_workers == 1 or all(read_header(path).get("format") == "binary" for path in existing):
+        results = iter([read_cell_values(path, cell_ids) for path in existing])
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = iter(list(executor.map(read_cell_values, existing, [cell_ids] * len(existing))))
+    return [None if path is None else next(results) for path in paths]
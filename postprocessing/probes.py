@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Initial number of rows allocated for a probe column buffer
+INITIAL_CAPACITY = 1024
+
+
+def _is_time_name(name: str) -> bool:
+    try:
+        float(name)
+    except ValueError:
+        return False
+    return True
+
+
+class ProbeFileReader:
+    """
+    Append-aware reader for a single OpenFOAM probe file.
+
+    The reader remembers the byte offset of the last complete line it parsed and
+    the header it found. Each update only parses lines appended since the previous
+    call and copies them into a growing NumPy buffer, so polling a live run costs
+    O(new rows) instead of O(total history). Vector and tensor values written as
+    ``(x y z)`` are flattened into separate columns.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.reset()
+
+    def reset(self) -> None:
+        self.offset = 0
+        self.header_lines: list[str] = []
+        self.n_columns: int | None = None
+        self.n_rows = 0
+        self._buffer = np.empty((0, 0), dtype=float)
+        self._file_id: tuple[int, int] | None = None
+
+    @property
+    def data(self) -> np.ndarray:
+        """View of all rows parsed so far, shape (n_rows, n_columns)."""
+        return self._buffer[:self.n_rows]
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names from the last header line that matches the data, or defaults."""
+        if self.n_columns is None:
+            return []
+        for line in reversed(self.header_lines):
+            names = line.split()
+            if len(names) == self.n_columns:
+                return names
+        return ["time"] + [f"field_{i}" for i in range(self.n_columns - 1)]
+
+    def update(self) -> int:
+        """
+        Parse newly appended complete lines.
+
+        Returns:
+            Number of rows added (0 if the file did not grow)
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.reset()
+            return 0
+
+        # A replaced or truncated file has to be read again from the start
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self.offset:
+            self.reset()
+            self._file_id = file_id
+
+        if stat.st_size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offset)
+            chunk = handle.read(stat.st_size - self.offset)
+
+        # Leave a partially written last line for the next update
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return 0
+        chunk = chunk[:end + 1]
+        self.offset += len(chunk)
+
+        rows = self._parse(chunk)
+        if rows.size:
+            self._append(rows)
+        return len(rows)
+
+    def _parse(self, chunk: bytes) -> np.ndarray:
+        data_lines = []
+        for line in chunk.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith(b"#"):
+                if self.n_rows == 0 and not data_lines:
+                    self.header_lines.append(stripped.lstrip(b"# ").decode("utf-8", errors="replace"))
+                continue
+            data_lines.append(stripped)
+
+        if not data_lines:
+            return np.empty((0, self.n_columns or 0))
+
+        text = b" ".join(data_lines).replace(b"(", b" ").replace(b")", b" ")
+        if self.n_columns is None:
+            self.n_columns = len(data_lines[0].replace(b"(", b" ").replace(b")", b" ").split())
+
+        values = np.array(text.split(), dtype=float)
+        if values.size == len(data_lines) * self.n_columns:
+            return values.reshape(-1, self.n_columns)
+
+        # Ragged lines (e.g. a probe set that changed mid-run): keep only matching rows
+        rows = []
+        for line in data_lines:
+            tokens = line.replace(b"(", b" ").replace(b")", b" ").split()
+            if len(tokens) == self.n_columns:
+                rows.append(np.array(tokens, dtype=float))
+        return np.vstack(rows) if rows else np.empty((0, self.n_columns))
+
+    def _append(self, rows: np.ndarray) -> None:
+        required = self.n_rows + len(rows)
+        if self._buffer.shape[1] != self.n_columns or required > len(self._buffer):
+            capacity = max(INITIAL_CAPACITY, required, 2 * len(self._buffer))
+            buffer = np.empty((capacity, self.n_columns), dtype=float)
+            if self.n_rows:
+                buffer[:self.n_rows] = self._buffer[:self.n_rows]
+            self._buffer = buffer
+        self._buffer[self.n_rows:required] = rows
+        self.n_rows = required
+
+
+class ProbeSeriesReader:
+    """
+    Incremental reader for one probe file across restarts.
+
+    OpenFOAM writes probes either directly into ``postProcessing/<name>/`` or into
+    one start-time subfolder per run (``postProcessing/<name>/<startTime>/``). When
+    a run is restarted a new subfolder appears; rows of earlier runs at or after the
+    restart time are superseded by the later run.
+    """
+
+    def __init__(self, sample_dir: Path | str, file_name: str | None = None):
+        self.sample_dir = Path(sample_dir)
+        self.file_name = file_name
+        self.readers: dict[str, ProbeFileReader] = {}
+        self._combined: np.ndarray | None = None
+
+    def _discover(self) -> list[tuple[float, Path]]:
+        if self.file_name is None:
+            candidates = sorted(self.sample_dir.glob("*.dat")) or sorted(self.sample_dir.glob("*/*.dat"))
+            if not candidates:
+                raise FileNotFoundError(f"No .dat files found in {self.sample_dir}")
+            self.file_name = candidates[0].name
+
+        sources: list[tuple[float, Path]] = []
+        direct_file = self.sample_dir / self.file_name
+        if direct_file.is_file():
+            sources.append((float("-inf"), direct_file))
+        for child in self.sample_dir.iterdir():
+            if child.is_dir() and _is_time_name(child.name) and (child / self.file_name).is_file():
+                sources.append((float(child.name), child / self.file_name))
+        sources.sort(key=lambda item: item[0])
+        return sources
+
+    def update(self) -> bool:
+        """
+        Pick up new restart folders and newly appended rows.
+
+        Returns:
+            True if the combined data changed
+        """
+        changed = False
+        for _, path in self._discover():
+            key = str(path)
+            if key not in self.readers:
+                self.readers[key] = ProbeFileReader(path)
+                changed = True
+            if self.readers[key].update():
+                changed = True
+
+        if changed:
+            self._combined = None
+        return changed
+
+    @property
+    def columns(self) -> list[str]:
+        for reader in self.readers.values():
+            if reader.n_columns is not None:
+                return reader.columns
+        return []
+
+    @property
+    def data(self) -> np.ndarray:
+        """All rows in time order, with superseded rows of restarted runs removed."""
+        if self._combined is not None:
+            return self._combined
+
+        blocks = [reader.data for reader in self.readers.values() if reader.n_rows]
+        if not blocks:
+            return np.empty((0, 0))
+        n_columns = blocks[-1].shape[1]
+        blocks = [block for block in blocks if block.shape[1] == n_columns]
+
+        kept = []
+        for index, block in enumerate(blocks):
+            if index + 1 < len(blocks) and len(blocks[index + 1]):
+                block = block[block[:, 0] < blocks[index + 1][0, 0]]
+            kept.append(block)
+
+        self._combined = kept[0] if len(kept) == 1 else np.concatenate(kept)
+        return self._combined
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+
+import pyvista as pv
+
+
+class MultiRegionReader:
+    """
+    Reader for multi-region cases (e.g. coupled ``solid`` and ``poroFluid``).
+
+    Every region gets its own ``pv.OpenFOAMReader`` restricted to that region's
+    patches, so regions are decoded concurrently in worker threads. All regions
+    share one time index resolved from the case, and decoded regions are cached
+    per (region, time) so switching between them does not touch the disk again.
+    """
+
+    def __init__(self, foam_file: Path | str, max_workers: int | None = None):
+        self.foam_file = Path(foam_file)
+        self.max_workers = max_workers
+        self._readers: dict[str, pv.OpenFOAMReader] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._cache: dict[tuple[str, float], pv.MultiBlock] = {}
+        self._cache_lock = threading.Lock()
+
+        index_reader = pv.OpenFOAMReader(str(self.foam_file))
+        self.time_values: list[float] = list(index_reader.time_values)
+        self.regions: list[str] = sorted({
+            name.split("/")[1] for name in index_reader.patch_array_names if name.startswith("/")
+        })
+
+    def resolve_time(self, time: str | float | None = None) -> float:
+        """Map a time name or value to the closest time value shared by all regions."""
+        if not self.time_values:
+            raise ValueError("No time steps found in the OpenFOAM case")
+        if time is None:
+            return self.time_values[-1]
+        try:
+            time_value = float(time)
+        except ValueError:
+            return self.time_values[-1]
+        return min(self.time_values, key=lambda value: abs(value - time_value))
+
+    def _region_reader(self, region: str) -> pv.OpenFOAMReader:
+        if region not in self._readers:
+            reader = pv.OpenFOAMReader(str(self.foam_file))
+            reader.disable_all_patch_arrays()
+            for name in reader.patch_array_names:
+                if name.startswith(f"/{region}/"):
+                    reader.enable_patch_array(name)
+            self._readers[region] = reader
+            self._locks[region] = threading.Lock()
+        return self._readers[region]
+
+    def read_region(self, region: str, time: str | float | None = None) -> pv.MultiBlock:
+        """Read one region at the shared time index, using the cache when possible."""
+        if region not in self.regions:
+            raise ValueError(f"Region '{region}' not found. Available regions: {self.regions}")
+
+        time_value = self.resolve_time(time)
+        key = (region, time_value)
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+            reader = self._region_reader(region)
+            lock = self._locks[region]
+
+        with lock:
+            reader.set_active_time_value(time_value)
+            data = reader.read()[region]
+
+        with self._cache_lock:
+            self._cache[key] = data
+        return data
+
+    def read(self, time: str | float | None = None, regions: list[str] | None = None) -> pv.MultiBlock:
+        """
+        Read several regions in parallel and combine them.
+
+        Returns:
+            MultiBlock with one block per region, keyed by region name
+        """
+        regions = list(regions or self.regions)
+        time_value = self.resolve_time(time)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(regions) or 1) as executor:
+            blocks = list(executor.map(lambda region: self.read_region(region, time_value), regions))
+
+        combined = pv.MultiBlock()
+        for region, block in zip(regions, blocks):
+            combined[region] = block
+        return combined
+
+    def invalidate(self, time: str | float | None = None) -> None:
+        """Drop cached regions, either for one time or entirely."""
+        with self._cache_lock:
+            if time is None:
+                self._cache.clear()
+            else:
+                time_value = self.resolve_time(time)
+                for key in [key for key in self._cache if key[1] == time_value]:
+                    del self._cache[key]
+            # Without a refresh the VTK readers return their last output unchanged
+            for reader in self._readers.values():
+                reader.reader.SetRefresh()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+
+def set_field_names(stems: list[str], set_name: str | None = None) -> dict[str, str]:
+    """
+    The field part of set file names ``<setName>_<field1>_<field2>...``.
+
+    Set and field names may both contain underscores. Without ``set_name``, the
+    set name is the longest underscore-separated prefix shared by all files, or
+    the text up to the first underscore when the files share none.
+
+    Parameters:
+        stems: File names without the suffix
+        set_name: Name of the set, if known
+
+    Returns:
+        The field part of every file name, keyed by the file name
+    """
+    if set_name is None and len(stems) > 1:
+        parts = [stem.split("_") for stem in stems]
+        shared = 0
+        while (all(len(part) > shared + 1 for part in parts)
+               and len({part[shared] for part in parts}) == 1):
+            shared += 1
+        if shared:
+            set_name = "_".join(parts[0][:shared])
+
+    fields = {}
+    for stem in stems:
+        if set_name and stem.startswith(f"{set_name}_"):
+            fields[stem] = stem[len(set_name) + 1:]
+        else:
+            fields[stem] = stem.split("_", 1)[1] if "_" in stem else stem
+    return fields
+
+
+def read_xy_files(time_dir: Path | str, set_name: str | None = None) -> pd.DataFrame:
+    """
+    Read all ``.xy`` set files of one sample time directory into one DataFrame.
+
+    The first file provides the coordinate columns x, y, z; the field columns of
+    every file are named after the part of the file name after the set name
+    (see ``set_field_names``), e.g. ``p_rgh`` for ``line_centre_p_rgh.xy``.
+    """
+    data_files = sorted(Path(time_dir).glob("*.xy"))
+    if not data_files:
+        raise FileNotFoundError(f"No .xy files found in {time_dir}")
+    field_names = set_field_names([data_file.stem for data_file in data_files], set_name)
+
+    base_df = None
+    for data_file in data_files:
+        field_name = field_names[data_file.stem]
+
+        # Read the data
+        df = pd.read_csv(data_file, sep=r'\s+', comment='#', header=None)
+
+        # Determine if this is positional data (assuming first file contains coordinates)
+        if base_df is None:
+            # First file - assume first 3 columns are x, y, z
+            if df.shape[1] >= 3:
+                df.columns = ['x', 'y', 'z'] + [f'{field_name}_{i}' for i in range(df.shape[1]-3)]
+            else:
+                df.columns = [f'pos_{i}' for i in range(df.shape[1]-1)] + [field_name]
+            base_df = df
+        else:
+            # For subsequent files, just add the field columns to the base dataframe
+            if df.shape[1] > 3:  # Has positional data and field data
+                field_cols = df.iloc[:, 3:].values
+                for i in range(field_cols.shape[1]):
+                    col_name = f'{field_name}_{i}' if field_cols.shape[1] > 1 else field_name
+                    base_df[col_name] = field_cols[:, i]
+            else:  # Only field data
+                field_cols = df.iloc[:, -1].values
+                base_df[field_name] = field_cols
+
+    return base_df
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class SpaceTimeLine:
+    """Values of one field along a line for every time step."""
+
+    field: str
+    times: np.ndarray
+    distance: np.ndarray
+    values: np.ndarray
+    components: tuple[str, ...]
+
+    def component(self, name: str | None = None) -> np.ndarray:
+        """(time × distance) array of one component, or of the magnitude by default."""
+        if name is None:
+            if self.values.shape[2] == 1:
+                return self.values[:, :, 0]
+            return np.linalg.norm(self.values, axis=2)
+        return self.values[:, :, self.components.index(name)]
+
+
+def cumulative_distance(points: np.ndarray) -> np.ndarray:
+    """Distance along a polyline from its first point, for points of shape (n, dim)."""
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        return np.empty(0)
+    segments = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    return np.concatenate(([0.0], np.cumsum(segments)))
+
+
+def resample_polyline(vertices: np.ndarray, n_points: int) -> np.ndarray:
+    """Place ``n_points`` equally spaced points along a polyline through ``vertices``."""
+    vertices = np.atleast_2d(np.asarray(vertices, dtype=float))
+    distance = cumulative_distance(vertices)
+    targets = np.linspace(0.0, distance[-1], n_points)
+    return np.column_stack([np.interp(targets, distance, vertices[:, axis]) for axis in range(vertices.shape[1])])
+
+
+def stack_profiles(times: list[float], distances: list[np.ndarray], values: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack per-time line profiles into one (time × distance × component) array.
+
+    Profiles are interpolated onto the distance axis of the first time step when
+    the sampled points differ between time steps. Times are sorted ascending.
+
+    Parameters:
+        times: Time value of every profile
+        distances: Distance along the line of every profile, shape (n_points,)
+        values: Values of every profile, shape (n_points, n_components)
+
+    Returns:
+        (times, distance, values) arrays
+    """
+    order = np.argsort(times)
+    reference = np.asarray(distances[order[0]], dtype=float)
+    n_components = np.asarray(values[order[0]]).reshape(len(reference), -1).shape[1]
+    stacked = np.empty((len(order), len(reference), n_components))
+
+    for row, index in enumerate(order):
+        distance = np.asarray(distances[index], dtype=float)
+        profile = np.asarray(values[index], dtype=float).reshape(len(distance), -1)
+        if len(distance) == len(reference) and np.allclose(distance, reference):
+            stacked[row] = profile
+        else:
+            for component in range(n_components):
+                stacked[row, :, component] = np.interp(reference, distance, profile[:, component],
+                                                       left=np.nan, right=np.nan)
+    return np.asarray(times, dtype=float)[order], reference, stacked
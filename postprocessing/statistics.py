@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from foam_io import component_names, list_field_files, read_internal_field
+from postprocessing.export import ExportJob
+
+STATS_INDEX_NAME = ".pmf_field_stats.json"
+STATS_INDEX_VERSION = 1
+PERCENTILES = (1, 5, 50, 95, 99)
+
+# Seconds between writes of the index while the pool is running
+SAVE_INTERVAL = 2.0
+
+
+def stats_index_path(case_dir: Path | str) -> Path:
+    return Path(case_dir) / STATS_INDEX_NAME
+
+
+def _summarise(values: np.ndarray) -> dict[str, Any]:
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "percentiles": [float(value) for value in percentiles],
+    }
+
+
+def compute_field_stats(path: Path | str) -> dict[str, Any]:
+    """
+    Statistics of one field file: per component, plus the magnitude for vectors and tensors.
+
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    values = read_internal_field(path)
+    stats = {"n": int(values.shape[0]), "components": {}}
+    for index, name in enumerate(component_names(values.shape[1])):
+        stats["components"][name] = _summarise(values[:, index])
+    if values.shape[1] > 1:
+        stats["components"]["magnitude"] = _summarise(np.linalg.norm(values, axis=1))
+    return stats
+
+
+def _field_stats_or_error(path: Path | str) -> tuple[dict[str, Any] | None, str | None]:
+    """
+    Statistics of one field file, or the reason it could not be read.
+
+    Files of a running solver may be only partly written; their errors are
+    returned instead of raised, since exceptions of foamlib do not always
+    survive the way back from the worker process.
+    """
+    try:
+        return compute_field_stats(path), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def _save_index(case_dir: Path | str, index: dict[str, Any]) -> None:
+    path = stats_index_path(case_dir)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _entry_key(time: str, region: str, field: str) -> str:
+    return f"{time}/{region}/{field}"
+
+
+def load_field_statistics(case_dir: Path | str) -> dict[str, Any]:
+    path = stats_index_path(case_dir)
+    if path.exists():
+        try:
+            index = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            index = {}
+        if index.get("version") == STATS_INDEX_VERSION and list(index.get("percentiles", [])) == list(PERCENTILES):
+            return index
+    return {"version": STATS_INDEX_VERSION, "percentiles": list(PERCENTILES), "entries": {}}
+
+
+def update_field_statistics(case_dir: Path | str, max_workers: int | None = None,
+                            progress: Callable[[int, int], None] | None = None) -> dict[str, Any]:
+    """
+    Bring the statistics sidecar of a case up to date.
+
+    Only field files that are new or changed (by size and mtime) since the last
+    update are read; they are processed in a process pool one file per task, so
+    memory stays bounded by the largest single field. Files that cannot be read
+    yet, e.g. while the solver is still writing them, are listed under
+    "pending" with their error and retried on the next update. The index is
+    saved while results arrive, so an interrupted update keeps its progress.
+    Entries of deleted time directories are dropped.
+
+    Parameters:
+        case_dir: Path to the OpenFOAM case directory
+        max_workers: Number of worker processes
+        progress: Called with (done, total) after every read field file
+
+    Returns:
+        The updated index
+    """
+    index = load_field_statistics(case_dir)
+    entries = index["entries"]
+    previous_pending = index.pop("pending", {})
+
+    current = {}
+    pending = []
+    for field_file in list_field_files(case_dir):
+        key = _entry_key(field_file.time, field_file.region, field_file.field)
+        try:
+            stat = field_file.path.stat()
+        except OSError:
+            continue
+        signature = [stat.st_size, stat.st_mtime_ns]
+        current[key] = signature
+        entry = entries.get(key)
+        if entry is None or entry.get("signature") != signature:
+            pending.append((key, field_file.path))
+
+    removed = [key for key in entries if key not in current]
+    for key in removed:
+        del entries[key]
+
+    unreadable = {}
+    if pending:
+        last_save = time.monotonic()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_field_stats_or_error, path): key for key, path in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                stats, error = future.result()
+                if progress:
+                    progress(done, len(futures))
+                if stats is None:
+                    unreadable[key] = error
+                    continue
+                stats["signature"] = current[key]
+                entries[key] = stats
+                if time.monotonic() - last_save > SAVE_INTERVAL:
+                    _save_index(case_dir, index)
+                    last_save = time.monotonic()
+
+    if unreadable:
+        index["pending"] = unreadable
+    if pending or removed or previous_pending:
+        _save_index(case_dir, index)
+    return index
+
+
+def summarise_fields(index: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Aggregate per-time entries into one row per region, field and component.
+
+    The mean is weighted by the number of values per time. The percentile range
+    is the envelope of the per-time 1st and 99th percentiles.
+    """
+    groups: dict[tuple[str, str, str], list[tuple[str, dict[str, Any], int]]] = {}
+    for key, entry in index.get("entries", {}).items():
+        time, region, field = key.split("/", 2)
+        for component, stats in entry["components"].items():
+            groups.setdefault((region, field, component), []).append((time, stats, entry["n"]))
+
+    rows = []
+    for (region, field, component), items in sorted(groups.items()):
+        counts = np.array([n for _, _, n in items], dtype=float)
+        means = np.array([stats["mean"] for _, stats, _ in items])
+        rows.append({
+            "region": region,
+            "field": field,
+            "component": component,
+            "times": len(items),
+            "min": min(stats["min"] for _, stats, _ in items),
+            "max": max(stats["max"] for _, stats, _ in items),
+            "mean": float(np.average(means, weights=counts)),
+            "p1": min(stats["percentiles"][0] for _, stats, _ in items),
+            "p99": max(stats["percentiles"][-1] for _, stats, _ in items),
+        })
+    return rows
+
+
+def field_range(index: dict[str, Any], field: str, region: str = "",
+                component: str | None = None) -> tuple[float, float] | None:
+    """
+    Global (min, max) of a field over all time steps, for stable colour ranges.
+
+    Vectors and tensors default to their magnitude, which is what PyVista colours by.
+    """
+    low, high = None, None
+    for key, entry in index.get("entries", {}).items():
+        _, entry_region, entry_field = key.split("/", 2)
+        if entry_field != field or entry_region != region:
+            continue
+        components = entry["components"]
+        name = component or ("magnitude" if "magnitude" in components else "value")
+        if name not in components:
+            continue
+        low = components[name]["min"] if low is None else min(low, components[name]["min"])
+        high = components[name]["max"] if high is None else max(high, components[name]["max"])
+
+    if low is None:
+        return None
+    return low, high
+
+
+class StatisticsJob(ExportJob):
+    """Runs ``update_field_statistics`` in a background thread and reports its progress."""
+
+    def _run(self) -> None:
+        try:
+            self.manifest = update_field_statistics(self.case_dir, self.max_workers, self._progress)
+        except Exception as exc:
+            self.error = str(exc)
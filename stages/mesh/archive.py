@@ -0,0 +1,275 @@
+"""
+Streaming import of polyMesh archives (zip, tar, tar.gz and tar.zst).
+
+Members are decompressed chunk by chunk straight to disk, so memory stays
+bounded for archives of several GB. Member paths are checked before anything
+is written, the extracted size and member count are limited, and the mesh
+only replaces the existing polyMesh once all required files are present.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import gzip
+from pathlib import Path, PurePosixPath
+import re
+import shutil
+import stat
+import tarfile
+import tempfile
+from typing import BinaryIO, Callable
+import zipfile
+import zlib
+
+from foam_io import HEADER_BYTES, parse_header, read_label_list, read_points
+
+REQUIRED_FILES = ("points", "faces", "owner", "neighbour", "boundary")
+
+# Archive formats by file name suffix, longest suffixes first
+ARCHIVE_FORMATS = {
+    ".tar.gz": "tar.gz", ".tgz": "tar.gz",
+    ".tar.zst": "tar.zst", ".tar.zstd": "tar.zst", ".tzst": "tar.zst",
+    ".tar": "tar", ".zip": "zip",
+}
+
+# Extensions accepted by the upload widget, which only compares the last suffix
+UPLOAD_TYPES = ["zip", "tar", "gz", "tgz", "zst", "zstd", "tzst"]
+
+CHUNK_SIZE = 1024 * 1024
+
+# Limits of the extracted mesh, against corrupt archives and decompression bombs
+MAX_EXTRACTED_BYTES = 64 * 1024 ** 3
+MAX_MEMBERS = 10000
+
+
+@dataclass
+class MeshArchiveImport:
+    poly_mesh_dir: Path
+    files: list[str] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+    extracted_bytes: int = 0
+
+
+def archive_format(file_name: str) -> str:
+    name = file_name.lower()
+    for suffix, kind in ARCHIVE_FORMATS.items():
+        if name.endswith(suffix):
+            return kind
+    raise ValueError(f"Unsupported mesh archive: {file_name}. Use .zip, .tar, .tar.gz or .tar.zst")
+
+
+def _source_size(source: BinaryIO) -> int | None:
+    try:
+        position = source.tell()
+        size = source.seek(0, 2)
+        source.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+class _Extraction:
+    """Extraction state: target paths, limits, progress and the header of the owner file."""
+
+    def __init__(self, target: Path, source: BinaryIO, progress: Callable[[int, int | None], None] | None,
+                 max_bytes: int, max_members: int):
+        self.target = target
+        self.source = source
+        self.total = _source_size(source)
+        self.progress = progress
+        self.max_bytes = max_bytes
+        self.max_members = max_members
+        self.files: list[str] = []
+        self.extracted_bytes = 0
+        self.owner_header = b""
+        self.mesh_prefix: tuple[str, ...] | None = None
+        # Members extracted before a polyMesh directory showed up in the archive
+        self.loose: list[PurePosixPath] = []
+
+    def relative_path(self, name: str) -> PurePosixPath | None:
+        """
+        Path of a member relative to the polyMesh directory, or None to skip it.
+
+        Members below a polyMesh directory are taken relative to it; other
+        members are taken as they are, so archives of the polyMesh content work
+        too. Absolute paths and ".." are rejected.
+        """
+        path = PurePosixPath(name.replace("\\", "/"))
+        if path.is_absolute() or ".." in path.parts or re.match(r"^[A-Za-z]:", name):
+            raise ValueError(f"Unsafe path in mesh archive: {name}")
+        parts = tuple(part for part in path.parts if part not in ("", "."))
+        if not parts or parts[0] == "__MACOSX" or parts[-1].startswith("._"):
+            return None
+        if "polyMesh" in parts:
+            index = len(parts) - 1 - parts[::-1].index("polyMesh")
+            prefix = parts[:index]
+            if self.mesh_prefix is None:
+                self.mesh_prefix = prefix
+            elif prefix != self.mesh_prefix:
+                raise ValueError("The mesh archive contains more than one polyMesh directory")
+            parts = parts[index + 1:]
+        elif self.mesh_prefix is not None:
+            # Outside the polyMesh directory of the archive
+            return None
+        return PurePosixPath(*parts) if parts else None
+
+    def add_member(self, name: str, size: int | None, stream: BinaryIO) -> None:
+        relative = self.relative_path(name)
+        if relative is None:
+            return
+        if self.mesh_prefix is None:
+            self.loose.append(relative)
+        if len(self.files) >= self.max_members:
+            raise ValueError(f"The mesh archive has more than {self.max_members} files")
+        if size is not None and self.extracted_bytes + size > self.max_bytes:
+            raise ValueError(f"The mesh archive extracts to more than {self.max_bytes / 1024 ** 3:.0f} GB")
+
+        path = self.target.joinpath(*relative.parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_owner = relative.as_posix() in ("owner", "owner.gz")
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if relative.as_posix() == "owner.gz" else None
+        with open(path, "wb") as handle:
+            while chunk := stream.read(CHUNK_SIZE):
+                self.extracted_bytes += len(chunk)
+                if self.extracted_bytes > self.max_bytes:
+                    raise ValueError(f"The mesh archive extracts to more than {self.max_bytes / 1024 ** 3:.0f} GB")
+                handle.write(chunk)
+                if is_owner and len(self.owner_header) < HEADER_BYTES:
+                    # The mesh counts are in the note of the owner header
+                    if decompressor is not None:
+                        chunk = decompressor.decompress(chunk, HEADER_BYTES - len(self.owner_header))
+                    self.owner_header += chunk[:HEADER_BYTES - len(self.owner_header)]
+                self.report()
+        self.files.append(relative.as_posix())
+
+    def report(self) -> None:
+        if self.progress is None:
+            return
+        try:
+            position = self.source.tell()
+        except (AttributeError, OSError):
+            position = self.extracted_bytes
+        self.progress(position, self.total)
+
+
+def _extract_zip(extraction: _Extraction) -> None:
+    with zipfile.ZipFile(extraction.source) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                extraction.relative_path(info.filename)
+                continue
+            if stat.S_ISLNK(info.external_attr >> 16):
+                raise ValueError(f"Links are not allowed in mesh archives: {info.filename}")
+            with archive.open(info) as stream:
+                extraction.add_member(info.filename, info.file_size, stream)
+
+
+def _extract_tar(extraction: _Extraction, kind: str) -> None:
+    stream: BinaryIO = extraction.source
+    damaged: tuple[type[Exception], ...] = ()
+    if kind == "tar.gz":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    elif kind == "tar.zst":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ValueError("Reading .tar.zst archives needs the zstandard package") from exc
+        stream = zstandard.ZstdDecompressor().stream_reader(stream, read_size=CHUNK_SIZE)
+        damaged = (zstandard.ZstdError,)
+
+    # Stream mode reads every member once, in order, without seeking
+    try:
+        with tarfile.open(fileobj=stream, mode="r|") as archive:
+            for member in archive:
+                if member.isdir():
+                    extraction.relative_path(member.name)
+                    continue
+                if not member.isfile():
+                    raise ValueError(f"Only regular files are allowed in mesh archives: {member.name}")
+                extraction.add_member(member.name, member.size, archive.extractfile(member))
+    except damaged as exc:
+        raise ValueError(f"The mesh archive is damaged: {exc}") from exc
+
+
+def _mesh_counts(poly_mesh_dir: Path, owner_header: bytes) -> dict[str, int]:
+    note = parse_header(owner_header).get("note", "")
+    counts = {key: int(value) for key, value in re.findall(r"(\w+):\s*(\d+)", note)}
+    if {"nPoints", "nCells", "nFaces"} <= counts.keys():
+        return counts
+    # Without the note, count from the lists themselves
+    owner = read_label_list(poly_mesh_dir / "owner")
+    neighbour = read_label_list(poly_mesh_dir / "neighbour")
+    n_cells = int(max(owner.max(initial=-1), neighbour.max(initial=-1))) + 1
+    return {"nPoints": len(read_points(poly_mesh_dir / "points")), "nCells": n_cells,
+            "nFaces": len(owner), "nInternalFaces": len(neighbour)}
+
+
+def replace_directory(staging: Path, target: Path) -> None:
+    """Move a staged directory to ``target``, swapping out an existing one by renames only."""
+    if target.exists():
+        previous = target.with_name(f"{staging.name}_previous")
+        target.rename(previous)
+        staging.rename(target)
+        shutil.rmtree(previous, ignore_errors=True)
+    else:
+        staging.rename(target)
+
+
+def import_mesh_archive(source: BinaryIO | Path | str, poly_mesh_dir: Path | str, file_name: str | None = None,
+                        progress: Callable[[int, int | None], None] | None = None,
+                        max_bytes: int = MAX_EXTRACTED_BYTES, max_members: int = MAX_MEMBERS) -> MeshArchiveImport:
+    """
+    Extract a polyMesh archive into ``poly_mesh_dir``, replacing the mesh there.
+
+    The archive is extracted next to the target first. Only when it holds all
+    of points, faces, owner, neighbour and boundary (plain or gzipped) does it
+    replace the existing polyMesh directory.
+
+    Parameters:
+        source: Path of the archive or a binary file object
+        poly_mesh_dir: Target polyMesh directory, e.g. <case>/constant/polyMesh
+        file_name: Name of the archive, used for its format when ``source`` is a file object
+        progress: Called with (bytes read, archive size or None) while extracting
+        max_bytes: Limit of the extracted size
+        max_members: Limit of the number of extracted files
+
+    Returns:
+        The extracted files and the mesh counts nPoints, nCells, nFaces and nInternalFaces
+
+    Raises:
+        ValueError: For unsupported, unsafe, oversized or incomplete archives
+    """
+    poly_mesh_dir = Path(poly_mesh_dir)
+    kind = archive_format(file_name or getattr(source, "name", None) or str(source))
+    poly_mesh_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".pmf_mesh_import_", dir=poly_mesh_dir.parent))
+    handle = open(source, "rb") if isinstance(source, (str, Path)) else source
+    try:
+        extraction = _Extraction(staging, handle, progress, max_bytes, max_members)
+        try:
+            if kind == "zip":
+                _extract_zip(extraction)
+            else:
+                _extract_tar(extraction, kind)
+        except (zipfile.BadZipFile, tarfile.TarError, gzip.BadGzipFile, EOFError, zlib.error) as exc:
+            raise ValueError(f"The mesh archive is damaged: {exc}") from exc
+
+        if extraction.mesh_prefix is not None:
+            for relative in extraction.loose:
+                staging.joinpath(*relative.parts).unlink(missing_ok=True)
+                extraction.files.remove(relative.as_posix())
+                for parent in staging.joinpath(*relative.parts).parents:
+                    if parent == staging or any(parent.iterdir()):
+                        break
+                    parent.rmdir()
+        missing = [name for name in REQUIRED_FILES
+                   if not (staging / name).exists() and not (staging / f"{name}.gz").exists()]
+        if missing:
+            raise ValueError(f"The mesh archive has no {', '.join(missing)} file" + ("s" if len(missing) > 1 else ""))
+        counts = _mesh_counts(staging, extraction.owner_header)
+
+        replace_directory(staging, poly_mesh_dir)
+        return MeshArchiveImport(poly_mesh_dir, sorted(extraction.files), counts, extraction.extracted_bytes)
+    finally:
+        if handle is not source:
+            handle.close()
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,268 @@
+"""
+Cache of built meshes, keyed on the hash of the mesh inputs.
+
+The key covers the normalised input dictionaries (comments, the FoamFile
+header and layout do not count), the geometry files they reference and the
+version of the meshing tool. The files of a built constant/polyMesh are kept
+in a content-addressed store, so identical files are stored once, and a mesh
+with the same key is restored by copy or hardlink instead of running the tool.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+import tempfile
+import time
+from typing import Callable
+
+from alpha_runtime import resolve_executable
+from stages.mesh.archive import CHUNK_SIZE, replace_directory
+
+MESH_CACHE_DIR_NAME = ".pmf_mesh_cache"
+MESH_CACHE_VERSION = 1
+
+# Overrides the cache location, e.g. to share one store between cases
+MESH_CACHE_ENV = "PMF_MESH_CACHE"
+
+# Input dictionaries of every meshing tool, relative to the case
+MESH_INPUTS = {
+    "blockMesh": ("system/blockMeshDict",),
+    "cartesian2DMesh": ("system/meshDict", "system/edgeDict"),
+}
+
+# Environment variables that identify the OpenFOAM installation
+VERSION_VARIABLES = ("WM_PROJECT", "WM_PROJECT_VERSION", "FOAM_API")
+
+_TOKENS = re.compile(r'"(?:\\.|[^"\\])*"|//[^\n]*|/\*.*?\*/|[;(){}\[\]]|[^\s;(){}\[\]"/]+|/', re.DOTALL)
+
+
+def mesh_cache_dir(case_dir: Path | str) -> Path:
+    return Path(os.environ.get(MESH_CACHE_ENV) or Path(case_dir) / MESH_CACHE_DIR_NAME)
+
+
+def normalised_dictionary(text: str) -> str:
+    """OpenFOAM dictionary text without comments, the FoamFile header and layout, one token per word."""
+    tokens = [token for token in _TOKENS.findall(text) if not token.startswith(("//", "/*"))]
+    if tokens[:2] == ["FoamFile", "{"]:
+        tokens = tokens[tokens.index("}") + 1:]
+    return " ".join(tokens)
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file, of its normalised text for dictionaries (files without a suffix)."""
+    if not path.suffix:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        return hashlib.sha256(normalised_dictionary(text).encode("utf-8")).hexdigest()
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tool_version(tool: str) -> dict[str, str | None]:
+    """Identity of the meshing executable: its path, size and modification time and the OpenFOAM version."""
+    version: dict[str, str | None] = {name: os.environ.get(name) for name in VERSION_VARIABLES}
+    executable = resolve_executable(tool)
+    if executable is not None:
+        stat = Path(executable).stat()
+        version["executable"] = f"{executable}:{stat.st_size}:{stat.st_mtime_ns}"
+    return version
+
+
+def mesh_input_files(case_dir: Path | str, tool: str) -> list[str]:
+    """The input dictionaries of a tool and the geometry file a meshDict references in surfaceFile."""
+    case_dir = Path(case_dir)
+    files = list(MESH_INPUTS.get(tool, ()))
+    mesh_dict = case_dir / "system" / "meshDict"
+    if "system/meshDict" in files and mesh_dict.exists():
+        tokens = normalised_dictionary(mesh_dict.read_text(encoding="utf-8", errors="replace")).split(" ")
+        if "surfaceFile" in tokens[:-1]:
+            surface = tokens[tokens.index("surfaceFile") + 1].strip('"')
+            files.append(Path(surface).as_posix())
+    return files
+
+
+def mesh_cache_key(case_dir: Path | str, tool: str, inputs: list[str] | None = None) -> str:
+    """
+    Cache key of a mesh build.
+
+    Parameters:
+        case_dir: Path to the OpenFOAM case directory
+        tool: Name of the meshing executable
+        inputs: Input files relative to the case (default from ``mesh_input_files``)
+    """
+    case_dir = Path(case_dir)
+    inputs = mesh_input_files(case_dir, tool) if inputs is None else inputs
+    description = {
+        "version": MESH_CACHE_VERSION,
+        "tool": tool,
+        "tool_version": tool_version(tool),
+        "inputs": {name: file_digest(case_dir / name) if (case_dir / name).is_file() else None for name in inputs},
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class MeshBuild:
+    key: str
+    hit: bool
+    files: list[str] = field(default_factory=list)
+    size: int = 0
+
+
+class MeshCache:
+    """
+    Content-addressed store of polyMesh files with one manifest per cache key.
+
+    Stored files are read-only. Restored meshes are copies unless ``link`` is
+    set; hardlinked files share the stored data, so they must be replaced and
+    not rewritten in place.
+    """
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.builds = self.root / "builds"
+
+    def _object(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _manifest(self, key: str) -> Path:
+        return self.builds / f"{key}.json"
+
+    def lookup(self, key: str) -> dict | None:
+        try:
+            manifest = json.loads(self._manifest(key).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return manifest if manifest.get("version") == MESH_CACHE_VERSION else None
+
+    def _store_file(self, path: Path) -> tuple[str, int]:
+        """Copy a file into the store while hashing it; returns its digest and size."""
+        self.objects.mkdir(parents=True, exist_ok=True)
+        digest, size = hashlib.sha256(), 0
+        handle, tmp_name = tempfile.mkstemp(dir=self.objects, prefix=".tmp_")
+        try:
+            with os.fdopen(handle, "wb") as target, open(path, "rb") as source:
+                while chunk := source.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    target.write(chunk)
+                    size += len(chunk)
+            stored = self._object(digest.hexdigest())
+            if stored.exists():
+                os.unlink(tmp_name)
+            else:
+                stored.parent.mkdir(exist_ok=True)
+                os.chmod(tmp_name, 0o444)
+                os.replace(tmp_name, stored)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return digest.hexdigest(), size
+
+    def store(self, key: str, poly_mesh_dir: Path | str, tool: str = "") -> MeshBuild:
+        """Add the files of a built polyMesh directory under ``key``."""
+        poly_mesh_dir = Path(poly_mesh_dir)
+        files = {
+            path.relative_to(poly_mesh_dir).as_posix(): self._store_file(path)
+            for path in sorted(poly_mesh_dir.rglob("*")) if path.is_file()
+        }
+        self.builds.mkdir(parents=True, exist_ok=True)
+        manifest = {"version": MESH_CACHE_VERSION, "tool": tool, "created": time.time(), "files": files}
+        tmp_path = self._manifest(key).with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest), encoding="utf-8")
+        tmp_path.replace(self._manifest(key))
+        return MeshBuild(key, False, list(files), sum(size for _, size in files.values()))
+
+    def restore(self, key: str, poly_mesh_dir: Path | str, link: bool = False) -> MeshBuild | None:
+        """
+        Replace ``poly_mesh_dir`` with the mesh stored under ``key``.
+
+        Returns None, and leaves the directory as it is, when there is no
+        complete entry for the key.
+        """
+        manifest = self.lookup(key)
+        if manifest is None:
+            return None
+        poly_mesh_dir = Path(poly_mesh_dir)
+        poly_mesh_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".pmf_mesh_restore_", dir=poly_mesh_dir.parent))
+        try:
+            for name, (digest, size) in manifest["files"].items():
+                stored, target = self._object(digest), staging / name
+                if not stored.is_file() or stored.stat().st_size != size:
+                    # Damaged entry; it is rebuilt on the next miss
+                    self._manifest(key).unlink(missing_ok=True)
+                    return None
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    if not link:
+                        raise OSError
+                    os.link(stored, target)
+                except OSError:
+                    shutil.copyfile(stored, target)
+            replace_directory(staging, poly_mesh_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return MeshBuild(key, True, list(manifest["files"]), sum(size for _, size in manifest["files"].values()))
+
+    def usage(self) -> tuple[int, int]:
+        """Number of cached meshes and bytes in the store."""
+        builds = len(list(self.builds.glob("*.json"))) if self.builds.exists() else 0
+        size = sum(path.stat().st_size for path in self.objects.rglob("*") if path.is_file()) if self.objects.exists() else 0
+        return builds, size
+
+    def clear(self) -> None:
+        for path in (self.builds, self.objects):
+            if path.exists():
+                for stored in path.rglob("*"):
+                    if stored.is_file():
+                        stored.chmod(0o644)
+                shutil.rmtree(path)
+
+
+def unshare_files(poly_mesh_dir: Path | str) -> None:
+    """Replace hardlinked files by writable copies, so tools that rewrite them in place leave the store intact."""
+    poly_mesh_dir = Path(poly_mesh_dir)
+    if not poly_mesh_dir.is_dir():
+        return
+    for path in poly_mesh_dir.rglob("*"):
+        if path.is_file() and path.stat().st_nlink > 1:
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            shutil.copyfile(path, tmp_path)
+            tmp_path.replace(path)
+
+
+def cached_mesh_build(case_dir: Path | str, tool: str, run: Callable[[], None], inputs: list[str] | None = None,
+                      link: bool = False, cache_dir: Path | str | None = None, reuse: bool = True) -> MeshBuild:
+    """
+    Restore the mesh of identical inputs from the cache, or run the tool and store its mesh.
+
+    Parameters:
+        case_dir: Path to the OpenFOAM case directory
+        tool: Name of the meshing executable, part of the key
+        run: Builds constant/polyMesh; exceptions are passed on and nothing is stored
+        inputs: Input files relative to the case (default from ``mesh_input_files``)
+        link: Restore by hardlink instead of copy
+        cache_dir: Location of the store (default from ``mesh_cache_dir``)
+        reuse: Look up the key first; without it the tool always runs and its mesh replaces the stored one
+
+    Returns:
+        The key, whether it was a cache hit, and the files and size of the mesh
+    """
+    case_dir = Path(case_dir)
+    poly_mesh_dir = case_dir / "constant" / "polyMesh"
+    cache = MeshCache(cache_dir or mesh_cache_dir(case_dir))
+    key = mesh_cache_key(case_dir, tool, inputs)
+    restored = cache.restore(key, poly_mesh_dir, link) if reuse else None
+    if restored is not None:
+        return restored
+    unshare_files(poly_mesh_dir)
+    run()
+    return cache.store(key, poly_mesh_dir, tool)
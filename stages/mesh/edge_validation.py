@@ -0,0 +1,325 @@
+"""
+Geometry checks of the 2D edgeDict, run before the ribbon surface is written.
+
+Vertices and edges are hashed onto uniform grids, so only items sharing a grid
+cell are compared. Together with the sorts used for grouping, a check of tens
+of thousands of edges takes well under a second, instead of surfacing minutes
+later as a failed cartesian2DMesh run.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import numpy as np
+
+# Vertices closer than this fraction of the bounding-box diagonal are near-duplicates
+RELATIVE_TOLERANCE = 1e-6
+
+# Lower bound of the relative grid spacing, which keeps grid keys within int64
+MIN_RELATIVE_SPACING = 1e-9
+
+# Grid cells an edge is registered in, on average, before the edge grid is coarsened
+MAX_CELLS_PER_EDGE = 8
+
+# Indices listed in an issue message
+MAX_LISTED = 10
+
+
+@dataclass(frozen=True)
+class EdgeIssue:
+    code: str
+    message: str
+    blocking: bool = True
+    vertices: tuple[int, ...] = ()
+    edges: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class EdgeDictReport:
+    issues: tuple[EdgeIssue, ...] = ()
+
+    @property
+    def ready(self) -> bool:
+        return not any(issue.blocking for issue in self.issues)
+
+    @property
+    def blocking_issues(self) -> tuple[EdgeIssue, ...]:
+        return tuple(issue for issue in self.issues if issue.blocking)
+
+    @property
+    def warnings(self) -> tuple[EdgeIssue, ...]:
+        return tuple(issue for issue in self.issues if not issue.blocking)
+
+
+def _listing(items) -> str:
+    items = [str(item) for item in items]
+    listed = ", ".join(items[:MAX_LISTED])
+    return listed + (f" and {len(items) - MAX_LISTED} more" if len(items) > MAX_LISTED else "")
+
+
+def _grid_pairs(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Pairs of items whose grid cell ranges overlap.
+
+    Every item is registered in all cells from ``lower`` to ``upper`` (integer
+    cell coordinates), the registrations are sorted by cell and all pairs within
+    a cell are formed.
+
+    Returns:
+        Unique pairs (i, j) with i < j, shape (n, 2)
+    """
+    if not len(lower):
+        return np.empty((0, 2), dtype=np.int64)
+    width = upper - lower + 1
+    counts = width[:, 0] * width[:, 1]
+    items = np.repeat(np.arange(len(lower)), counts)
+    local = np.arange(len(items)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell_x = lower[items, 0] + local % width[items, 0]
+    cell_y = lower[items, 1] + local // width[items, 0]
+    keys = (cell_x - cell_x.min()) * (cell_y.max() - cell_y.min() + 1) + (cell_y - cell_y.min())
+
+    order = np.argsort(keys, kind="stable")
+    keys, items = keys[order], items[order]
+    group_end = np.searchsorted(keys, keys, side="right")
+    following = group_end - np.arange(len(keys)) - 1
+    first = np.repeat(np.arange(len(keys)), following)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(following) - following, following)
+    pairs = np.sort(np.column_stack([items[first], items[second]]), axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    # Items registered in several cells pair up repeatedly; one integer key per pair is faster to unique than rows
+    keys = np.unique(pairs[:, 0] * len(lower) + pairs[:, 1])
+    return np.column_stack([keys // len(lower), keys % len(lower)])
+
+
+def _components(n: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Connected component of every vertex, labelled by its smallest vertex, by label propagation."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[u], labels[v])
+        updated = labels.copy()
+        np.minimum.at(updated, u, low)
+        np.minimum.at(updated, v, low)
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _cross(o: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a[:, 0] - o[:, 0]) * (b[:, 1] - o[:, 1]) - (a[:, 1] - o[:, 1]) * (b[:, 0] - o[:, 0])
+
+
+def _intersecting(points: np.ndarray, first: np.ndarray, second: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Whether pairs of edges (given as point index pairs) cross, touch or overlap.
+
+    Edges cross if the end points of each lie on different sides of the other.
+    They touch if an end point lies on the other edge, within the tolerance;
+    a common end point does not count.
+    """
+    p1, p2 = points[first[:, 0]], points[first[:, 1]]
+    q1, q2 = points[second[:, 0]], points[second[:, 1]]
+    p_length, q_length = np.hypot(*(p2 - p1).T), np.hypot(*(q2 - q1).T)
+
+    def side(o, a, b, length):
+        # Points within the tolerance of the line are on the line
+        value = _cross(o, a, b)
+        return np.where(np.abs(value) <= tolerance * length, 0.0, np.sign(value))
+
+    def on_edge(o, a, point, length):
+        along = np.einsum("ij,ij->i", point - o, a - o) / length
+        return (along >= -tolerance) & (along <= length + tolerance)
+
+    d1, d2 = side(q1, q2, p1, q_length), side(q1, q2, p2, q_length)
+    d3, d4 = side(p1, p2, q1, p_length), side(p1, p2, q2, p_length)
+    crossing = (d1 * d2 < 0) & (d3 * d4 < 0)
+
+    p_shared = (first[:, :, None] == second[:, None, :]).any(axis=2)
+    q_shared = (second[:, :, None] == first[:, None, :]).any(axis=2)
+    touching = (
+        ((d1 == 0) & ~p_shared[:, 0] & on_edge(q1, q2, p1, q_length))
+        | ((d2 == 0) & ~p_shared[:, 1] & on_edge(q1, q2, p2, q_length))
+        | ((d3 == 0) & ~q_shared[:, 0] & on_edge(p1, p2, q1, p_length))
+        | ((d4 == 0) & ~q_shared[:, 1] & on_edge(p1, p2, q2, p_length))
+    )
+    return crossing | touching
+
+
+def validate_edge_dict(edge_dict: Mapping[str, Any], relative_tolerance: float = RELATIVE_TOLERANCE) -> EdgeDictReport:
+    """
+    Check the vertices, edges and boundary patches of an edgeDict.
+
+    Blocking issues make cartesian2DMesh fail or produce a wrong mesh: invalid
+    vertex indices, zero-length, duplicate or crossing edges, open boundary
+    loops and edges without a patch. Duplicate, near-duplicate and unused
+    vertices are reported as warnings; coincident vertices are merged when
+    the ribbon is written.
+
+    Parameters:
+        edge_dict: Dictionary with 'vertices', 'edges' and 'boundary' entries
+        relative_tolerance: Distance below which vertices coincide, relative to the bounding-box diagonal
+
+    Returns:
+        The report with all issues found
+    """
+    issues: list[EdgeIssue] = []
+    vertices = np.asarray(edge_dict.get("vertices", []), dtype=float).reshape(-1, 2)
+    edges = np.asarray(edge_dict.get("edges", []), dtype=np.int64).reshape(-1, 2)
+    boundary = edge_dict.get("boundary") or {}
+    n_vertices, n_edges = len(vertices), len(edges)
+
+    # --- Vertices ---
+    finite = np.isfinite(vertices).all(axis=1)
+    if not finite.all():
+        bad = np.nonzero(~finite)[0]
+        issues.append(EdgeIssue("invalid_vertices", f"Vertices without valid coordinates: {_listing(bad)}",
+                                vertices=tuple(bad.tolist())))
+
+    # Exact duplicates share one merged vertex, as in the ribbon surface
+    merged = np.arange(n_vertices)
+    if finite.any():
+        valid = np.nonzero(finite)[0]
+        coordinates = vertices[valid] + 0.0
+        order = valid[np.lexsort((coordinates[:, 1], coordinates[:, 0]))]
+        new_group = np.ones(len(order), dtype=bool)
+        new_group[1:] = np.any(np.diff(vertices[order] + 0.0, axis=0) != 0, axis=1)
+        group = np.cumsum(new_group) - 1
+        representative = np.minimum.reduceat(order, np.nonzero(new_group)[0])
+        merged[order] = representative[group]
+        duplicates = np.nonzero(merged != np.arange(n_vertices))[0]
+        if len(duplicates):
+            issues.append(EdgeIssue(
+                "duplicate_vertices",
+                "Duplicate vertices: " + _listing(f"{vertex} = {merged[vertex]}" for vertex in duplicates),
+                blocking=False, vertices=tuple(duplicates.tolist()),
+            ))
+
+        span = vertices[valid].max(axis=0) - vertices[valid].min(axis=0)
+        diagonal = float(np.hypot(*span))
+        tolerance = diagonal * relative_tolerance
+        if tolerance > 0:
+            spacing = 2.0 * max(tolerance, diagonal * MIN_RELATIVE_SPACING)
+            unique = np.unique(merged[valid])
+            base = vertices[unique].min(axis=0)
+            lower = np.floor((vertices[unique] - tolerance - base) / spacing).astype(np.int64)
+            upper = np.floor((vertices[unique] + tolerance - base) / spacing).astype(np.int64)
+            pairs = unique[_grid_pairs(lower, upper)]
+            distance = np.hypot(*(vertices[pairs[:, 0]] - vertices[pairs[:, 1]]).T)
+            near = pairs[distance <= tolerance]
+            if len(near):
+                issues.append(EdgeIssue(
+                    "near_duplicate_vertices",
+                    f"Vertices closer than {tolerance:.3g}: " + _listing(f"{a}/{b}" for a, b in near),
+                    blocking=False, vertices=tuple(np.unique(near).tolist()),
+                ))
+    else:
+        tolerance = 0.0
+
+    # --- Edges ---
+    valid_index = ((edges >= 0) & (edges < n_vertices)).all(axis=1)
+    if not valid_index.all():
+        bad = np.nonzero(~valid_index)[0]
+        issues.append(EdgeIssue("invalid_edges", f"Edges with invalid vertex indices: {_listing(bad)}",
+                                edges=tuple(bad.tolist())))
+    usable = valid_index.copy()
+    usable[valid_index] = finite[edges[valid_index]].all(axis=1)
+    ends = np.zeros_like(edges)
+    ends[usable] = merged[edges[usable]]
+
+    zero_length = usable & (ends[:, 0] == ends[:, 1])
+    if zero_length.any():
+        bad = np.nonzero(zero_length)[0]
+        issues.append(EdgeIssue("zero_length_edges", f"Edges of zero length: {_listing(bad)}",
+                                edges=tuple(bad.tolist())))
+    usable &= ~zero_length
+    usable_edges = np.nonzero(usable)[0]
+
+    # Duplicate edges connect the same merged vertices, in either direction
+    ordered = np.sort(ends[usable_edges], axis=1)
+    if len(ordered):
+        _, first_use, inverse = np.unique(ordered[:, 0] * n_vertices + ordered[:, 1], return_index=True,
+                                          return_inverse=True)
+        original = usable_edges[first_use[inverse]]
+        repeated = original != usable_edges
+        if repeated.any():
+            issues.append(EdgeIssue(
+                "duplicate_edges",
+                "Duplicate edges: " + _listing(f"{edge} = {first}" for edge, first in
+                                               zip(usable_edges[repeated], original[repeated])),
+                edges=tuple(usable_edges[repeated].tolist()),
+            ))
+
+    # Crossing edges, tested for pairs of edges that share a grid cell
+    if len(usable_edges) > 1 and tolerance > 0:
+        segments = vertices[ends[usable_edges]]
+        low, high = segments.min(axis=1), segments.max(axis=1)
+        base = low.min(axis=0)
+        lengths = np.hypot(*(high - low).T)
+        spacing = max(float(np.median(lengths)), diagonal * MIN_RELATIVE_SPACING)
+        while True:
+            lower = np.floor((low - tolerance - base) / spacing).astype(np.int64)
+            upper = np.floor((high + tolerance - base) / spacing).astype(np.int64)
+            if np.prod(upper - lower + 1, axis=1).sum() <= MAX_CELLS_PER_EDGE * len(usable_edges):
+                break
+            spacing *= 2.0
+        candidates = _grid_pairs(lower, upper)
+        candidates = candidates[~(ordered[candidates[:, 0]] == ordered[candidates[:, 1]]).all(axis=1)]
+        hits = candidates[_intersecting(vertices, ends[usable_edges[candidates[:, 0]]],
+                                        ends[usable_edges[candidates[:, 1]]], tolerance)]
+        if len(hits):
+            hit_edges = usable_edges[hits]
+            issues.append(EdgeIssue(
+                "crossing_edges",
+                "Crossing or overlapping edges: " + _listing(f"{a}/{b}" for a, b in hit_edges),
+                edges=tuple(np.unique(hit_edges).tolist()),
+            ))
+
+    # --- Loops ---
+    used = np.zeros(n_vertices, dtype=bool)
+    used[merged[edges[valid_index]].ravel()] = True
+    unused = np.nonzero(finite & ~used[merged])[0]
+    if len(unused):
+        issues.append(EdgeIssue("unused_vertices", f"Vertices not used by any edge: {_listing(unused)}",
+                                blocking=False, vertices=tuple(unused.tolist())))
+
+    if len(usable_edges):
+        u, v = ends[usable_edges, 0], ends[usable_edges, 1]
+        degree = np.bincount(np.concatenate([u, v]), minlength=n_vertices)
+        dead_ends = np.nonzero(degree == 1)[0]
+        if len(dead_ends):
+            # One issue for all open loops, since traced polylines can have thousands of them
+            labels = _components(n_vertices, u, v)
+            open_labels = np.unique(labels[dead_ends])
+            loop_edges = usable_edges[np.isin(labels[u], open_labels)]
+            loops = "An unclosed boundary loop" if len(open_labels) == 1 else f"{len(open_labels)} unclosed boundary loops"
+            issues.append(EdgeIssue(
+                "open_loop",
+                f"{loops} with open ends at vertices {_listing(dead_ends)} (edges {_listing(loop_edges)})",
+                vertices=tuple(dead_ends.tolist()), edges=tuple(loop_edges.tolist()),
+            ))
+
+    # --- Patches ---
+    patch_count = np.zeros(n_edges, dtype=np.int64)
+    for name, patch in boundary.items():
+        patch_edges = np.asarray(patch.get("edges", []), dtype=np.int64).reshape(-1)
+        invalid = patch_edges[(patch_edges < 0) | (patch_edges >= n_edges)]
+        if len(invalid):
+            issues.append(EdgeIssue("invalid_patch_edges", f"Patch {name} refers to missing edges: {_listing(invalid)}"))
+        np.add.at(patch_count, np.unique(patch_edges[(patch_edges >= 0) & (patch_edges < n_edges)]), 1)
+        if not patch.get("type"):
+            issues.append(EdgeIssue("patch_type", f"Patch {name} has no type"))
+    unassigned = np.nonzero(patch_count == 0)[0]
+    if len(unassigned):
+        issues.append(EdgeIssue("unassigned_edges", f"Edges without a patch: {_listing(unassigned)}",
+                                edges=tuple(unassigned.tolist())))
+    shared = np.nonzero(patch_count > 1)[0]
+    if len(shared):
+        issues.append(EdgeIssue("shared_edges", f"Edges in more than one patch, the last one is used: {_listing(shared)}",
+                                blocking=False, edges=tuple(shared.tolist())))
+
+    return EdgeDictReport(tuple(issues))
@@ -0,0 +1,288 @@
+"""
+Import of 2D cross-sections for the edgeDict from CSV, DXF and GeoJSON files.
+
+Every reader returns polylines, which are optionally simplified with a
+vectorised Douglas-Peucker algorithm and then joined into the vertices, edges
+and boundary patches of an edgeDict. Points shared by several polylines are
+merged and always kept, so layer interfaces stay connected to the outline.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import io
+import json
+from pathlib import Path
+import re
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATCH = "boundary"
+
+# Column names of the polyline and patch of every point in CSV files
+CSV_LINE_COLUMNS = ("line", "polyline", "id")
+CSV_PATCH_COLUMNS = ("patch", "layer", "name")
+
+
+@dataclass
+class Polyline:
+    points: np.ndarray
+    closed: bool = False
+    patch: str = DEFAULT_PATCH
+
+    def __post_init__(self):
+        self.points = np.asarray(self.points, dtype=float).reshape(-1, 2)
+        # A repeated first point closes the line
+        if len(self.points) > 2 and np.array_equal(self.points[0], self.points[-1]):
+            self.points = self.points[:-1]
+            self.closed = True
+
+
+def patch_name(name: Any) -> str:
+    """A valid OpenFOAM word from a layer or feature name."""
+    word = re.sub(r"[^A-Za-z0-9_.:-]+", "_", str(name)).strip("_")
+    return word or DEFAULT_PATCH
+
+
+def read_csv_polylines(source) -> list[Polyline]:
+    """
+    Read points from CSV with x and y columns, in the order of the polylines.
+
+    An optional line column (line, polyline or id) splits the points into
+    polylines and an optional patch column (patch, layer or name) names their
+    patch. Without x and y headers the first two numeric columns are used.
+    """
+    table = pd.read_csv(source)
+    columns = {column.strip().lower(): column for column in table.columns}
+    if "x" in columns and "y" in columns:
+        x_column, y_column = columns["x"], columns["y"]
+    else:
+        numeric = table.select_dtypes("number").columns
+        if len(numeric) < 2:
+            raise ValueError("The CSV file needs x and y columns")
+        x_column, y_column = numeric[:2]
+    line_column = next((columns[name] for name in CSV_LINE_COLUMNS if name in columns), None)
+    patch_column = next((columns[name] for name in CSV_PATCH_COLUMNS if name in columns), None)
+
+    points = table[[x_column, y_column]].to_numpy(dtype=float)
+    if line_column is None:
+        groups = [np.arange(len(table))]
+    else:
+        # Consecutive rows with the same line value form one polyline
+        lines = table[line_column].to_numpy()
+        starts = np.flatnonzero(np.r_[True, lines[1:] != lines[:-1]])
+        groups = np.split(np.arange(len(table)), starts[1:])
+    return [
+        Polyline(points[rows], patch=patch_name(table[patch_column].iloc[rows[0]]) if patch_column else
+                 patch_name(table[line_column].iloc[rows[0]]) if line_column else DEFAULT_PATCH)
+        for rows in groups if len(rows) > 1
+    ]
+
+
+def read_dxf_polylines(source) -> list[Polyline]:
+    """
+    Read the LWPOLYLINE entities of an ASCII DXF file, with their layer as patch.
+
+    Bulges (arc segments) are read as straight segments.
+    """
+    text = source.read() if hasattr(source, "read") else Path(source).read_bytes()
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", errors="replace")
+    lines = text.splitlines()
+    codes = np.array([line.strip() for line in lines[0::2]])
+    values = np.array([line.strip() for line in lines[1::2]])
+    codes = codes[:len(values)]
+
+    entity_starts = np.flatnonzero(codes == "0")
+    entity_ends = np.r_[entity_starts[1:], len(codes)]
+    polylines = []
+    for start, end in zip(entity_starts, entity_ends):
+        if values[start] != "LWPOLYLINE":
+            continue
+        entity_codes, entity_values = codes[start + 1:end], values[start + 1:end]
+        x = entity_values[entity_codes == "10"].astype(float)
+        y = entity_values[entity_codes == "20"].astype(float)
+        flags = entity_values[entity_codes == "70"]
+        layers = entity_values[entity_codes == "8"]
+        polylines.append(Polyline(
+            np.column_stack([x, y[:len(x)]]),
+            closed=bool(int(flags[0]) & 1) if len(flags) else False,
+            patch=patch_name(layers[0]) if len(layers) else DEFAULT_PATCH,
+        ))
+    if not polylines:
+        raise ValueError("The DXF file has no LWPOLYLINE entities")
+    return polylines
+
+
+def _geojson_polylines(geometry: dict[str, Any], patch: str) -> list[Polyline]:
+    kind, coordinates = geometry.get("type"), geometry.get("coordinates", [])
+    if kind == "LineString":
+        return [Polyline(np.asarray(coordinates, dtype=float)[:, :2], patch=patch)]
+    if kind == "MultiLineString":
+        return [Polyline(np.asarray(line, dtype=float)[:, :2], patch=patch) for line in coordinates]
+    if kind == "Polygon":
+        return [Polyline(np.asarray(ring, dtype=float)[:, :2], closed=True, patch=patch) for ring in coordinates]
+    if kind == "MultiPolygon":
+        return [Polyline(np.asarray(ring, dtype=float)[:, :2], closed=True, patch=patch)
+                for polygon in coordinates for ring in polygon]
+    if kind == "GeometryCollection":
+        return [polyline for part in geometry.get("geometries", []) for polyline in _geojson_polylines(part, patch)]
+    return []
+
+
+def read_geojson_polylines(source) -> list[Polyline]:
+    """
+    Read the LineString and Polygon geometries of a GeoJSON file.
+
+    The patch of a feature is its "patch" or "name" property; features without
+    one are named after their index.
+    """
+    text = source.read() if hasattr(source, "read") else Path(source).read_bytes()
+    data = json.loads(text)
+    if data.get("type") == "FeatureCollection":
+        features = data.get("features", [])
+    elif data.get("type") == "Feature":
+        features = [data]
+    else:
+        features = [{"geometry": data, "properties": {}}]
+
+    polylines = []
+    for index, feature in enumerate(features):
+        properties = feature.get("properties") or {}
+        name = properties.get("patch", properties.get("name", f"{DEFAULT_PATCH}{index}"))
+        polylines.extend(_geojson_polylines(feature.get("geometry") or {}, patch_name(name)))
+    if not polylines:
+        raise ValueError("The GeoJSON file has no LineString or Polygon geometries")
+    return polylines
+
+
+GEOMETRY_READERS = {
+    "csv": read_csv_polylines,
+    "dxf": read_dxf_polylines,
+    "geojson": read_geojson_polylines,
+    "json": read_geojson_polylines,
+}
+
+GEOMETRY_FILE_TYPES = list(GEOMETRY_READERS)
+
+
+def read_polylines(source, file_name: str | None = None) -> list[Polyline]:
+    """Read the polylines of a geometry file, chosen by its extension."""
+    suffix = Path(file_name or getattr(source, "name", None) or str(source)).suffix.lower().lstrip(".")
+    if suffix not in GEOMETRY_READERS:
+        raise ValueError(f"Unsupported geometry file type: .{suffix}")
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return GEOMETRY_READERS[suffix](source)
+
+
+def _segment_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray, index: np.ndarray,
+                       segment: np.ndarray) -> np.ndarray:
+    """Distance of points[index] to the segment from points[starts[segment]] to points[ends[segment]]."""
+    a, b, p = points[starts[segment]], points[ends[segment]], points[index]
+    direction = b - a
+    length_squared = np.einsum("ij,ij->i", direction, direction)
+    t = np.einsum("ij,ij->i", p - a, direction) / np.where(length_squared > 0, length_squared, 1.0)
+    closest = a + np.clip(t, 0.0, 1.0)[:, None] * direction
+    return np.hypot(*(p - closest).T)
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float, keep: np.ndarray | None = None) -> np.ndarray:
+    """
+    Simplify a polyline with the Douglas-Peucker algorithm, measuring the
+    distance of every point to the segment between the enclosing kept points.
+
+    All segments of one recursion level are processed together, so the work
+    per level is vectorised and the number of levels grows with log(n) for
+    typical lines. Points marked in ``keep`` and both end points are always kept.
+
+    Returns:
+        Boolean mask of the points that are kept
+    """
+    points = np.asarray(points, dtype=float)
+    mask = np.zeros(len(points), dtype=bool) if keep is None else np.asarray(keep, dtype=bool).copy()
+    if len(points) < 3:
+        mask[:] = True
+        return mask
+    mask[[0, -1]] = True
+
+    fixed = np.flatnonzero(mask)
+    starts, ends = fixed[:-1], fixed[1:]
+    while True:
+        active = ends - starts > 1
+        starts, ends = starts[active], ends[active]
+        if not len(starts):
+            return mask
+        # Interior points of every segment, and the segment they belong to
+        counts = ends - starts - 1
+        segment = np.repeat(np.arange(len(starts)), counts)
+        index = starts[segment] + 1 + np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts)
+        distance = _segment_distances(points, starts, ends, index, segment)
+
+        offsets = np.cumsum(counts) - counts
+        farthest = np.maximum.reduceat(distance, offsets)
+        split = farthest > tolerance
+        if not split.any():
+            return mask
+        # Position of the farthest point of every split segment
+        is_max = distance == np.repeat(farthest, counts)
+        first_max = np.minimum.reduceat(np.where(is_max, np.arange(len(distance)), len(distance)), offsets)
+        pivots = index[first_max[split]]
+        mask[pivots] = True
+        starts = np.concatenate([starts[split], pivots])
+        ends = np.concatenate([pivots, ends[split]])
+
+
+def polylines_to_edge_dict(polylines: list[Polyline], tolerance: float = 0.0,
+                           patch_type: str = "patch") -> dict[str, Any]:
+    """
+    Join polylines into the vertices, edges and boundary patches of an edgeDict.
+
+    Parameters:
+        polylines: The imported polylines
+        tolerance: Douglas-Peucker tolerance in model units, 0 keeps all points
+        patch_type: Type of every created patch
+
+    Returns:
+        Dictionary with 'vertices', 'edges' and 'boundary' entries
+    """
+    polylines = [polyline for polyline in polylines if len(polyline.points) > 1]
+    if not polylines:
+        return {"vertices": [], "edges": [], "boundary": {}}
+
+    all_points = np.concatenate([polyline.points for polyline in polylines]) + 0.0
+    unique, inverse, counts = np.unique(all_points, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    # Points used more than once join polylines (or close them) and are never simplified away
+    shared = counts[inverse] > 1
+
+    vertex_ids, edges, boundary = [], [], {}
+    start = n_edges = 0
+    for polyline in polylines:
+        n_points = len(polyline.points)
+        ids, keep = inverse[start:start + n_points], shared[start:start + n_points]
+        start += n_points
+        if tolerance > 0:
+            points = np.vstack([polyline.points, polyline.points[:1]]) if polyline.closed else polyline.points
+            mask = douglas_peucker(points, tolerance, np.r_[keep, True] if polyline.closed else keep)
+            ids = ids[mask[:n_points]]
+        if polyline.closed and len(ids) > 2:
+            line_edges = np.column_stack([ids, np.roll(ids, -1)])
+        else:
+            line_edges = np.column_stack([ids[:-1], ids[1:]])
+        line_edges = line_edges[line_edges[:, 0] != line_edges[:, 1]]
+        vertex_ids.append(ids)
+        patch = boundary.setdefault(polyline.patch, {"type": patch_type, "edges": []})
+        patch["edges"].extend(range(n_edges, n_edges + len(line_edges)))
+        edges.append(line_edges)
+        n_edges += len(line_edges)
+
+    # Number the vertices that remain, in the order of their first use
+    used = np.concatenate(vertex_ids)
+    _, first = np.unique(used, return_index=True)
+    order = used[np.sort(first)]
+    numbering = np.full(len(unique), -1, dtype=np.int64)
+    numbering[order] = np.arange(len(order))
+    edges = numbering[np.concatenate(edges)]
+    return {"vertices": unique[order].tolist(), "edges": edges.tolist(), "boundary": boundary}
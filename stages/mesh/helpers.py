@@ -1,36 +1,42 @@
-import streamlit as st
-import zipfile
 import os
 
+import streamlit as st
 
-def extract_zip(meshFile, polyMeshLoc):
-  """
-  Extracts a .zip file to a specified location.
+from stages.mesh.archive import import_mesh_archive
 
-  Args:
-    meshFile:  The path to the .zip file (string), or a file-like object.
-    polyMeshLoc: The directory where the contents of the .zip file should be extracted.
-                   This directory will be created if it doesn't exist.
-  """
-  try:
-    # Create the target directory if it doesn't exist
-    os.makedirs(polyMeshLoc, exist_ok=True)
 
-    # Open the zip file.  Handles both path strings and file-like objects.
-    with zipfile.ZipFile(meshFile, 'r') as zip_ref:
-      # Extract all files to the specified directory
-      zip_ref.extractall(polyMeshLoc)
+def extract_mesh_archive(meshFile, polyMeshLoc, file_name=None):
+    """
+    Stream a polyMesh archive (.zip, .tar, .tar.gz or .tar.zst) into polyMeshLoc and show the mesh size.
 
-    print(f"Successfully extracted contents of {meshFile} to {polyMeshLoc}")
+    Args:
+        meshFile: The path to the archive, or a file-like object such as an UploadedFile.
+        polyMeshLoc: The polyMesh directory the mesh replaces.
+        file_name: The archive name, if meshFile has none.
 
-  except FileNotFoundError:
-    print(f"Error: Zip file not found: {meshFile}")
-  except zipfile.BadZipFile:
-    print(f"Error: Invalid zip file: {meshFile}")
-  except Exception as e:
-    print(f"An unexpected error occurred: {e}")
+    Returns:
+        MeshArchiveImport or None: The extracted files and mesh counts, or None if the import failed.
+    """
+    progress_bar = st.progress(0.0, text="Extracting mesh archive")
+
+    def progress(done, total):
+        if total:
+            progress_bar.progress(min(done / total, 1.0), text=f"Extracting mesh archive: {done / 1024 ** 2:.0f} MB read")
+
+    try:
+        result = import_mesh_archive(meshFile, polyMeshLoc, file_name=file_name, progress=progress)
+    except (OSError, ValueError) as e:
+        progress_bar.empty()
+        st.error(f"Could not import the mesh: {e}")
+        return None
+
+    progress_bar.empty()
+    st.success(f"Saved the mesh into {polyMeshLoc}")
+    columns = st.columns(3)
+    for column, key in zip(columns, ("nCells", "nFaces", "nPoints")):
+        column.metric(key, f"{result.counts.get(key, 0):,}")
+    return result
 
-  st.success(f'Saved the mesh into {polyMeshLoc}')
 
 def save_uploaded_file(uploadedfile, destination_folder, new_file_name, overwrite=False):
     """
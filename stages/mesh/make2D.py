@@ -1,7 +1,12 @@
-import streamlit as st
-import pandas as pd
+import io
+
 import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
 
+from stages.mesh.edge_validation import validate_edge_dict
+from stages.mesh.geometry_import import GEOMETRY_FILE_TYPES, polylines_to_edge_dict, read_polylines
 from state import *
 
 @st.dialog("2D Mesh Generator", width="large")
@@ -10,6 +15,32 @@ def twoDEdgeDictGenerator():
     case = get_case()
     edgeDict = mesh_data["edgeDict"]
 
+    # --- Geometry Import ---
+    with st.expander("Import geometry from CSV, DXF or GeoJSON"):
+        st.write("Polylines of the file replace the vertices, edges and patches below. "
+                 "DXF layers and GeoJSON feature names become patches.")
+        geometry_file = st.file_uploader("Geometry file", type=GEOMETRY_FILE_TYPES, key="geometry_import_file")
+        col1, col2 = st.columns(2)
+        tolerance = col1.number_input("Simplification tolerance", min_value=0.0, value=0.0, format="%.4g",
+                                      help="Douglas-Peucker tolerance in model units, 0 keeps every point")
+        patch_type = col2.segmented_control("Patch Type", options=['patch', 'symmetryPlane', 'empty', 'cyclic'],
+                                            default='patch', key="geometry_import_patch_type")
+        if st.button("Import geometry", disabled=geometry_file is None):
+            try:
+                polylines = read_polylines(geometry_file.getvalue(), geometry_file.name)
+                imported = polylines_to_edge_dict(polylines, tolerance, patch_type or 'patch')
+            except (ValueError, KeyError, IndexError) as exc:
+                st.error(f"Could not import {geometry_file.name}: {exc}")
+            else:
+                edgeDict.clear()
+                edgeDict.update(imported)
+                mesh_data['df_vertices'] = None
+                mesh_data['df_edges'] = None
+                for key in ("data_editor_vertices", "data_editor_edges"):
+                    st.session_state.pop(key, None)
+                st.success(f"Imported {len(imported['vertices'])} vertices, {len(imported['edges'])} edges "
+                           f"and {len(imported['boundary'])} patches from {sum(len(line.points) for line in polylines)} points.")
+
     # --- Vertex Input ---
     with st.form("vertices_form"):
         st.header("1. Define Vertices")
@@ -142,7 +173,7 @@ def twoDEdgeDictGenerator():
                 default_num = 1
                 defaultNames = []
 
-            num_patches = st.number_input("Number of Boundary Patches", min_value=0, max_value=10, value=default_num, step=1)
+            num_patches = st.number_input("Number of Boundary Patches", min_value=0, max_value=max(10, default_num), value=default_num, step=1)
 
             with st.form("boundary_form", border=False):
                 patches = {}
@@ -181,7 +212,9 @@ def twoDEdgeDictGenerator():
     # 4. Generate the Dictionary
     if 'vertices' in edgeDict and 'edges' in edgeDict and 'boundary' in edgeDict:
         st.header("4. Generated Dictionary")
-        if st.button("Write Dict"):
+        report = validate_edge_dict(edgeDict)
+        show_edge_dict_report(report)
+        if st.button("Write Dict", disabled=not report.ready):
             edgeDictFile = case.file("system/edgeDict")
             if not Path(edgeDictFile).exists():
                 Path(edgeDictFile).touch()
@@ -198,124 +231,132 @@ def twoDEdgeDictGenerator():
 
 
 
-@st.cache_data
-def edgesToRibbonFMS(input_dict):
+def show_edge_dict_report(report):
+    """Show the issues of an edgeDict validation report, errors first."""
+    for issue in report.blocking_issues:
+        st.error(issue.message)
+    for issue in report.warnings:
+        st.warning(issue.message)
+    if not report.issues:
+        st.success("The geometry has no crossing edges, open loops or unassigned edges.")
+
+
+# Thickness of the ribbon the 2D edges are extruded to
+RIBBON_THICKNESS = 0.1
+
+# Number of points or triangles formatted per write
+FMS_CHUNK_SIZE = 65536
+
+
+def _ribbon(input_dict):
     """
-    Converts a dictionary of vertices, edges, and boundary into an FMS format string.
+    Extrude the edges of an edgeDict to a ribbon of triangles.
+
+    Coincident vertices are merged by sorting the coordinates and keep the
+    order of their first use, as in the original dictionary-based implementation.
+
+    Returns:
+        Tuple of points (n, 3), triangles (2 * n_edges, 3) and the patch index of every triangle
+    """
+    edges = np.asarray(input_dict['edges'], dtype=np.int64).reshape(-1, 2)
+    vertices = np.asarray(input_dict.get('vertices', []), dtype=float).reshape(-1, 2)
+    n_edges = len(edges)
+
+    invalid = (edges < -len(vertices)) | (edges >= len(vertices))
+    if invalid.any():
+        raise ValueError(f"Edge {int(np.nonzero(invalid.any(axis=1))[0][0])} has an invalid vertex index.")
+
+    edge_patch = np.full(n_edges, -1, dtype=np.int64)
+    for patch_index, patch_data in enumerate(input_dict.get('boundary', {}).values()):
+        patch_edges = np.asarray(patch_data['edges'], dtype=np.int64).reshape(-1)
+        edge_patch[patch_edges[(patch_edges >= 0) & (patch_edges < n_edges)]] = patch_index
+    unassigned = np.nonzero(edge_patch < 0)[0]
+    if len(unassigned):
+        raise ValueError(f"Edge {int(unassigned[0])} is not assigned to any patch.")
+
+    # End points in the order they are used: u and v of every edge; adding 0.0 merges -0.0 with 0.0
+    endpoints = vertices[edges.ravel()] + 0.0
+    # Unique coordinates like np.unique(axis=0), but lexsort is much faster than sorting rows;
+    # it is stable, so the first entry of every group is its first use
+    sort = np.lexsort((endpoints[:, 1], endpoints[:, 0]))
+    new_group = np.ones(len(sort), dtype=bool)
+    new_group[1:] = np.any(np.diff(endpoints[sort], axis=0) != 0, axis=1)
+    first = sort[new_group]
+    unique = endpoints[first]
+    inverse = np.empty(len(sort), dtype=np.int64)
+    inverse[sort] = np.cumsum(new_group) - 1
+    n_unique = len(unique)
+
+    # Every edge uses its points at z = 0 first, then at z = RIBBON_THICKNESS
+    first_use = 4 * (first // 2) + first % 2
+    order = np.argsort(np.concatenate([first_use, first_use + 2]), kind="stable")
+    index = np.empty(2 * n_unique, dtype=np.int64)
+    index[order] = np.arange(2 * n_unique)
+    points = np.concatenate([
+        np.column_stack([unique, np.zeros(n_unique)]),
+        np.column_stack([unique, np.full(n_unique, RIBBON_THICKNESS)]),
+    ])[order]
+
+    lower = index[inverse].reshape(-1, 2)
+    upper = index[inverse + n_unique].reshape(-1, 2)
+    triangles = np.empty((2 * n_edges, 3), dtype=np.int64)
+    triangles[0::2] = np.column_stack([lower[:, 1], lower[:, 0], upper[:, 0]])
+    triangles[1::2] = np.column_stack([lower[:, 1], upper[:, 0], upper[:, 1]])
+    return points, triangles, np.repeat(edge_patch, 2)
+
+
+def _write_list(handle, values, item_format):
+    """Write ``n( item item ... )`` in chunks, without building the whole string."""
+    if not len(values):
+        handle.write("0( )\n")
+        return
+    handle.write(f"{len(values)}( ")
+    for start in range(0, len(values), FMS_CHUNK_SIZE):
+        chunk = values[start:start + FMS_CHUNK_SIZE]
+        if start:
+            handle.write(" ")
+        handle.write(" ".join([item_format] * len(chunk)) % tuple(chunk.ravel().tolist()))
+    handle.write(" )\n")
+
+
+def write_ribbon_fms(input_dict, handle):
+    """
+    Write the edges of an edgeDict, extruded to a ribbon of triangles, in FMS format.
 
     Args:
         input_dict: A dictionary with:
             'vertices': list of [x, y] coordinates.
             'edges': list of [u_index, v_index] vertex index pairs.
-            'boundary': list of [patch_name, { 'type': str, 'edges': list of edge indices }].
+            'boundary': dictionary of patch name to { 'type': str, 'edges': list of edge indices }.
+        handle: A writable text file.
+
+    Raises:
+        ValueError: If an edge has an invalid vertex index or is not assigned to any patch.
+    """
+    boundary = input_dict.get('boundary', {})
+    points, triangles, patches = _ribbon(input_dict)
+
+    handle.write(f"{len(boundary)}\n(\n")
+    for patch_name, patch_info in boundary.items():
+        handle.write(f"{patch_name} {patch_info['type']}\n")
+    handle.write(")\n")
+
+    _write_list(handle, points, "(%r %r %r)")
+    _write_list(handle, np.column_stack([triangles, patches]), "((%d %d %d) %d)")
+
+    # Empty feature edges and point, facet and edge subsets
+    handle.write("\n".join(["0()"] * 4))
+
+
+def edgesToRibbonFMS(input_dict):
+    """
+    Converts a dictionary of vertices, edges, and boundary into an FMS format string.
+
+    Prefer ``write_ribbon_fms`` to write large geometries directly to a file.
 
     Returns:
         A string representing the mesh in FMS format.
     """
-    output_vertices = []  # List to store the (x, y, z) coordinates of all vertices
-    vertex_to_index_map = {}  # Dictionary to map (x, y, z) tuples to unique global vertex indices
-    global_vertex_index = 0  # Counter for assigning unique vertex indices
-    output_faces = []  # List to store the faces (triangles) of the mesh
-
-    # Handle the case where there are no edges
-    if not input_dict['edges']:
-        output_str_lines = []
-        output_str_lines.append(str(len(input_dict.get('boundary', []))))  # Number of patches (use .get for safety)
-        output_str_lines.append("(")
-        for patch_data in input_dict.get('boundary', []):  # Iterate through patch definitions
-            patch_name = patch_data[0]  # Extract patch name
-            patch_type = patch_data[1]['type']  # Extract patch type
-            output_str_lines.append(f"{patch_name} {patch_type}")  # Add patch name and type to output
-        output_str_lines.append(")")
-        output_str_lines.append(f"{len(output_vertices)}( )")  # 0 vertices (empty list)
-        output_str_lines.append(f"{len(output_faces)}( )")  # 0 faces (empty list)
-        for _ in range(len(input_dict.get('boundary', []))):  # Add 0() for each patch (no boundaryFaces)
-            output_str_lines.append("0()")
-        return "\n".join(output_str_lines)  # Return the FMS string
-
-    # Create a mapping from edge index to patch index
-    edge_to_patch_map = {}
-    for patch_index, patch_data in enumerate(input_dict.get('boundary', {"": {"type": None, "edges": []}}).values()):
-        for edge_index in patch_data['edges']:
-            edge_to_patch_map[edge_index] = patch_index
-
-    # Iterate through each edge defined in the input
-    for edge_index, edge in enumerate(input_dict['edges']):
-        try:
-            # Get the indices of the two vertices that make up the edge
-            u_index, v_index = edge
-            # Retrieve the (x, y) coordinates of the vertices from the input dictionary
-            v_u = input_dict['vertices'][u_index]
-            v_v = input_dict['vertices'][v_index]
-        except IndexError:
-            # Handle the case where a vertex index is out of range
-            return "Error: Invalid vertex index in edge definition."
-
-        # Create four vertices for the extruded edge:
-        #   - Two original vertices on the z=0 plane
-        #   - Two corresponding vertices extruded along the z-axis (z=0.1)
-        local_vertices = [
-            tuple(v_u + [0.0]),  # Add z=0.0 to the first vertex
-            tuple(v_v + [0.0]),  # Add z=0.0 to the second vertex
-            tuple(v_u + [0.1]),  # Add z=0.1 to the first vertex (extruded)
-            tuple(v_v + [0.1]),  # Add z=0.1 to the second vertex (extruded)
-        ]
-
-        global_indices = []  # List to store the global indices of the four vertices
-        # Iterate through the four vertices of the extruded edge
-        for vertex_coords in local_vertices:
-            # Check if this vertex (x, y, z) already exists in the vertex_to_index_map
-            if vertex_coords not in vertex_to_index_map:
-                # If the vertex is new:
-                #   - Assign it a unique global index
-                #   - Add it to the output_vertices list
-                #   - Update the global_vertex_index counter
-                vertex_to_index_map[vertex_coords] = global_vertex_index
-                output_vertices.append(vertex_coords)
-                global_vertex_index += 1
-            # Add the global index of the current vertex to the global_indices list
-            global_indices.append(vertex_to_index_map[vertex_coords])
-
-        # Get the global indices of the four vertices
-        v_idx_1, v_idx_2, v_idx_3, v_idx_4 = global_indices
-        # Create two triangles (faces) from the four vertices:
-        #   - The winding order (vertex order) is important for correct surface normals
-        triangle1 = (v_idx_2, v_idx_1, v_idx_3)  # Corrected winding order
-        triangle2 = (v_idx_2, v_idx_3, v_idx_4)  # Corrected winding order
-
-        # Use the edge_to_patch_map to get the correct patch index
-        patch_index = edge_to_patch_map.get(edge_index, -1)  # Default to -1 if not found
-        if patch_index == -1:
-            return f"Error: Edge {edge_index} is not assigned to any patch."
-
-        # Add the two triangles to the output_faces list, along with the edge index
-        output_faces.append(((triangle1[0], triangle1[1], triangle1[2]), patch_index))
-        output_faces.append(((triangle2[0], triangle2[1], triangle2[2]), patch_index))
-
-    # --- Build the FMS string ---
-    output_str_lines = []  # List to store the lines of the FMS string
-    output_str_lines.append(str(len(input_dict.get('boundary', []))))  # Number of patches (use .get for safety)
-    output_str_lines.append("(")
-
-    # Add boundary (patch) information to the FMS string
-    for patch_data in input_dict.get('boundary', {"": {"type": None, "edges": []}}).items():  # Iterate through patch definitions
-        patch_name, patch_info = patch_data  # Unpack patch name and information
-        patch_type = patch_info['type']  # Get the patch type
-        output_str_lines.append(f"{patch_name} {patch_type}")  # Add patch name and type to output
-    output_str_lines.append(")")
-
-    # Add vertices to the FMS string
-    output_str_lines.append(f"{len(output_vertices)}( " + ' '.join([str(v).replace(',', '') for v in output_vertices]) + " )")
-
-    # Add faces to the FMS string
-    face_output_list = [
-        f"(({face[0]} {face[1]} {face[2]}) {patch_index})"  # Format each face: ((v1 v2 v3) edge_index)
-        for face, patch_index in output_faces
-    ]
-    output_str_lines.append(f"{len(output_faces)}( " + ' '.join(face_output_list) + " )")
-
-    # Add the empty sets
-    for i in range(4):
-              output_str_lines.append("0()")
-
-    return "\n".join(output_str_lines)  # Join the lines with newline characters and return the FMS string
+    output = io.StringIO()
+    write_ribbon_fms(input_dict, output)
+    return output.getvalue()
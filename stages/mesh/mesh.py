@@ -1,15 +1,25 @@
 from pathlib import Path
 
 from foamlib import FoamCase
+import numpy as np
+import pandas as pd
 import pyvista as pv
 import streamlit as st
 import streamlit.components.v1 as components
 
 from alpha_runtime import get_mesh_workflow_report
+from foam_io import mesh_signature, read_boundary, scan_zones
 from plotting_helpers import get_openfoam_visualizer
-from stages.mesh.helpers import extract_zip, save_uploaded_file
-from stages.mesh.make2D import edgesToRibbonFMS, twoDEdgeDictGenerator
+from stages.mesh.archive import UPLOAD_TYPES
+from stages.mesh.cache import MeshBuild, MeshCache, cached_mesh_build, mesh_cache_dir
+from stages.mesh.edge_validation import validate_edge_dict
+from stages.mesh.helpers import extract_mesh_archive, save_uploaded_file
+from stages.mesh.make2D import show_edge_dict_report, twoDEdgeDictGenerator, write_ribbon_fms
+from stages.mesh.quality import mesh_quality, read_poly_mesh
+from stages.mesh.structured import Layer, layered_mesh
+from stages.mesh import zones
 from state import get_case, get_case_data
+from trame_viewer import get_mesh_viewer, url_reachable
 
 
 @st.fragment
@@ -18,10 +28,11 @@ def main3D():
 
     select_method(
         foamCase,
-        ["OpenFoam", "BlockMesh", "Gmsh", "Geometry"],
+        ["OpenFoam", "BlockMesh", "Layered", "Gmsh", "Geometry"],
         [
-            "Import an existing polyMesh.zip",
+            "Import an existing polyMesh archive (.zip, .tar.gz, .tar.zst)",
             "Upload system/blockMeshDict and run blockMesh",
+            "Generate a structured hex mesh of horizontal soil layers",
             "Experimental mesh generation from .geo",
             "Experimental geometry-driven meshing",
         ],
@@ -35,9 +46,10 @@ def main2D():
 
     select_method(
         foamCase,
-        ["OpenFoam", "Gmsh", "Generate Now"],
+        ["OpenFoam", "Layered", "Gmsh", "Generate Now"],
         [
-            "Import an existing polyMesh.zip",
+            "Import an existing polyMesh archive (.zip, .tar.gz, .tar.zst)",
+            "Generate a structured quad mesh of horizontal soil layers",
             "Experimental mesh generation from .geo",
             "Use the current cartesian2DMesh workflow",
         ],
@@ -57,11 +69,21 @@ def select_method(foamCase: FoamCase, input_types, captions, dimensions):
 
     if input_type == "OpenFoam":
         st.caption(f"Import target: {poly_mesh_path}")
-        mesh_file = st.file_uploader("polyMesh.zip", type=["zip"], key=f"ofmesh_uploader_type_{dimensions}D")
-        if mesh_file is not None:
-            extract_zip(mesh_file, poly_mesh_path)
+        mesh_file = st.file_uploader("polyMesh archive", type=UPLOAD_TYPES, key=f"ofmesh_uploader_type_{dimensions}D",
+                                     help="A .zip, .tar, .tar.gz or .tar.zst of the polyMesh directory; its files may be gzipped")
+        archive_path = st.text_input("Or the path of an archive on this machine", key=f"ofmesh_archive_path_{dimensions}D",
+                                     help="Large archives are read from disk instead of being uploaded")
+        if st.button("Import mesh", disabled=mesh_file is None and not archive_path, key=f"ofmesh_import_{dimensions}D"):
+            if mesh_file is not None:
+                extract_mesh_archive(mesh_file, poly_mesh_path, file_name=mesh_file.name)
+            elif Path(archive_path).expanduser().is_file():
+                extract_mesh_archive(Path(archive_path).expanduser(), poly_mesh_path)
+            else:
+                st.error(f"No archive found at {archive_path}")
     elif input_type == "BlockMesh":
         render_block_mesh(foamCase, dimensions)
+    elif input_type == "Layered":
+        render_layered_mesh(foamCase, dimensions)
     elif input_type == "Gmsh":
         render_experimental_mesh_workflow(
             "Gmsh mesh generation is experimental and disabled in alpha.",
@@ -107,6 +129,7 @@ def render_block_mesh(foamCase: FoamCase, dimensions: int) -> None:
     if not block_mesh_dict_path.exists():
         st.info("Upload a blockMeshDict or provide one in system/blockMeshDict to enable blockMesh.")
 
+    mesh_cache_settings(dimensions)
     if st.button(
         "Run blockMesh",
         key=f"run_blockmesh_{dimensions}D",
@@ -114,10 +137,105 @@ def render_block_mesh(foamCase: FoamCase, dimensions: int) -> None:
         type="primary",
     ):
         try:
-            foamCase.block_mesh()
-            st.success("blockMesh completed successfully.")
+            build = cached_mesh_build(Path(foamCase), "blockMesh", foamCase.block_mesh, **mesh_cache_options(dimensions))
+            show_mesh_build("blockMesh", build)
         except Exception as exc:
             st.error(f"blockMesh failed: {exc}")
+    show_mesh_cache(Path(foamCase), dimensions)
+
+
+DEFAULT_LAYERS = pd.DataFrame({
+    "name": ["topLayer", "bottomLayer"],
+    "thickness": [2.0, 8.0],
+    "cells": [10, 20],
+    "grading": [1.0, 1.0],
+})
+
+
+def render_layered_mesh(foamCase: FoamCase, dimensions: int) -> None:
+    """Generate a structured mesh of soil layers in Python and write it straight to constant/polyMesh."""
+    poly_mesh_path = Path(foamCase) / "constant/polyMesh"
+    st.caption(f"Save path: {poly_mesh_path}")
+    st.caption("Layers from the ground surface down; every layer becomes a cellZone. "
+               "Grading is the ratio of the last (lowest) to the first cell height.")
+    layers = st.data_editor(
+        DEFAULT_LAYERS,
+        num_rows="dynamic",
+        hide_index=True,
+        key=f"layered_mesh_layers_{dimensions}D",
+        column_config={
+            "thickness": st.column_config.NumberColumn(min_value=0.0, format="%.3f"),
+            "cells": st.column_config.NumberColumn(min_value=1, step=1),
+            "grading": st.column_config.NumberColumn(min_value=0.0, format="%.3f"),
+        },
+    )
+
+    columns = st.columns(3)
+    width = columns[0].number_input("Width (x)", min_value=0.0, value=10.0, key=f"layered_mesh_width_{dimensions}D")
+    cells_x = columns[1].number_input("Cells in x", min_value=1, value=20, key=f"layered_mesh_cells_x_{dimensions}D")
+    grading_x = columns[2].number_input("Grading in x", min_value=0.0, value=1.0, key=f"layered_mesh_grading_x_{dimensions}D")
+    if dimensions == 3:
+        depth = columns[0].number_input("Depth (y)", min_value=0.0, value=10.0, key="layered_mesh_depth_3D")
+        cells_y = columns[1].number_input("Cells in y", min_value=1, value=20, key="layered_mesh_cells_y_3D")
+        grading_y = columns[2].number_input("Grading in y", min_value=0.0, value=1.0, key="layered_mesh_grading_y_3D")
+    else:
+        depth, cells_y, grading_y = 1.0, 1, 1.0
+
+    rows = layers.dropna()
+    n_cells = int(cells_x) * int(cells_y) * int(rows["cells"].sum())
+    st.caption(f"{n_cells:,} cells")
+    if st.button("Generate mesh", type="primary", key=f"layered_mesh_generate_{dimensions}D", disabled=rows.empty):
+        try:
+            mesh = layered_mesh(
+                [Layer(str(row.name), float(row.thickness), int(row.cells), float(row.grading))
+                 for row in rows.itertuples(index=False)],
+                width, int(cells_x), grading_x, depth, int(cells_y), grading_y, two_dimensional=dimensions == 2,
+            )
+            mesh.write(poly_mesh_path)
+        except ValueError as exc:
+            st.error(f"Could not generate the mesh: {exc}")
+            return
+        st.success(f"Wrote {mesh.n_cells:,} cells in {len(mesh.cell_zones)} cellZones to {poly_mesh_path}")
+
+
+def mesh_cache_settings(dimensions: int) -> None:
+    columns = st.columns(2)
+    columns[0].toggle("Reuse cached meshes", value=True, key=f"mesh_cache_enabled_{dimensions}D",
+                      help="Restore the mesh of identical input dictionaries, geometry and tool version "
+                           "instead of meshing again. Meshes are stored either way")
+    columns[1].toggle("Hardlink cached files", value=False, key=f"mesh_cache_link_{dimensions}D",
+                      help="Saves disk space and time for large meshes. Linked files are read-only "
+                           "and shared with the cache")
+
+
+def mesh_cache_options(dimensions: int) -> dict:
+    """Keyword arguments of cached_mesh_build from the cache settings."""
+    return {"reuse": st.session_state.get(f"mesh_cache_enabled_{dimensions}D", True),
+            "link": st.session_state.get(f"mesh_cache_link_{dimensions}D", False)}
+
+
+def show_mesh_build(tool: str, build: MeshBuild) -> None:
+    stats = st.session_state.setdefault("mesh_cache_stats", {"hits": 0, "misses": 0})
+    stats["hits" if build.hit else "misses"] += 1
+    if build.hit:
+        st.success(f"Cache hit: restored the mesh of identical inputs without running {tool}.")
+    else:
+        st.success(f"{tool} completed successfully.")
+    st.caption(f"Cache {'hit' if build.hit else 'miss'} · key {build.key[:12]} · "
+               f"{len(build.files)} files, {build.size / 1024 ** 2:.1f} MB")
+
+
+def show_mesh_cache(case_path: Path, dimensions: int) -> None:
+    cache = MeshCache(mesh_cache_dir(case_path))
+    builds, size = cache.usage()
+    stats = st.session_state.get("mesh_cache_stats", {"hits": 0, "misses": 0})
+    columns = st.columns(4)
+    columns[0].metric("Cache hits", stats["hits"])
+    columns[1].metric("Cache misses", stats["misses"])
+    columns[2].metric("Cached meshes", builds, help=f"{size / 1024 ** 2:.1f} MB in {cache.root}")
+    if columns[3].button("Clear mesh cache", key=f"mesh_cache_clear_{dimensions}D", disabled=not builds):
+        cache.clear()
+        st.rerun(scope="fragment")
 
 
 def render_experimental_mesh_workflow(message: str, detail: str, key_suffix: str) -> None:
@@ -162,20 +280,27 @@ def make2DMesh(foamCase: FoamCase):
         with st.form("Meshing2D"):
             mesh_data["cellSize"] = st.number_input("maxCellSize", value=mesh_data["cellSize"])
             mesh_data["nBoundaryLayers"] = st.number_input("nBoundaryLayers", value=mesh_data["nBoundaryLayers"])
+            mesh_cache_settings(2)
             should_start = st.form_submit_button("Start Meshing", type="primary", disabled=not report.ready)
             if should_start:
-                fmsRibbon = edgesToRibbonFMS(get_case().file("system/edgeDict").as_dict())
+                edge_dict = get_case().file("system/edgeDict").as_dict()
+                report = validate_edge_dict(edge_dict)
+                if not report.ready:
+                    show_edge_dict_report(report)
+                    return
                 with open(Path(foamCase) / "system/geometryRibbon.fms", "w") as handle:
-                    handle.write(fmsRibbon)
+                    write_ribbon_fms(edge_dict, handle)
                 with mesh_dict:
                     mesh_dict["surfaceFile"] = '"system/geometryRibbon.fms"'
                     mesh_dict["maxCellSize"] = mesh_data["cellSize"]
                     mesh_dict["boundaryLayers"]["nLayers"] = mesh_data["nBoundaryLayers"]
                 try:
-                    foamCase.run(["cartesian2DMesh"])
-                    st.success("Mesh created successfully")
+                    build = cached_mesh_build(Path(foamCase), "cartesian2DMesh",
+                                              lambda: foamCase.run(["cartesian2DMesh"]), **mesh_cache_options(2))
+                    show_mesh_build("cartesian2DMesh", build)
                 except Exception as exc:
                     st.error(f"Failed to create mesh: {exc}")
+        show_mesh_cache(Path(foamCase), 2)
     else:
         st.info("Generate or load an edgeDict to enable the supported 2D meshing workflow.")
 
@@ -183,7 +308,7 @@ def make2DMesh(foamCase: FoamCase):
 def plot_foam_mesh(case_path, show_mesh=True, bg_darkness=0.35,
                   selected_palette="deep", style="surface",
                   color_patches=False, show_boundaries=True,
-                  only_boundaries=False, opacity=1.0):
+                  only_boundaries=False, opacity=1.0, full_resolution=False, region=None):
     """
     Plot the OpenFOAM mesh with the selected visualization options.
 
@@ -197,44 +322,251 @@ def plot_foam_mesh(case_path, show_mesh=True, bg_darkness=0.35,
         show_boundaries: Whether to show boundary patches
         only_boundaries: Whether to show only boundary patches
         opacity: Opacity of the mesh (0.1-1.0)
+        full_resolution: Show the full mesh instead of the decimated outer surface
+        region: Mesh region of a multi-region case (default is constant/polyMesh)
     """
-    bg_value = 1.0 - bg_darkness
-    bg_color = (bg_value, bg_value, bg_value)
-
-    visualizer = get_openfoam_visualizer(case_path)
-
-    if visualizer.has_case_changed():
-        with st.spinner("Case has changed - refreshing data..."):
-            visualizer.refresh()
-
-    plotter = pv.Plotter(off_screen=True)
-    plotter.background_color = bg_color
-
-    cmap = visualizer.COLOR_PALETTES.get(selected_palette, visualizer.COLOR_PALETTES["deep"])
-
-    edge_color = "black" if bg_darkness < 0.25 else "white"
-
-    visualizer.visualize_mesh(
-        plotter=plotter,
-        show_edges=show_mesh,
+    settings = dict(
+        show_mesh=show_mesh,
+        bg_darkness=bg_darkness,
+        selected_palette=selected_palette,
         style=style,
         color_patches=color_patches,
         show_boundaries=show_boundaries,
         only_boundaries=only_boundaries,
         opacity=opacity,
-        edge_color=edge_color,
-        boundary_palette=selected_palette,
     )
 
-    plotter.view_isometric()
+    # Prefer the persistent trame viewer, which updates actors in place on reruns
+    try:
+        with st.spinner("Starting mesh viewer..."):
+            viewer = get_mesh_viewer(
+                st.session_state.setdefault("mesh_viewers", {}),
+                case_path,
+                mesh_signature(case_path),
+                region=region,
+                full_resolution=full_resolution,
+            )
+    except ImportError:
+        viewer = None
+    except Exception as exc:
+        st.warning(f"Interactive mesh viewer unavailable, falling back to static export: {exc}")
+        viewer = None
+
+    if viewer is not None:
+        headers = st.context.headers
+        url = viewer.url(headers.get("Host"), headers.get("X-Forwarded-Proto", "http"))
+        if url_reachable(url):
+            viewer.apply_settings(**settings)
+            if viewer.remote:
+                st.caption("Large mesh: rendered on the server and streamed as images.")
+            components.iframe(url, height=700, scrolling=False)
+            return
+        st.caption(f"The interactive mesh viewer is not reachable at {url}; showing the static export. "
+                   "Set PMF_TRAME_PUBLIC_URL to the address the browser can use.")
 
     try:
-        html_buffer = plotter.export_html(None)
+        html = render_mesh_html(
+            str(case_path),
+            mesh_signature(case_path),
+            full_resolution=full_resolution,
+            region=region,
+            **settings,
+        )
     except ImportError as exc:
         st.error("PyVista HTML export is unavailable. Please install the Trame dependencies.")
         st.caption(str(exc))
+        return
+
+    components.html(html, height=700, scrolling=False)
+
+
+@st.cache_data(max_entries=16, show_spinner="Preparing mesh view...")
+def render_mesh_html(case_path, signature, show_mesh=True, bg_darkness=0.35,
+                     selected_palette="deep", style="surface",
+                     color_patches=False, show_boundaries=True,
+                     only_boundaries=False, opacity=1.0, full_resolution=False, region=None):
+    """
+    Render the mesh to a standalone HTML document, cached per view settings.
+
+    Unless full_resolution is set, only the decimated outer surface of each block
+    is exported, keeping the payload bounded for large meshes.
+    """
+    bg_value = 1.0 - bg_darkness
+    bg_color = (bg_value, bg_value, bg_value)
+
+    visualizer = get_openfoam_visualizer(case_path, region)
+
+    plotter = pv.Plotter(off_screen=True)
+    plotter.background_color = bg_color
+
+    edge_color = "black" if bg_darkness < 0.25 else "white"
+
+    try:
+        visualizer.visualize_mesh(
+            plotter=plotter,
+            show_edges=show_mesh,
+            style=style,
+            color_patches=color_patches,
+            show_boundaries=show_boundaries,
+            only_boundaries=only_boundaries,
+            opacity=opacity,
+            edge_color=edge_color,
+            boundary_palette=selected_palette,
+            lod_target=None if full_resolution else visualizer.LOD_TARGET_TRIANGLES,
+        )
+
+        plotter.view_isometric()
+        html_buffer = plotter.export_html(None)
+    finally:
         plotter.close()
+
+    return html_buffer.getvalue()
+
+
+HISTOGRAM_BINS = 40
+
+
+def poly_mesh_dirs(case_path) -> list[Path]:
+    return sorted(path for path in Path(case_path).glob("constant/**/polyMesh") if (path / "boundary").exists())
+
+
+def mesh_regions(case_path) -> list[str]:
+    """Regions with a mesh of their own, "" for constant/polyMesh; regions linked to an earlier mesh are left out."""
+    constant = Path(case_path) / "constant"
+    regions, seen = [], set()
+    for path in poly_mesh_dirs(case_path):
+        if path.resolve() in seen:
+            continue
+        seen.add(path.resolve())
+        regions.append("" if path.parent == constant else path.parent.relative_to(constant).as_posix())
+    return regions
+
+
+@st.cache_data(max_entries=8, show_spinner="Checking mesh quality...")
+def compute_mesh_quality(poly_mesh_dir, signature):
+    """Quality summary and metric histograms of a polyMesh, cached until the mesh files change."""
+    quality = mesh_quality(read_poly_mesh(poly_mesh_dir))
+    histograms = {}
+    for name, values in (
+        ("Non-orthogonality [deg]", quality.non_orthogonality),
+        ("Skewness", quality.skewness),
+        ("Aspect ratio", quality.aspect_ratio),
+        ("Cell volume", quality.cell_volumes),
+    ):
+        counts, edges = np.histogram(values[np.isfinite(values)], bins=HISTOGRAM_BINS)
+        histograms[name] = pd.DataFrame({"count": counts}, index=pd.Index(0.5 * (edges[1:] + edges[:-1]), name=name))
+    return quality.summary(), histograms
+
+
+def show_mesh_quality(case_path):
+    """Show checkMesh-style quality metrics and histograms of the case mesh."""
+    mesh_dirs = poly_mesh_dirs(case_path)
+    if not mesh_dirs:
+        st.info("No polyMesh found.")
         return
 
-    components.html(html_buffer.getvalue(), height=700, scrolling=False)
-    plotter.close()
+    constant = Path(case_path) / "constant"
+    mesh_dir = mesh_dirs[0]
+    if len(mesh_dirs) > 1:
+        mesh_dir = st.selectbox(
+            "Region",
+            mesh_dirs,
+            format_func=lambda path: str(path.parent.relative_to(constant)) if path.parent != constant else "default",
+            key="mesh_quality_region",
+        )
+
+    if not st.toggle("Check mesh quality", key="mesh_quality_toggle"):
+        return
+    try:
+        summary, histograms = compute_mesh_quality(str(mesh_dir), mesh_signature(case_path))
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not read the mesh: {exc}")
+        return
+
+    st.dataframe(
+        pd.DataFrame({"Metric": list(summary), "Value": [f"{value:g}" for value in summary.values()]}),
+        hide_index=True,
+        use_container_width=True,
+    )
+    for name, histogram in histograms.items():
+        st.caption(name)
+        st.bar_chart(histogram, y="count")
+
+
+ZONE_SHAPES = ["box", "cylinder", "polygon"]
+
+DEFAULT_ZONE_LAYERS = pd.DataFrame({"name": pd.Series(dtype=str), "bottom": pd.Series(dtype=str)})
+
+DEFAULT_ZONE_REGIONS = pd.DataFrame({
+    "name": pd.Series(dtype=str), "shape": pd.Series(dtype=str), "values": pd.Series(dtype=str),
+})
+
+
+@st.cache_data(max_entries=2, show_spinner="Computing cell centres...")
+def compute_cell_centres(poly_mesh_dir, signature):
+    return zones.cell_centres(poly_mesh_dir)
+
+
+def render_zone_builder(case_path) -> None:
+    """Assign cells to cellZones by a layer table and boxes, cylinders and polygons, replacing topoSet."""
+    mesh_dirs = poly_mesh_dirs(case_path)
+    if not mesh_dirs:
+        st.info("Load or generate a mesh to build cellZones.")
+        return
+    constant = Path(case_path) / "constant"
+    mesh_dir = mesh_dirs[0]
+    if len(mesh_dirs) > 1:
+        mesh_dir = st.selectbox(
+            "Region",
+            mesh_dirs,
+            format_func=lambda path: str(path.parent.relative_to(constant)) if path.parent != constant else "default",
+            key="zone_builder_region",
+        )
+
+    if (mesh_dir / "cellZones").exists():
+        existing = scan_zones(mesh_dir / "cellZones")
+        st.caption("Current cellZones")
+        st.dataframe(pd.DataFrame({"cellZone": [zone.name for zone in existing], "cells": [zone.size for zone in existing]}),
+                     hide_index=True, use_container_width=True)
+
+    two_dimensional = any(patch.get("type") == "empty" for patch in read_boundary(mesh_dir / "boundary").values())
+    vertical = st.radio("Vertical axis", ["y", "z"], index=0 if two_dimensional else 1, horizontal=True,
+                        key="zone_builder_vertical", help="Axis of the elevations in the layer table")
+
+    st.caption("Layer table from the top down. The bottom horizon is an elevation, a profile \"x z; x z; ...\" "
+               "or scattered points \"x y z; x y z; ...\"; leave it blank for the lowest layer.")
+    layer_table = st.data_editor(DEFAULT_ZONE_LAYERS, num_rows="dynamic", hide_index=True, key="zone_builder_layers",
+                                 use_container_width=True)
+    st.caption("Regions, applied in order after the layers; later regions override earlier ones. "
+               "box: \"xmin ymin zmin xmax ymax zmax\", cylinder: \"x1 y1 z1 x2 y2 z2 radius\", "
+               "polygon in the x-y plane: \"x y; x y; x y; ...\".")
+    region_table = st.data_editor(
+        DEFAULT_ZONE_REGIONS, num_rows="dynamic", hide_index=True, key="zone_builder_regions", use_container_width=True,
+        column_config={"shape": st.column_config.SelectboxColumn(options=ZONE_SHAPES, required=True)},
+    )
+    default = st.text_input("cellZone of unassigned cells", key="zone_builder_default",
+                            help="Leave blank to leave those cells outside every cellZone")
+
+    layer_rows = layer_table.dropna(subset=["name"])
+    region_rows = region_table.dropna(subset=["name", "shape", "values"])
+    if not st.button("Write cellZones", type="primary", key="zone_builder_write",
+                     disabled=layer_rows.empty and region_rows.empty and not default.strip()):
+        return
+    try:
+        layers = [zones.Layer(str(row.name).strip(), zones.parse_horizon(row.bottom))
+                  for row in layer_rows.itertuples(index=False)]
+        rules = [zones.ZoneRule(str(row.name).strip(), zones.parse_region(row.shape, row.values))
+                 for row in region_rows.itertuples(index=False)]
+        centres = compute_cell_centres(str(mesh_dir), mesh_signature(case_path))
+        cell_zones = zones.build_cell_zones(centres, rules, layers, vertical_axis="xyz".index(vertical),
+                                            default=default.strip() or None)
+        zones.write_zones(mesh_dir, cell_zones)
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not build the cellZones: {exc}")
+        return
+    assigned = sum(len(labels) for labels in cell_zones.values())
+    st.success(f"Wrote {len(cell_zones)} cellZones with {assigned:,} of {len(centres):,} cells to {mesh_dir / 'cellZones'}")
+    if assigned < len(centres):
+        st.warning(f"{len(centres) - assigned:,} cells are in no cellZone.")
+    st.dataframe(pd.DataFrame({"cellZone": list(cell_zones), "cells": [len(labels) for labels in cell_zones.values()]}),
+                 hide_index=True, use_container_width=True)
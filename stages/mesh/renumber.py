@@ -0,0 +1,411 @@
+"""
+Bandwidth-reducing renumbering of the cells of a case with reverse Cuthill-McKee.
+
+The cell graph is built from owner/neighbour and traversed level by level,
+so every breadth-first level is ordered with one NumPy sort. The polyMesh,
+the cellZones and the internalField of every volume field are rewritten in
+the new cell order; new files are written next to the old ones and only
+renamed over them once all of them are complete.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import gzip
+import json
+from pathlib import Path
+import re
+
+import numpy as np
+
+from alpha_runtime import list_time_directories, load_run_metadata, run_log_path
+from foam_io import (
+    LIST_COMPONENTS, NON_REGION_DIRS, FieldFile, binary_dtype, binary_list, cell_zones_bytes, foam_header,
+    list_field_files, parse_header, read_mesh_counts,
+)
+from stages.mesh.quality import read_poly_mesh
+
+RENUMBER_RECORD_NAME = ".pmf_renumber.json"
+
+# Iterations of the search for a pseudo-peripheral start cell
+PERIPHERAL_ITERATIONS = 8
+
+# polyMesh files that are rewritten or do not depend on the cell order
+HANDLED_MESH_FILES = {"points", "faces", "owner", "neighbour", "boundary", "cellZones", "pointZones"}
+
+_INTERNAL_FIELD = re.compile(rb"internalField\s+nonuniform\s+List<(\w+)>\s*(\d+)\s*\(")
+_ASCII_ENTRY = re.compile(rb"\(([^()]*)\)")
+_EXECUTION_TIME = re.compile(r"^ExecutionTime\s*=\s*([0-9.eE+-]+)\s*s", re.MULTILINE)
+
+
+def cell_adjacency(owner: np.ndarray, neighbour: np.ndarray, n_cells: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cell graph in compressed sparse row form.
+
+    Returns:
+        (offsets, adjacent) where the neighbours of cell i are ``adjacent[offsets[i]:offsets[i + 1]]``
+    """
+    internal_owner = np.asarray(owner[:len(neighbour)], dtype=np.int64)
+    neighbour = np.asarray(neighbour, dtype=np.int64)
+    rows = np.concatenate([internal_owner, neighbour])
+    columns = np.concatenate([neighbour, internal_owner])
+    order = np.argsort(rows, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_cells))])
+    return offsets, columns[order]
+
+
+def bandwidth(owner: np.ndarray, neighbour: np.ndarray) -> int:
+    """Largest label distance of two face-neighbouring cells, the half-bandwidth of the matrix."""
+    if not len(neighbour):
+        return 0
+    return int(np.abs(np.asarray(neighbour, dtype=np.int64) - owner[:len(neighbour)]).max())
+
+
+def _neighbours_of(cells: np.ndarray, offsets: np.ndarray, adjacent: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """All neighbours of ``cells`` and the position in ``cells`` each was reached from."""
+    counts = offsets[cells + 1] - offsets[cells]
+    position = np.repeat(np.arange(len(cells)), counts)
+    index = np.repeat(offsets[cells] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    return adjacent[index], position
+
+
+def _levels(start: int, offsets: np.ndarray, adjacent: np.ndarray, n_cells: int) -> list[np.ndarray]:
+    """Breadth-first level structure rooted at ``start``."""
+    visited = np.zeros(n_cells, dtype=bool)
+    visited[start] = True
+    levels = [np.array([start])]
+    while True:
+        reached, _ = _neighbours_of(levels[-1], offsets, adjacent)
+        reached = np.unique(reached[~visited[reached]])
+        if not len(reached):
+            return levels
+        visited[reached] = True
+        levels.append(reached)
+
+
+def _peripheral_cell(start: int, offsets: np.ndarray, adjacent: np.ndarray, degree: np.ndarray, n_cells: int) -> int:
+    """Pseudo-peripheral cell of the component of ``start`` (George and Liu)."""
+    levels = _levels(start, offsets, adjacent, n_cells)
+    for _ in range(PERIPHERAL_ITERATIONS):
+        last = levels[-1]
+        candidate = int(last[np.argmin(degree[last])])
+        candidate_levels = _levels(candidate, offsets, adjacent, n_cells)
+        if len(candidate_levels) <= len(levels):
+            break
+        start, levels = candidate, candidate_levels
+    return start
+
+
+def reverse_cuthill_mckee(owner: np.ndarray, neighbour: np.ndarray, n_cells: int) -> np.ndarray:
+    """
+    Reverse Cuthill-McKee ordering of the cells.
+
+    Every connected component starts from a pseudo-peripheral cell. Within a
+    breadth-first level, cells follow the order of the cell they were first
+    reached from and then increasing degree, as in Cuthill-McKee.
+
+    Returns:
+        The old label of every new cell, so ``values[order]`` renumbers a cell field
+    """
+    offsets, adjacent = cell_adjacency(owner, neighbour, n_cells)
+    degree = np.diff(offsets)
+    visited = np.zeros(n_cells, dtype=bool)
+    order = np.empty(n_cells, dtype=np.int64)
+    done = 0
+    by_degree = np.argsort(degree, kind="stable")
+    next_start = 0
+    while done < n_cells:
+        while visited[by_degree[next_start]]:
+            next_start += 1
+        start = _peripheral_cell(int(by_degree[next_start]), offsets, adjacent, degree, n_cells)
+        frontier = np.array([start])
+        visited[start] = True
+        while len(frontier):
+            order[done:done + len(frontier)] = frontier
+            done += len(frontier)
+            reached, position = _neighbours_of(frontier, offsets, adjacent)
+            unvisited = ~visited[reached]
+            reached, position = reached[unvisited], position[unvisited]
+            # Sort by the position of the parent, then by degree; keep the first time every cell is reached
+            reached = reached[np.lexsort((reached, degree[reached], position))]
+            _, first = np.unique(reached, return_index=True)
+            frontier = reached[np.sort(first)]
+            visited[frontier] = True
+    return order[::-1].copy()
+
+
+@dataclass
+class RenumberedMesh:
+    face_offsets: np.ndarray
+    face_points: np.ndarray
+    owner: np.ndarray
+    neighbour: np.ndarray
+    cell_zones: dict[str, np.ndarray]
+
+
+def renumber_cells(face_offsets: np.ndarray, face_points: np.ndarray, owner: np.ndarray, neighbour: np.ndarray,
+                   cell_zones: dict[str, np.ndarray], order: np.ndarray) -> RenumberedMesh:
+    """
+    Apply a cell order to the faces, owner, neighbour and cellZones of a mesh.
+
+    Internal faces whose new owner is above the new neighbour are flipped, and
+    the internal faces are sorted into upper-triangular order again. Boundary
+    faces keep their order, so the patches are unchanged.
+
+    Parameters:
+        order: Old label of every new cell
+    """
+    n_internal = len(neighbour)
+    new_label = np.empty(len(order), dtype=np.int64)
+    new_label[order] = np.arange(len(order))
+    owner, neighbour = new_label[owner], new_label[neighbour]
+
+    flip = np.zeros(len(owner), dtype=bool)
+    flip[:n_internal] = owner[:n_internal] > neighbour
+    internal_owner = np.where(flip[:n_internal], neighbour, owner[:n_internal])
+    neighbour = np.where(flip[:n_internal], owner[:n_internal], neighbour)
+    face_order = np.concatenate([np.lexsort((neighbour, internal_owner)), np.arange(n_internal, len(owner))])
+    owner = np.concatenate([internal_owner, owner[n_internal:]])[face_order]
+    neighbour = neighbour[face_order[:n_internal]]
+
+    # Flipped faces keep their first point and reverse the others, as face::reverseFace
+    sizes = np.diff(face_offsets)
+    new_sizes = sizes[face_order]
+    new_offsets = np.concatenate([[0], np.cumsum(new_sizes)])
+    local = np.arange(new_offsets[-1]) - np.repeat(new_offsets[:-1], new_sizes)
+    repeated_sizes = np.repeat(new_sizes, new_sizes)
+    local = np.where(np.repeat(flip[face_order], new_sizes), (repeated_sizes - local) % repeated_sizes, local)
+    face_points = face_points[np.repeat(face_offsets[face_order], new_sizes) + local]
+
+    zones = {name: np.sort(new_label[labels]) for name, labels in cell_zones.items()}
+    return RenumberedMesh(new_offsets, face_points, owner, neighbour, zones)
+
+
+def _renumbered_field(content: bytes, order: np.ndarray) -> bytes | None:
+    """Field file content with the internalField in the new cell order, or None for uniform fields."""
+    match = _INTERNAL_FIELD.search(content)
+    if match is None:
+        return None
+    count = int(match.group(2))
+    if count != len(order):
+        raise ValueError(f"The internalField has {count} values for {len(order)} cells")
+    n_components = LIST_COMPONENTS.get(match.group(1).decode("ascii"), 1)
+    header = parse_header(content)
+    if header.get("format") == "binary":
+        dtype = binary_dtype(header)
+        values = np.frombuffer(content, dtype=dtype, count=count * n_components, offset=match.end())
+        payload = values.reshape(count, n_components)[order].tobytes()
+        return content[:match.end()] + payload + content[match.end() + values.nbytes:]
+
+    # ASCII values are moved as they are written, so no digits change
+    if n_components == 1:
+        end = content.index(b")", match.end())
+        entries = content[match.end():end].split()
+        body = b"\n".join(entries[index] for index in order)
+    else:
+        end = re.compile(rb"\)\s*\)").search(content, match.end()).start() + 1
+        entries = _ASCII_ENTRY.findall(content, match.end(), end)
+        body = b"\n".join(b"(" + entries[index] + b")" for index in order)
+    return content[:match.end()] + b"\n" + body + b"\n" + content[end:]
+
+
+@dataclass
+class RenumberResult:
+    regions: list[str]
+    n_cells: int
+    bandwidth_before: int
+    bandwidth_after: int
+    fields: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+
+def _shared_meshes(case_dir: Path) -> dict[Path, list[str]]:
+    """The regions of every mesh; regions whose polyMesh links to the same directory share one mesh."""
+    constant = case_dir / "constant"
+    meshes: dict[Path, list[str]] = {}
+    for path in sorted(constant.glob("**/polyMesh")):
+        if (path / "boundary").exists():
+            meshes.setdefault(path.resolve(), []).append("" if path.parent == constant else path.parent.name)
+    return meshes
+
+
+def _staged(path: Path, content: bytes, staged: list[tuple[Path, Path]]) -> None:
+    tmp_path = path.with_name(f".{path.name}.renumber.tmp")
+    tmp_path.write_bytes(content)
+    staged.append((tmp_path, path))
+
+
+def _head(path: Path, size: int = 2048) -> bytes:
+    """Start of a file, decompressed for ``.gz`` files (writeCompression on)."""
+    try:
+        with (gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")) as handle:
+            return handle.read(size)
+    except (OSError, EOFError):
+        return b""
+
+
+def _is_surface_field(path: Path) -> bool:
+    return re.search(rb"class\s+surface\w*Field", _head(path)) is not None
+
+
+def _compressed_field_files(case_dir: Path) -> list[FieldFile]:
+    """Gzipped volume fields of all time directories, which ``list_field_files`` does not read."""
+    field_files = []
+    for time_name in list_time_directories(case_dir):
+        time_dir = case_dir / time_name
+        paths = [(path, "") for path in time_dir.glob("*.gz")] + [
+            (path, child.name) for child in time_dir.iterdir()
+            if child.is_dir() and child.name not in NON_REGION_DIRS for path in child.glob("*.gz")
+        ]
+        for path, region in sorted(paths):
+            head = _head(path)
+            if b"FoamFile" in head and re.search(rb"class\s+vol\w*Field", head):
+                field_files.append(FieldFile(time_name, region, path.name.removesuffix(".gz"), path))
+    return field_files
+
+
+def renumber_case(case_dir: Path | str) -> list[RenumberResult]:
+    """
+    Renumber the cells of every mesh of a case with reverse Cuthill-McKee.
+
+    Regions whose polyMesh is a link to another region's share its order, and
+    the fields of all of them are reordered.
+
+    Faces, owner, neighbour and cellZones are rewritten in binary; points and
+    boundary stay as they are. Volume fields in all time directories, plain or
+    gzipped, get their internalField reordered. Surface fields, faceZones and decomposed cases
+    depend on the face order and are refused before anything is written.
+
+    Returns:
+        Bandwidth before and after, the rewritten fields and the polyMesh files left unchanged, per mesh
+        with the regions that share it
+    """
+    case_dir = Path(case_dir)
+    if any(case_dir.glob("processor*")):
+        raise ValueError("Decomposed cases cannot be renumbered; reconstruct the case first")
+    surface_fields = [path for path in case_dir.glob("[0-9]*/**/*") if path.is_file() and _is_surface_field(path)]
+    if surface_fields:
+        raise ValueError(f"Surface fields depend on the face order: {', '.join(map(str, surface_fields[:3]))}")
+    field_files = list_field_files(case_dir) + _compressed_field_files(case_dir)
+
+    staged: list[tuple[Path, Path]] = []
+    results = []
+    try:
+        for poly_mesh_dir, regions in _shared_meshes(case_dir).items():
+            face_zones = poly_mesh_dir / "faceZones"
+            if face_zones.exists() and re.search(rb"\bfaceLabels\s+List<label>\s*[1-9]", face_zones.read_bytes()):
+                raise ValueError(f"faceZones depend on the face order: {face_zones}")
+            mesh = read_poly_mesh(poly_mesh_dir)
+            order = reverse_cuthill_mckee(mesh.owner, mesh.neighbour, mesh.n_cells)
+            renumbered = renumber_cells(mesh.face_offsets, mesh.face_points, mesh.owner, mesh.neighbour,
+                                        mesh.cell_zones, order)
+            result = RenumberResult(regions, mesh.n_cells, bandwidth(mesh.owner, mesh.neighbour),
+                                    bandwidth(renumbered.owner, renumbered.neighbour))
+            results.append(result)
+            if result.bandwidth_after >= result.bandwidth_before:
+                # Already well ordered; the mesh and its fields stay as they are
+                continue
+
+            parent = poly_mesh_dir.parent.name
+            location = "constant/polyMesh" if parent == "constant" else f"constant/{parent}/polyMesh"
+            counts = read_mesh_counts(poly_mesh_dir) or {
+                "nPoints": len(mesh.points), "nCells": mesh.n_cells, "nFaces": mesh.n_faces,
+                "nInternalFaces": mesh.n_internal_faces,
+            }
+            note = "  ".join(f"{key}:{value}" for key, value in counts.items())
+            _staged(poly_mesh_dir / "faces", foam_header("faceCompactList", "faces", location)
+                    + binary_list(renumbered.face_offsets, "label") + b"\n"
+                    + binary_list(renumbered.face_points, "label"), staged)
+            _staged(poly_mesh_dir / "owner", foam_header("labelList", "owner", location, note=note)
+                    + binary_list(renumbered.owner, "label"), staged)
+            _staged(poly_mesh_dir / "neighbour", foam_header("labelList", "neighbour", location, note=note)
+                    + binary_list(renumbered.neighbour, "label"), staged)
+            if renumbered.cell_zones:
+                _staged(poly_mesh_dir / "cellZones", cell_zones_bytes(renumbered.cell_zones, location), staged)
+
+            result.skipped = sorted(
+                path.relative_to(poly_mesh_dir).as_posix() for path in poly_mesh_dir.rglob("*")
+                if path.is_file() and path.name.removesuffix(".gz") not in HANDLED_MESH_FILES
+                and not path.name.endswith(".renumber.tmp")
+            )
+            for field_file in field_files:
+                if field_file.region not in regions:
+                    continue
+                compressed = field_file.path.suffix == ".gz"
+                content = field_file.path.read_bytes()
+                content = _renumbered_field(gzip.decompress(content) if compressed else content, order)
+                if content is not None:
+                    _staged(field_file.path, gzip.compress(content) if compressed else content, staged)
+                    result.fields.append("/".join(filter(None, (field_file.time, field_file.region, field_file.field))))
+    except BaseException:
+        for tmp_path, _ in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+    for tmp_path, path in staged:
+        tmp_path.replace(path)
+        # The rewritten file takes the place of a compressed one
+        path.with_name(path.name + ".gz").unlink(missing_ok=True)
+    return results
+
+
+def solver_step_times(log_path: Path | str | None) -> np.ndarray:
+    """CPU time of every time step of a solver log, from its ExecutionTime lines."""
+    if log_path is None or not Path(log_path).exists():
+        return np.empty(0)
+    # Differences of the cumulative times; the start-up before the first step is left out
+    return np.diff(np.array(_EXECUTION_TIME.findall(Path(log_path).read_text(encoding="utf-8", errors="replace")),
+                            dtype=float))
+
+
+def _mean(values: np.ndarray) -> float | None:
+    return float(values.mean()) if len(values) else None
+
+
+def record_renumbering(case_dir: Path | str, results: list[RenumberResult]) -> dict | None:
+    """
+    Save the bandwidths and the mean step time of the last run before renumbering.
+
+    The record is kept in ``.pmf_renumber.json`` next to the run metadata. It is
+    left as it is when no mesh was changed, so the comparison keeps referring to
+    the last renumbering that did.
+
+    Returns:
+        The new record, or None if nothing was renumbered
+    """
+    case_dir = Path(case_dir)
+    if not any(result.bandwidth_after < result.bandwidth_before for result in results):
+        return None
+    run = load_run_metadata(case_dir)
+    record = {
+        "renumbered_at": datetime.now(timezone.utc).isoformat(),
+        "regions": {", ".join(region or "default" for region in result.regions): [result.bandwidth_before,
+                                                                                  result.bandwidth_after]
+                    for result in results},
+        "step_time_before": _mean(solver_step_times(run_log_path(case_dir))),
+        "run_before": run.get("started_at"),
+    }
+    (case_dir / RENUMBER_RECORD_NAME).write_text(json.dumps(record, indent=2), encoding="utf-8")
+    return record
+
+
+def load_renumber_record(case_dir: Path | str) -> dict | None:
+    path = Path(case_dir) / RENUMBER_RECORD_NAME
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def step_time_comparison(case_dir: Path | str) -> dict[str, float | None]:
+    """
+    Mean solver step time of the last run before and the latest run after renumbering.
+
+    "after" stays None until a run started after the renumbering has written steps.
+    """
+    record = load_renumber_record(case_dir) or {}
+    run = load_run_metadata(case_dir)
+    after = None
+    if record.get("renumbered_at") and (run.get("started_at") or "") > record["renumbered_at"]:
+        after = _mean(solver_step_times(run_log_path(case_dir)))
+    return {"before": record.get("step_time_before"), "after": after}
@@ -0,0 +1,289 @@
+"""
+Geometric assignment of cells to cellZones, as an in-app replacement for topoSet.
+
+Cells are selected by the position of their centres: inside a box, a
+cylinder or a polygon, or between the horizons of a layer table. All tests are
+vectorised over the cell centres; polygons are split into horizontal bands so
+that every centre is only tested against the edges of its band.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import re
+
+import numpy as np
+
+from foam_io import write_cell_zones
+from stages.mesh.quality import mesh_geometry, read_poly_mesh
+
+# Number of centre-edge pairs tested at once in the point-in-polygon test
+PAIR_BLOCK = 4_000_000
+
+# Number of centre-point pairs evaluated at once when interpolating scattered horizons
+IDW_BLOCK = 4_000_000
+
+
+@dataclass(frozen=True)
+class BoxRegion:
+    minimum: tuple[float, float, float]
+    maximum: tuple[float, float, float]
+
+    def contains(self, centres: np.ndarray) -> np.ndarray:
+        return np.all((centres >= self.minimum) & (centres <= self.maximum), axis=1)
+
+
+@dataclass(frozen=True)
+class CylinderRegion:
+    """Cylinder around the axis from ``start`` to ``end``, closed by flat caps."""
+
+    start: tuple[float, float, float]
+    end: tuple[float, float, float]
+    radius: float
+
+    def contains(self, centres: np.ndarray) -> np.ndarray:
+        start, axis = np.asarray(self.start, dtype=float), np.subtract(self.end, self.start, dtype=float)
+        length_squared = axis @ axis
+        if length_squared == 0:
+            raise ValueError("The cylinder axis has zero length")
+        relative = centres - start
+        along = relative @ axis / length_squared
+        radial = relative - along[:, None] * axis
+        return (along >= 0) & (along <= 1) & (np.einsum("ij,ij->i", radial, radial) <= self.radius ** 2)
+
+
+@dataclass(frozen=True)
+class PolygonRegion:
+    """
+    Polygon in the plane of two coordinate axes, extruded along the third.
+
+    The default plane x-y is the plane of 2D meshes; overlapping rings follow
+    the even-odd rule, so a second ring inside the first cuts a hole.
+    """
+
+    vertices: tuple[tuple[float, float], ...]
+    axes: tuple[int, int] = (0, 1)
+
+    def contains(self, centres: np.ndarray) -> np.ndarray:
+        return points_in_polygon(centres[:, list(self.axes)], np.asarray(self.vertices, dtype=float))
+
+
+def _crossings(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Whether a ray from every point towards +x crosses the given edges an odd number of times."""
+    inside = np.zeros(len(points), dtype=bool)
+    if not len(points) or not len(starts):
+        return inside
+    block = max(1, PAIR_BLOCK // len(starts))
+    x0, y0, x1, y1 = starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1]
+    slope = np.divide(x1 - x0, y1 - y0, out=np.zeros_like(x0), where=y1 != y0)
+    for first in range(0, len(points), block):
+        x, y = points[first:first + block, :1], points[first:first + block, 1:]
+        straddles = (y0 > y) != (y1 > y)
+        crosses = straddles & (x < x0 + (y - y0) * slope)
+        inside[first:first + block] = np.count_nonzero(crosses, axis=1) % 2 == 1
+    return inside
+
+
+def points_in_polygon(points: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    """
+    Even-odd point-in-polygon test of many points.
+
+    The polygon is split into about sqrt(n_edges) horizontal bands, and the
+    points of every band are only tested against the edges that reach into it.
+
+    Parameters:
+        points: Array of shape (n, 2)
+        vertices: Polygon vertices of shape (m, 2); the polygon is closed implicitly
+
+    Returns:
+        Boolean mask of the points inside
+    """
+    points = np.asarray(points, dtype=float)
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    if len(vertices) > 3 and np.array_equal(vertices[0], vertices[-1]):
+        vertices = vertices[:-1]
+    if len(vertices) < 3:
+        raise ValueError("A polygon needs at least three vertices")
+    inside = np.zeros(len(points), dtype=bool)
+    low, high = vertices.min(axis=0), vertices.max(axis=0)
+    candidates = np.flatnonzero(np.all((points >= low) & (points <= high), axis=1))
+    if not len(candidates):
+        return inside
+
+    starts, ends = vertices, np.roll(vertices, -1, axis=0)
+    edge_low, edge_high = np.minimum(starts[:, 1], ends[:, 1]), np.maximum(starts[:, 1], ends[:, 1])
+    n_bands = max(1, int(np.sqrt(len(vertices))))
+    height = (high[1] - low[1]) / n_bands or 1.0
+    band = np.minimum(((points[candidates, 1] - low[1]) / height).astype(np.int64), n_bands - 1)
+    order = np.argsort(band, kind="stable")
+    bounds = np.searchsorted(band[order], np.arange(n_bands + 1))
+    for index in range(n_bands):
+        members = candidates[order[bounds[index]:bounds[index + 1]]]
+        if not len(members):
+            continue
+        bottom, top = low[1] + index * height, low[1] + (index + 1) * height
+        edges = np.flatnonzero((edge_high >= bottom) & (edge_low <= top))
+        inside[members] = _crossings(points[members], starts[edges], ends[edges])
+    return inside
+
+
+@dataclass(frozen=True)
+class Horizon:
+    """
+    Elevation of a layer boundary: flat, a profile (x, elevation) or scattered points (x, y, elevation).
+
+    Profiles are interpolated linearly and held constant beyond their ends;
+    scattered points are interpolated by inverse distance weighting.
+    """
+
+    points: tuple[tuple[float, ...], ...] | float
+
+    def elevation(self, centres: np.ndarray) -> np.ndarray:
+        points = np.asarray(self.points, dtype=float)
+        if points.ndim == 0 or points.size == 1:
+            return np.full(len(centres), float(points.ravel()[0]))
+        if points.shape[1] == 2:
+            order = np.argsort(points[:, 0])
+            return np.interp(centres[:, 0], points[order, 0], points[order, 1])
+        if points.shape[1] == 3:
+            return _inverse_distance(centres[:, :2], points[:, :2], points[:, 2])
+        raise ValueError("Horizon points need (x, elevation) or (x, y, elevation) values")
+
+
+def _inverse_distance(targets: np.ndarray, sources: np.ndarray, values: np.ndarray, power: float = 2.0) -> np.ndarray:
+    result = np.empty(len(targets))
+    block = max(1, IDW_BLOCK // len(sources))
+    for first in range(0, len(targets), block):
+        difference = targets[first:first + block, None, :] - sources[None, :, :]
+        distance_squared = np.einsum("ijk,ijk->ij", difference, difference)
+        exact = distance_squared == 0
+        weights = 1.0 / np.where(exact, 1.0, distance_squared) ** (power / 2)
+        weights[exact.any(axis=1)] = exact[exact.any(axis=1)]
+        result[first:first + block] = weights @ values / weights.sum(axis=1)
+    return result
+
+
+@dataclass(frozen=True)
+class Layer:
+    """A layer of the layer table, above its bottom horizon; the lowest layer has no bottom."""
+
+    name: str
+    bottom: Horizon | None = None
+
+
+@dataclass(frozen=True)
+class ZoneRule:
+    name: str
+    region: BoxRegion | CylinderRegion | PolygonRegion
+
+
+def assign_layers(centres: np.ndarray, layers: list[Layer], vertical_axis: int = 2) -> np.ndarray:
+    """
+    Index of the layer of every cell centre, for layers listed from the top down.
+
+    A cell belongs to the highest layer whose bottom horizon is at or below its
+    centre; cells below all horizons belong to the lowest layer.
+    """
+    if not layers:
+        return np.full(len(centres), -1, dtype=np.int64)
+    horizontal = np.delete(centres, vertical_axis, axis=1)
+    heights = centres[:, vertical_axis]
+    labels = np.full(len(centres), len(layers) - 1, dtype=np.int64)
+    for index in range(len(layers) - 2, -1, -1):
+        bottom = layers[index].bottom
+        if bottom is None:
+            raise ValueError(f"Layer {layers[index].name} needs a bottom horizon")
+        labels[heights >= bottom.elevation(horizontal)] = index
+    return labels
+
+
+def build_cell_zones(centres: np.ndarray, rules: list[ZoneRule], layers: list[Layer] | None = None,
+                     vertical_axis: int = 2, default: str | None = None) -> dict[str, np.ndarray]:
+    """
+    Cell labels of every zone from a layer table and geometric rules.
+
+    Layers are assigned first; every rule then takes the cells inside its region,
+    so later rules override earlier ones and every cell is in at most one zone.
+
+    Parameters:
+        centres: Cell centres of shape (n_cells, 3)
+        rules: Zones by region, applied in order
+        layers: Layer table from the top down
+        vertical_axis: Axis of the elevations of the layer table, 1 for 2D meshes in the x-y plane
+        default: Zone of the cells no layer or rule assigns
+
+    Returns:
+        Sorted cell labels by zone name, in the order layers, rules, default
+    """
+    centres = np.asarray(centres, dtype=float)
+    layers = layers or []
+    names = [layer.name for layer in layers]
+    labels = assign_layers(centres, layers, vertical_axis)
+    for rule in rules:
+        if rule.name not in names:
+            names.append(rule.name)
+        labels[rule.region.contains(centres)] = names.index(rule.name)
+    if default is not None:
+        if default not in names:
+            names.append(default)
+        labels[labels < 0] = names.index(default)
+
+    invalid = [name for name in names if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_.:-]*", name)]
+    if invalid:
+        raise ValueError(f"Zone names must be valid OpenFOAM words: {', '.join(invalid)}")
+    # Group the cells by zone with one sort instead of one scan per zone
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(len(names) + 1))
+    return {name: order[bounds[index]:bounds[index + 1]] for index, name in enumerate(names)}
+
+
+def cell_centres(poly_mesh_dir: Path | str) -> np.ndarray:
+    return mesh_geometry(read_poly_mesh(poly_mesh_dir)).cell_centres
+
+
+def write_zones(poly_mesh_dir: Path | str, cell_zones: dict[str, np.ndarray]) -> None:
+    """Replace the cellZones of a mesh."""
+    poly_mesh_dir = Path(poly_mesh_dir)
+    location = "constant/polyMesh" if poly_mesh_dir.parent.name == "constant" else \
+        f"constant/{poly_mesh_dir.parent.name}/polyMesh"
+    write_cell_zones(poly_mesh_dir / "cellZones", cell_zones, location)
+
+
+def parse_numbers(text: str) -> np.ndarray:
+    """Numbers of a table cell, e.g. "0 0 0 1 1 1" or "0 5; 10 4.5", as rows of the ";"-separated groups."""
+    rows = [row.replace(",", " ").split() for row in str(text).split(";") if row.strip()]
+    if not rows or len({len(row) for row in rows}) != 1:
+        raise ValueError(f"Cannot read the numbers {text!r}")
+    try:
+        return np.array(rows, dtype=float)
+    except ValueError as exc:
+        raise ValueError(f"Cannot read the numbers {text!r}") from exc
+
+
+def parse_region(shape: str, text: str, plane: tuple[int, int] = (0, 1)) -> BoxRegion | CylinderRegion | PolygonRegion:
+    """
+    Region from a shape name and its numbers:
+
+    - box: "xmin ymin zmin xmax ymax zmax"
+    - cylinder: "x1 y1 z1 x2 y2 z2 radius"
+    - polygon: "x y; x y; x y; ..." in ``plane``
+    """
+    numbers = parse_numbers(text)
+    if shape == "polygon":
+        return PolygonRegion(tuple(map(tuple, numbers.reshape(-1, 2))), plane)
+    values = numbers.ravel()
+    if shape == "box" and len(values) == 6:
+        return BoxRegion(tuple(np.minimum(values[:3], values[3:])), tuple(np.maximum(values[:3], values[3:])))
+    if shape == "cylinder" and len(values) == 7:
+        return CylinderRegion(tuple(values[:3]), tuple(values[3:6]), float(values[6]))
+    raise ValueError(f"A {shape} needs {'6' if shape == 'box' else '7'} numbers, got {len(values)}")
+
+
+def parse_horizon(text) -> Horizon | None:
+    """Horizon from a table cell: blank, one elevation, "x z; x z" or "x y z; x y z"."""
+    if text is None or (isinstance(text, float) and np.isnan(text)) or not str(text).strip():
+        return None
+    numbers = parse_numbers(text)
+    if numbers.size == 1:
+        return Horizon(float(numbers[0, 0]))
+    return Horizon(tuple(map(tuple, numbers)))
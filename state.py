@@ -53,6 +53,7 @@ def initialize_state():
         vis["show_boundaries"] = True
         vis["only_boundaries"] = True
         vis["opacity"] = 1.0
+        vis["full_resolution"] = False
         vis['available_regions'] = ['solid', 'poroFluid']
 #Access
 def get_case():
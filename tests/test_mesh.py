@@ -0,0 +1,730 @@
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+import zipfile
+
+import numpy as np
+
+from benchmarks.synthetic import write_synthetic_case
+from foam_io import ZoneSummary, read_cell_zones, read_internal_field, scan_zones, write_binary_field
+from stages.mesh.archive import import_mesh_archive
+from stages.mesh.cache import cached_mesh_build, mesh_cache_key, mesh_input_files
+from stages.mesh.edge_validation import validate_edge_dict
+from stages.mesh.geometry_import import douglas_peucker, polylines_to_edge_dict, read_polylines
+from stages.mesh.make2D import edgesToRibbonFMS, write_ribbon_fms
+from stages.mesh.quality import Patch, PolyMesh, mesh_geometry, mesh_quality, read_poly_mesh
+from stages.mesh.structured import Layer, graded_coordinates, hex_mesh, layered_mesh, write_poly_mesh
+from stages.mesh import zones
+from trame_viewer import TRAME_PUBLIC_URL_ENV, viewer_url
+from stages.mesh.renumber import (
+    bandwidth, load_renumber_record, record_renumbering, renumber_case, renumber_cells, reverse_cuthill_mckee,
+    solver_step_times,
+)
+
+
+def write_ascii_poly_mesh(poly_mesh_dir: Path, points, faces, owner, neighbour, patches) -> None:
+    poly_mesh_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(name: str, cls: str, body: str) -> None:
+        (poly_mesh_dir / name).write_text(
+            f"FoamFile\n{{\n    version 2.0;\n    format ascii;\n    class {cls};\n    object {name};\n}}\n{body}",
+            encoding="utf-8",
+        )
+
+    write("points", "vectorField", f"{len(points)}\n(\n" + "\n".join(f"({x} {y} {z})" for x, y, z in points) + "\n)\n")
+    write("faces", "faceList", f"{len(faces)}\n(\n" + "\n".join(f"{len(face)}({' '.join(map(str, face))})" for face in faces) + "\n)\n")
+    write("owner", "labelList", f"{len(owner)}\n(\n" + "\n".join(map(str, owner)) + "\n)\n")
+    write("neighbour", "labelList", f"{len(neighbour)}\n(\n" + "\n".join(map(str, neighbour)) + "\n)\n")
+    entries = "".join(f"    {name}\n    {{\n        type patch;\n        nFaces {size};\n        startFace {start};\n    }}\n"
+                      for name, (start, size) in patches.items())
+    write("boundary", "polyBoundaryMesh", f"{len(patches)}\n(\n{entries})\n")
+
+
+def faces_of(mesh: PolyMesh, cells: np.ndarray) -> np.ndarray:
+    """Point labels of all faces owned by the given cells."""
+    faces = mesh.face_points.reshape(-1, 4)[:len(mesh.owner)]
+    return faces[np.isin(mesh.owner, cells)].ravel()
+
+
+def legacy_edges_to_ribbon_fms(input_dict):
+    """The dictionary-based ribbon generator the vectorised one replaces, for equivalence tests."""
+    output_vertices = []
+    vertex_to_index_map = {}
+    output_faces = []
+    edge_to_patch_map = {}
+    for patch_index, patch_data in enumerate(input_dict["boundary"].values()):
+        for edge_index in patch_data["edges"]:
+            edge_to_patch_map[edge_index] = patch_index
+
+    for edge_index, (u_index, v_index) in enumerate(input_dict["edges"]):
+        v_u = input_dict["vertices"][u_index]
+        v_v = input_dict["vertices"][v_index]
+        global_indices = []
+        for vertex_coords in (tuple(v_u + [0.0]), tuple(v_v + [0.0]), tuple(v_u + [0.1]), tuple(v_v + [0.1])):
+            if vertex_coords not in vertex_to_index_map:
+                vertex_to_index_map[vertex_coords] = len(output_vertices)
+                output_vertices.append(vertex_coords)
+            global_indices.append(vertex_to_index_map[vertex_coords])
+        v_idx_1, v_idx_2, v_idx_3, v_idx_4 = global_indices
+        patch_index = edge_to_patch_map[edge_index]
+        output_faces.append(((v_idx_2, v_idx_1, v_idx_3), patch_index))
+        output_faces.append(((v_idx_2, v_idx_3, v_idx_4), patch_index))
+
+    lines = [str(len(input_dict["boundary"])), "("]
+    lines += [f"{name} {info['type']}" for name, info in input_dict["boundary"].items()]
+    lines.append(")")
+    lines.append(f"{len(output_vertices)}( " + " ".join(str(v).replace(",", "") for v in output_vertices) + " )")
+    lines.append(f"{len(output_faces)}( " + " ".join(f"(({f[0]} {f[1]} {f[2]}) {p})" for f, p in output_faces) + " )")
+    lines += ["0()"] * 4
+    return "\n".join(lines)
+
+
+class PolyMeshReaderTests(unittest.TestCase):
+    def test_ascii_and_binary_meshes_read_identically(self):
+        points, faces, owner, neighbour, patches = hex_mesh(3, 2, 4, size=(3.0, 1.0, 1.0))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_ascii_poly_mesh(Path(tmpdir) / "ascii", points, faces, owner, neighbour, patches)
+            write_poly_mesh(Path(tmpdir) / "binary", points, faces, owner, neighbour, patches, {"all": np.arange(24)})
+            ascii_mesh = read_poly_mesh(Path(tmpdir) / "ascii")
+            binary_mesh = read_poly_mesh(Path(tmpdir) / "binary")
+
+        for mesh in (ascii_mesh, binary_mesh):
+            np.testing.assert_allclose(mesh.points, points)
+            np.testing.assert_array_equal(mesh.face_points, faces.ravel())
+            np.testing.assert_array_equal(mesh.face_offsets, np.arange(len(faces) + 1) * 4)
+            np.testing.assert_array_equal(mesh.owner, owner)
+            np.testing.assert_array_equal(mesh.neighbour, neighbour)
+            self.assertEqual(mesh.n_cells, 24)
+            self.assertEqual([(patch.name, patch.start, patch.size) for patch in mesh.patches],
+                             [(name, start, size) for name, (start, size) in patches.items()])
+        np.testing.assert_array_equal(binary_mesh.cell_zones["all"], np.arange(24))
+
+
+class MeshQualityTests(unittest.TestCase):
+    def test_stretched_box_metrics(self):
+        points, faces, owner, neighbour, patches = hex_mesh(4, 4, 2, size=(1.0, 1.0, 2.0))
+        mesh = PolyMesh(points, np.arange(len(faces) + 1) * 4, faces.ravel(), owner, neighbour,
+                        [Patch(name, "patch", start, size) for name, (start, size) in patches.items()], n_cells=32)
+        quality = mesh_quality(mesh)
+
+        np.testing.assert_allclose(quality.cell_volumes, 1.0 / 16.0)
+        np.testing.assert_allclose(quality.non_orthogonality, 0.0, atol=1e-6)
+        np.testing.assert_allclose(quality.skewness, 0.0, atol=1e-9)
+        np.testing.assert_allclose(quality.aspect_ratio, 4.0)
+
+        # Shearing the top layer of points skews the mesh
+        sheared = points.copy()
+        sheared[np.isclose(points[:, 2], 2.0), 0] += 0.5
+        quality = mesh_quality(PolyMesh(sheared, mesh.face_offsets, mesh.face_points, owner, neighbour,
+                                        mesh.patches, n_cells=32))
+        self.assertGreater(quality.non_orthogonality.max(), 10.0)
+        self.assertGreater(quality.skewness.max(), 0.05)
+        self.assertAlmostEqual(quality.cell_volumes.sum(), 2.0)
+
+    def test_skewness_follows_check_mesh(self):
+        # An internal face in x = 0 and a boundary face in x = -1, both unit squares, with
+        # cell centres 0.3 below the face centres: sv = (0, 0.3, 0) and the face extends
+        # 0.5 in that direction, which beats 0.2 |d| = 0.2 and 0.4 |d| = 0.2
+        points = np.array([[0, 0, 0], [0, 1, 0], [0, 1, 1], [0, 0, 1],
+                           [-1, 0, 0], [-1, 0, 1], [-1, 1, 1], [-1, 1, 0]], dtype=float)
+        mesh = PolyMesh(points, np.array([0, 4, 8]), np.arange(8), np.array([0, 0]), np.array([1]),
+                        [Patch("left", "patch", 1, 1)], n_cells=2)
+        geometry = mesh_geometry(mesh)
+        geometry.cell_centres = np.array([[-0.5, 0.2, 0.5], [0.5, 0.2, 0.5]])
+        np.testing.assert_allclose(mesh_quality(mesh, geometry).skewness, [0.6, 0.6])
+
+    def test_mixed_faces_give_pyramid_volume_and_centre(self):
+        points = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 1.0]])
+        faces = [[0, 3, 2, 1], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]]
+        mesh = PolyMesh(points, np.array([0, 4, 7, 10, 13, 16]), np.concatenate(faces), np.zeros(5, dtype=int),
+                        np.empty(0, dtype=int), [Patch("walls", "wall", 0, 5)], n_cells=1)
+        geometry = mesh_geometry(mesh)
+
+        np.testing.assert_allclose(geometry.cell_volumes, [1.0 / 3.0])
+        np.testing.assert_allclose(geometry.cell_centres, [[0.5, 0.5, 0.25]])
+        np.testing.assert_allclose(geometry.face_areas[0], [0.0, 0.0, -1.0])
+
+
+class StructuredMeshTests(unittest.TestCase):
+    def test_grading_is_the_ratio_of_last_to_first_cell(self):
+        widths = np.diff(graded_coordinates(3.0, 5, grading=4.0, start=1.0))
+        self.assertAlmostEqual(widths[-1] / widths[0], 4.0)
+        self.assertAlmostEqual(widths.sum(), 3.0)
+        np.testing.assert_allclose(widths[1:] / widths[:-1], 4.0 ** 0.25)
+        np.testing.assert_allclose(np.diff(graded_coordinates(2.0, 4)), 0.5)
+        with self.assertRaises(ValueError):
+            graded_coordinates(1.0, 0)
+
+    def test_layers_become_cell_zones(self):
+        layers = [Layer("clay", 2.0, 4, grading=0.5), Layer("sand", 6.0, 3)]
+        mesh = layered_mesh(layers, width=4.0, cells_x=5, grading_x=2.0, depth=2.0, cells_y=2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "polyMesh").mkdir()
+            (Path(tmpdir) / "polyMesh" / "stale").write_text("old mesh", encoding="utf-8")
+            mesh.write(Path(tmpdir) / "polyMesh")
+            self.assertFalse((Path(tmpdir) / "polyMesh" / "stale").exists())
+            poly_mesh = read_poly_mesh(Path(tmpdir) / "polyMesh")
+
+        self.assertEqual(poly_mesh.n_cells, 5 * 2 * 7)
+        self.assertEqual({name: len(labels) for name, labels in poly_mesh.cell_zones.items()}, {"clay": 40, "sand": 30})
+        volumes = mesh_quality(poly_mesh).cell_volumes
+        self.assertAlmostEqual(volumes.sum(), 4.0 * 2.0 * 8.0)
+        self.assertAlmostEqual(volumes[poly_mesh.cell_zones["clay"]].sum(), 4.0 * 2.0 * 2.0)
+        # The sand is below the clay, which ends at the ground surface
+        clay_heights = poly_mesh.points[:, 2][np.unique(faces_of(poly_mesh, poly_mesh.cell_zones["clay"]))]
+        self.assertAlmostEqual(clay_heights.min(), 6.0)
+        self.assertAlmostEqual(clay_heights.max(), 8.0)
+        self.assertEqual([patch.name for patch in poly_mesh.patches], ["left", "right", "front", "back", "bottom", "top"])
+
+    def test_layer_grading_runs_from_the_top_down(self):
+        mesh = layered_mesh([Layer("a", 10.0, 4, grading=4.0)], width=1.0, cells_x=1)
+        heights = np.diff(np.unique(mesh.points[:, 2]))[::-1]
+        self.assertAlmostEqual(heights[-1] / heights[0], 4.0)
+        self.assertTrue((np.diff(heights) > 0).all())
+
+    def test_two_dimensional_mesh_has_one_cell_and_empty_sides(self):
+        mesh = layered_mesh([Layer("fill", 1.0, 2), Layer("soil", 3.0, 6)], width=6.0, cells_x=3,
+                            depth=0.5, two_dimensional=True)
+        self.assertEqual(mesh.n_cells, 3 * 8)
+        self.assertEqual(list(mesh.patches), ["left", "right", "bottom", "top", "frontAndBack"])
+        self.assertEqual(mesh.patch_types, {"frontAndBack": "empty"})
+        self.assertEqual(mesh.patches["frontAndBack"][1], 2 * mesh.n_cells)
+        start, size = mesh.patches["frontAndBack"]
+        np.testing.assert_allclose(np.unique(mesh.points[mesh.faces[start:start + size], 2]), [0.0, 0.5])
+        np.testing.assert_array_equal(np.unique(mesh.points[:, 1]), [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0])
+        self.assertEqual(len(mesh.cell_zones["fill"]), 6)
+        top_cells = mesh.owner[mesh.patches["top"][0]:sum(mesh.patches["top"])]
+        self.assertTrue(np.isin(top_cells, mesh.cell_zones["fill"]).all())
+
+    def test_invalid_layers_are_rejected(self):
+        for layers in ([], [Layer("a", 1.0, 2), Layer("a", 1.0, 2)], [Layer("two words", 1.0, 2)],
+                       [Layer("a", -1.0, 2)], [Layer("a", 1.0, 2, grading=0.0)]):
+            with self.assertRaises(ValueError):
+                layered_mesh(layers, width=1.0, cells_x=1)
+
+
+class RibbonFMSTests(unittest.TestCase):
+    def test_matches_legacy_generator(self):
+        # A closed polygon with an inner line, shared vertices, a duplicated vertex and -0.0
+        edge_dict = {
+            "vertices": [[0.0, 0.0], [4.0, 0.0], [4.0, 2.5], [0.0, 2.5], [0.0, 1.25], [4.0, 1.25], [4.0, 0.0], [-0.0, 1.25]],
+            "edges": [[0, 1], [1, 5], [5, 2], [2, 3], [3, 4], [4, 0], [7, 5], [6, 2]],
+            "boundary": {
+                "bottom": {"type": "patch", "edges": [0]},
+                "sides": {"type": "wall", "edges": [1, 2, 4, 5, 7]},
+                "top": {"type": "patch", "edges": [3]},
+                "layer": {"type": "patch", "edges": [6]},
+            },
+        }
+        self.assertEqual(edgesToRibbonFMS(edge_dict), legacy_edges_to_ribbon_fms(edge_dict))
+
+    def test_matches_legacy_generator_on_random_cross_section(self):
+        rng = np.random.default_rng(4)
+        vertices = np.round(rng.uniform(0.0, 100.0, (300, 2)), 1)
+        vertices[rng.integers(0, 300, 30)] = vertices[rng.integers(0, 300, 30)]
+        edges = rng.integers(0, 300, (2000, 2))
+        edge_dict = {
+            "vertices": vertices.tolist(),
+            "edges": edges.tolist(),
+            "boundary": {f"patch{i}": {"type": "patch", "edges": list(range(i, 2000, 3))} for i in range(3)},
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "ribbon.fms"
+            with open(path, "w") as handle:
+                write_ribbon_fms(edge_dict, handle)
+            self.assertEqual(path.read_text(), legacy_edges_to_ribbon_fms(edge_dict))
+
+    def test_invalid_edges_raise(self):
+        boundary = {"all": {"type": "patch", "edges": [0]}}
+        with self.assertRaisesRegex(ValueError, "invalid vertex index"):
+            edgesToRibbonFMS({"vertices": [[0.0, 0.0], [1.0, 0.0]], "edges": [[0, 2]], "boundary": boundary})
+        with self.assertRaisesRegex(ValueError, "Edge 1 is not assigned"):
+            edgesToRibbonFMS({"vertices": [[0.0, 0.0], [1.0, 0.0]], "edges": [[0, 1], [1, 0]], "boundary": boundary})
+
+
+class EdgeValidationTests(unittest.TestCase):
+    def codes(self, edge_dict):
+        return {issue.code for issue in validate_edge_dict(edge_dict).issues}
+
+    def test_closed_section_with_interface_is_valid(self):
+        n = 5000
+        angle = np.linspace(0.0, 2.0 * np.pi, n, endpoint=False)
+        radius = 10.0 + np.sin(7.0 * angle)
+        vertices = np.column_stack([radius * np.cos(angle), radius * np.sin(angle)]).tolist()
+        edges = [[i, (i + 1) % n] for i in range(n)] + [[0, n // 2]]
+        report = validate_edge_dict({
+            "vertices": vertices, "edges": edges,
+            "boundary": {"outer": {"type": "patch", "edges": list(range(n))}, "interface": {"type": "patch", "edges": [n]}},
+        })
+        self.assertEqual(report.issues, ())
+        self.assertTrue(report.ready)
+
+    def test_reports_each_kind_of_defect(self):
+        report = validate_edge_dict({
+            "vertices": [[0.0, 0.0], [4.0, 0.0], [4.0, 2.0], [0.0, 2.0], [2.0, -1.0], [2.0, 3.0],
+                         [4.0, 2.0], [-5.0, -1.0], [4.0, 1e-7]],
+            "edges": [[0, 1], [1, 2], [2, 3], [3, 0], [4, 5], [6, 2], [1, 0], [0, 7]],
+            "boundary": {"walls": {"type": "wall", "edges": [0, 1, 2, 3, 5, 6, 9]}, "cut": {"type": None, "edges": [4, 1]}},
+        })
+        issues = {issue.code: issue for issue in report.issues}
+
+        self.assertEqual(issues["duplicate_vertices"].vertices, (6,))
+        self.assertEqual(issues["near_duplicate_vertices"].vertices, (1, 8))
+        self.assertEqual(issues["zero_length_edges"].edges, (5,))
+        self.assertEqual(issues["duplicate_edges"].edges, (6,))
+        self.assertEqual(issues["crossing_edges"].edges, (0, 2, 4, 6))
+        self.assertEqual(issues["unused_vertices"].vertices, (8,))
+        self.assertEqual([issue.vertices for issue in report.issues if issue.code == "open_loop"], [(4, 5, 7)])
+        self.assertTrue(issues["open_loop"].message.startswith("2 unclosed boundary loops"))
+        self.assertEqual(issues["unassigned_edges"].edges, (7,))
+        self.assertEqual(issues["shared_edges"].edges, (1,))
+        self.assertIn("invalid_patch_edges", issues)
+        self.assertIn("patch_type", issues)
+        self.assertFalse(issues["near_duplicate_vertices"].blocking)
+        self.assertTrue(issues["crossing_edges"].blocking)
+
+    def test_collinear_overlap_and_t_junction(self):
+        boundary = {"all": {"type": "patch", "edges": [0, 1]}}
+        vertices = [[0.0, 0.0], [2.0, 0.0], [1.0, 0.0], [3.0, 0.0], [1.0, 1.0]]
+        self.assertIn("crossing_edges", self.codes({"vertices": vertices, "edges": [[0, 1], [2, 3]], "boundary": boundary}))
+        self.assertIn("crossing_edges", self.codes({"vertices": vertices, "edges": [[0, 1], [2, 4]], "boundary": boundary}))
+        # Edges meeting at a common vertex do not cross
+        self.assertNotIn("crossing_edges", self.codes({"vertices": vertices, "edges": [[0, 2], [2, 3]], "boundary": boundary}))
+        self.assertNotIn("crossing_edges", self.codes({"vertices": vertices, "edges": [[0, 2], [2, 4]], "boundary": boundary}))
+
+
+class GeometryImportTests(unittest.TestCase):
+    def test_douglas_peucker_matches_recursive_definition(self):
+        def recursive(points, tolerance, first, last, kept):
+            if last - first < 2:
+                return
+            a, b = points[first], points[last]
+            t = np.clip((points[first + 1:last] - a) @ (b - a) / ((b - a) @ (b - a)), 0.0, 1.0)
+            distances = np.linalg.norm(points[first + 1:last] - (a + t[:, None] * (b - a)), axis=1)
+            farthest = first + 1 + int(np.argmax(distances))
+            if distances.max() > tolerance:
+                kept.add(farthest)
+                recursive(points, tolerance, first, farthest, kept)
+                recursive(points, tolerance, farthest, last, kept)
+
+        x = np.linspace(0.0, 100.0, 400)
+        points = np.column_stack([x, 5.0 * np.sin(x / 7.0) + np.random.default_rng(2).normal(scale=0.05, size=len(x))])
+        for tolerance in (0.01, 0.2, 2.0):
+            kept = {0, len(points) - 1}
+            recursive(points, tolerance, 0, len(points) - 1, kept)
+            np.testing.assert_array_equal(np.flatnonzero(douglas_peucker(points, tolerance)), sorted(kept))
+
+    def test_csv_lines_and_patches(self):
+        csv = b"x,y,line,patch\n0,0,1,bottom\n5,0,1,bottom\n10,0,1,bottom\n10,0,2,top\n10,5,2,top\n0,5,2,top\n0,0,2,top\n"
+        edge_dict = polylines_to_edge_dict(read_polylines(csv, "section.csv"))
+
+        self.assertEqual(edge_dict["vertices"], [[0.0, 0.0], [5.0, 0.0], [10.0, 0.0], [10.0, 5.0], [0.0, 5.0]])
+        self.assertEqual(edge_dict["edges"], [[0, 1], [1, 2], [2, 3], [3, 4], [4, 0]])
+        self.assertEqual(edge_dict["boundary"], {"bottom": {"type": "patch", "edges": [0, 1]},
+                                                 "top": {"type": "patch", "edges": [2, 3, 4]}})
+        self.assertTrue(validate_edge_dict(edge_dict).ready)
+
+    def test_dxf_lwpolyline_layers(self):
+        def entity(layer, points, closed):
+            codes = ["0", "LWPOLYLINE", "8", layer, "90", str(len(points)), "70", "1" if closed else "0"]
+            for x, y in points:
+                codes += ["10", str(x), "20", str(y)]
+            return codes
+
+        dxf = ["0", "SECTION", "2", "ENTITIES"] + entity("Outline", [(0, 0), (4, 0), (4, 2), (0, 2)], True) \
+            + entity("Clay layer", [(0, 1), (4, 1)], False) + ["0", "ENDSEC", "0", "EOF"]
+        polylines = read_polylines("\n".join(dxf).encode(), "section.dxf")
+
+        self.assertEqual([(line.patch, line.closed, len(line.points)) for line in polylines],
+                         [("Outline", True, 4), ("Clay_layer", False, 2)])
+
+    def test_geojson_simplification_keeps_shared_points(self):
+        x = np.linspace(0.0, 10.0, 1001)
+        surface = np.column_stack([x, 0.001 * np.sin(x)])
+        outline = np.vstack([surface, [[10.0, -5.0], [5.0, -5.0], [0.0, -5.0], surface[0]]])
+        geojson = {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {"name": "ground surface"},
+             "geometry": {"type": "Polygon", "coordinates": [outline.tolist()]}},
+            {"type": "Feature", "properties": {"patch": "well"},
+             "geometry": {"type": "LineString", "coordinates": [surface[500].tolist(), [5.0, -5.0]]}},
+        ]}
+        edge_dict = polylines_to_edge_dict(read_polylines(json.dumps(geojson).encode(), "section.geojson"), 0.01)
+
+        self.assertEqual(len(edge_dict["vertices"]), 6)
+        self.assertIn(surface[500].tolist(), edge_dict["vertices"])
+        self.assertEqual(set(edge_dict["boundary"]), {"ground_surface", "well"})
+        self.assertEqual(validate_edge_dict(edge_dict).issues, ())
+
+
+class MeshArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = Path(self.tmpdir.name)
+        write_poly_mesh(self.root / "source", *hex_mesh(4, 3, 2))
+        self.mesh_files = {path.name: path.read_bytes() for path in (self.root / "source").iterdir()}
+        self.target = self.root / "case" / "constant" / "polyMesh"
+
+    def tar(self, members, compression=""):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode=f"w:{compression}") as archive:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        buffer.seek(0)
+        return buffer
+
+    def test_tar_zst_of_gzipped_files(self):
+        import zstandard
+
+        members = {f"case/constant/polyMesh/{name}.gz": gzip.compress(data) for name, data in self.mesh_files.items()}
+        members["case/system/controlDict"] = b"FoamFile {}"
+        archive = io.BytesIO(zstandard.ZstdCompressor().compress(self.tar(members).getvalue()))
+        result = import_mesh_archive(archive, self.target, file_name="mesh.tar.zst")
+
+        self.assertEqual(result.files, sorted(f"{name}.gz" for name in self.mesh_files))
+        self.assertEqual((result.counts["nCells"], result.counts["nFaces"], result.counts["nPoints"]), (24, 98, 60))
+        self.assertEqual(read_poly_mesh(self.target).n_cells, 24)
+        self.assertEqual([path.name for path in self.target.parent.iterdir()], ["polyMesh"])
+
+    def test_tar_gz_and_zip_of_plain_files(self):
+        result = import_mesh_archive(self.tar(self.mesh_files, "gz"), self.target, file_name="mesh.tgz")
+        self.assertEqual(result.counts["nCells"], 24)
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, data in self.mesh_files.items():
+                archive.writestr(f"polyMesh/{name}", data)
+        buffer.seek(0)
+        result = import_mesh_archive(buffer, self.target, file_name="polyMesh.zip")
+        self.assertEqual(result.counts["nInternalFaces"], 46)
+
+    def test_rejected_archives_keep_the_existing_mesh(self):
+        import_mesh_archive(self.tar(self.mesh_files), self.target, file_name="mesh.tar")
+        existing = sorted(path.name for path in self.target.iterdir())
+
+        incomplete = {name: data for name, data in self.mesh_files.items() if name != "neighbour"}
+        with self.assertRaisesRegex(ValueError, "no neighbour file"):
+            import_mesh_archive(self.tar(incomplete), self.target, file_name="mesh.tar")
+        with self.assertRaisesRegex(ValueError, "Unsafe path"):
+            import_mesh_archive(self.tar({"../../escape": b"x", **self.mesh_files}), self.target, file_name="mesh.tar")
+        with self.assertRaisesRegex(ValueError, "extracts to more than"):
+            import_mesh_archive(self.tar(self.mesh_files), self.target, file_name="mesh.tar", max_bytes=1000)
+        with self.assertRaisesRegex(ValueError, "damaged"):
+            import_mesh_archive(io.BytesIO(b"not a tarball" * 100), self.target, file_name="mesh.tar.gz")
+
+        self.assertEqual(sorted(path.name for path in self.target.iterdir()), existing)
+        self.assertFalse((self.root / "escape").exists())
+        self.assertEqual([path.name for path in self.target.parent.iterdir()], ["polyMesh"])
+
+
+class MeshCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.case = Path(tmpdir.name) / "case"
+        (self.case / "system").mkdir(parents=True)
+        self.dictionary = self.case / "system" / "blockMeshDict"
+        self.dictionary.write_text(
+            "FoamFile\n{\n    version 2.0;\n    object blockMeshDict;\n}\n"
+            "scale 1;\nvertices ( (0 0 0) (1 0 0) ); // corners\n",
+            encoding="utf-8",
+        )
+        self.runs = 0
+
+    def run_tool(self):
+        self.runs += 1
+        write_poly_mesh(self.case / "constant" / "polyMesh", *hex_mesh(2, 2, self.runs))
+
+    def test_key_ignores_comments_and_layout(self):
+        key = mesh_cache_key(self.case, "blockMesh")
+        self.dictionary.write_text(
+            "/* reformatted */\nFoamFile { version 2.0; object blockMeshDict; note \"x\"; }\n"
+            "scale   1;\nvertices\n(\n    (0 0 0)\n    (1 0 0)\n);\n",
+            encoding="utf-8",
+        )
+        self.assertEqual(mesh_cache_key(self.case, "blockMesh"), key)
+        self.dictionary.write_text(self.dictionary.read_text().replace("scale   1", "scale 2"), encoding="utf-8")
+        self.assertNotEqual(mesh_cache_key(self.case, "blockMesh"), key)
+
+    def test_mesh_dict_references_the_surface_file(self):
+        (self.case / "system" / "meshDict").write_text('surfaceFile "system/ribbon.fms";\nmaxCellSize 1;\n')
+        self.assertEqual(mesh_input_files(self.case, "cartesian2DMesh"),
+                         ["system/meshDict", "system/edgeDict", "system/ribbon.fms"])
+        key = mesh_cache_key(self.case, "cartesian2DMesh")
+        (self.case / "system" / "ribbon.fms").write_text("3(patch)")
+        self.assertNotEqual(mesh_cache_key(self.case, "cartesian2DMesh"), key)
+
+    def test_identical_inputs_restore_the_stored_mesh(self):
+        cache_dir = self.case / "cache"
+        first = cached_mesh_build(self.case, "blockMesh", self.run_tool, cache_dir=cache_dir)
+        poly_mesh_dir = self.case / "constant" / "polyMesh"
+        expected = {path.name: path.read_bytes() for path in poly_mesh_dir.iterdir()}
+        self.assertFalse(first.hit)
+
+        # Another mesh replaces the built one; restoring brings the cached one back without running the tool
+        write_poly_mesh(poly_mesh_dir, *hex_mesh(3, 3, 3))
+        second = cached_mesh_build(self.case, "blockMesh", self.run_tool, cache_dir=cache_dir)
+        self.assertTrue(second.hit)
+        self.assertEqual(self.runs, 1)
+        self.assertEqual({path.name: path.read_bytes() for path in poly_mesh_dir.iterdir()}, expected)
+
+        linked = cached_mesh_build(self.case, "blockMesh", self.run_tool, link=True, cache_dir=cache_dir)
+        self.assertTrue(linked.hit)
+        self.assertGreater((poly_mesh_dir / "points").stat().st_nlink, 1)
+
+        # Changed inputs are a miss; the tool rewrites the linked files without touching the store
+        self.dictionary.write_text("scale 2;\n", encoding="utf-8")
+        third = cached_mesh_build(self.case, "blockMesh", self.run_tool, cache_dir=cache_dir)
+        self.assertFalse(third.hit)
+        self.assertEqual(self.runs, 2)
+        self.assertEqual(len(list((cache_dir / "builds").iterdir())), 2)
+        self.assertEqual((poly_mesh_dir / "points").stat().st_nlink, 1)
+        self.dictionary.write_text("scale 1;\nvertices ( (0 0 0) (1 0 0) );\n", encoding="utf-8")
+        self.assertTrue(cached_mesh_build(self.case, "blockMesh", self.run_tool, cache_dir=cache_dir).hit)
+        self.assertEqual({path.name: path.read_bytes() for path in poly_mesh_dir.iterdir()}, expected)
+
+    def test_damaged_entries_are_rebuilt(self):
+        cache_dir = self.case / "cache"
+        cached_mesh_build(self.case, "blockMesh", self.run_tool, cache_dir=cache_dir)
+        for stored in (cache_dir / "objects").rglob("*"):
+            if stored.is_file():
+                stored.chmod(0o644)
+                stored.unlink()
+        build = cached_mesh_build(self.case, "blockMesh", self.run_tool, cache_dir=cache_dir)
+        self.assertFalse(build.hit)
+        self.assertEqual(self.runs, 2)
+        self.assertTrue((self.case / "constant" / "polyMesh" / "owner").exists())
+
+
+class ZoneBuilderTests(unittest.TestCase):
+    def test_points_in_polygon_match_a_direct_crossing_count(self):
+        rng = np.random.default_rng(3)
+        points = rng.random((5000, 2)) * 4 - 2
+        angles = np.linspace(0, 2 * np.pi, 200, endpoint=False)
+        star = np.column_stack([np.cos(angles), np.sin(angles)]) * (1.0 + 0.5 * np.sin(5 * angles))[:, None]
+        inside = zones.points_in_polygon(points, star)
+
+        starts, ends = star, np.roll(star, -1, axis=0)
+        x, y = points[:, :1], points[:, 1:]
+        crosses = ((starts[:, 1] > y) != (ends[:, 1] > y)) & (
+            x < starts[:, 0] + (y - starts[:, 1]) * (ends[:, 0] - starts[:, 0]) / (ends[:, 1] - starts[:, 1]))
+        np.testing.assert_array_equal(inside, crosses.sum(axis=1) % 2 == 1)
+        # A second ring cuts a hole
+        square = [(0, 0), (2, 0), (2, 2), (0, 2), (0, 0), (0.5, 0.5), (1.5, 0.5), (1.5, 1.5), (0.5, 1.5), (0.5, 0.5)]
+        np.testing.assert_array_equal(zones.points_in_polygon(np.array([[0.25, 1.0], [1.0, 1.0], [3.0, 1.0]]), square),
+                                      [True, False, False])
+
+    def test_regions_and_layers(self):
+        centres = np.array([[0.5, 0.5, 9.5], [5.0, 5.0, 5.0], [9.5, 0.5, 0.5], [5.0, 5.0, 1.0], [1.0, 9.0, 6.0]])
+        self.assertEqual(zones.BoxRegion((0, 0, 0), (1, 1, 10)).contains(centres).tolist(),
+                         [True, False, False, False, False])
+        self.assertEqual(zones.CylinderRegion((5, 5, 2), (5, 5, 8), 0.5).contains(centres).tolist(),
+                         [False, True, False, False, False])
+        layers = [zones.Layer("fill", zones.Horizon(8.0)), zones.Layer("clay", zones.Horizon(((0, 6.0), (10, 2.0)))),
+                  zones.Layer("rock")]
+        np.testing.assert_array_equal(zones.assign_layers(centres, layers), [0, 1, 2, 2, 1])
+        scattered = zones.Horizon(((0, 0, 1.0), (10, 0, 1.0), (0, 10, 3.0), (10, 10, 3.0)))
+        np.testing.assert_allclose(scattered.elevation(np.array([[0, 0], [5, 5], [10, 10]])), [1.0, 2.0, 3.0])
+
+    def test_later_rules_override_and_zones_are_written(self):
+        mesh = layered_mesh([Layer("upper", 5.0, 5), Layer("lower", 5.0, 5)], width=10.0, cells_x=10, depth=1.0,
+                            cells_y=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            poly_mesh_dir = Path(tmpdir) / "constant" / "polyMesh"
+            mesh.write(poly_mesh_dir)
+            centres = zones.cell_centres(poly_mesh_dir)
+            cell_zones = zones.build_cell_zones(
+                centres,
+                [zones.ZoneRule("wall", zones.parse_region("box", "4 0 0  6 1 10")),
+                 zones.ZoneRule("anchor", zones.parse_region("polygon", "0 0; 0 1; 2 1; 2 0", plane=(0, 1)))],
+                [zones.Layer("soft", zones.parse_horizon("0 4; 10 6")), zones.Layer("stiff", zones.parse_horizon(""))],
+            )
+            zones.write_zones(poly_mesh_dir, cell_zones)
+            written = read_poly_mesh(poly_mesh_dir).cell_zones
+
+        self.assertEqual(list(written), ["soft", "stiff", "wall", "anchor"])
+        for name, labels in cell_zones.items():
+            np.testing.assert_array_equal(written[name], labels)
+        self.assertEqual(sum(len(labels) for labels in written.values()), 100)
+        self.assertEqual(len(written["wall"]), 20)
+        self.assertEqual(len(written["anchor"]), 20)
+        self.assertTrue(np.all(centres[written["soft"], 2] >= 4.0))
+        with self.assertRaises(ValueError):
+            zones.parse_region("cylinder", "0 0 0 1 1 1")
+        with self.assertRaises(ValueError):
+            zones.build_cell_zones(centres, [], [zones.Layer("no good", None)])
+
+
+def shuffled_hex_mesh(nx, ny, nz, seed=0):
+    """A structured mesh with randomly numbered cells, and its cell centres in that numbering."""
+    points, faces, owner, neighbour, patches = hex_mesh(nx, ny, nz)
+    order = np.random.default_rng(seed).permutation(nx * ny * nz)
+    mesh = renumber_cells(np.arange(len(faces) + 1) * 4, faces.ravel(), owner, neighbour, {}, order)
+    return points, mesh, patches
+
+
+class RenumberTests(unittest.TestCase):
+    def test_reverse_cuthill_mckee_reduces_the_bandwidth_of_a_shuffled_mesh(self):
+        points, mesh, _ = shuffled_hex_mesh(12, 10, 8)
+        order = reverse_cuthill_mckee(mesh.owner, mesh.neighbour, 960)
+        np.testing.assert_array_equal(np.sort(order), np.arange(960))
+        renumbered = renumber_cells(mesh.face_offsets, mesh.face_points, mesh.owner, mesh.neighbour,
+                                    {"zone": np.arange(10)}, order)
+
+        self.assertGreater(bandwidth(mesh.owner, mesh.neighbour), 500)
+        self.assertLessEqual(bandwidth(renumbered.owner, renumbered.neighbour), 10 * 8)
+        internal_owner = renumbered.owner[:len(renumbered.neighbour)]
+        self.assertTrue(np.all(internal_owner < renumbered.neighbour))
+        self.assertTrue(np.all(np.diff(internal_owner) >= 0))
+        geometry = mesh_geometry(PolyMesh(points, renumbered.face_offsets, renumbered.face_points, renumbered.owner,
+                                          renumbered.neighbour, n_cells=960))
+        np.testing.assert_allclose(geometry.cell_volumes, 1.0 / 960)
+        np.testing.assert_array_equal(np.sort(order[renumbered.cell_zones["zone"]]), np.arange(10))
+
+    def test_disconnected_cells_are_all_numbered(self):
+        owner, neighbour = np.array([0, 3, 0, 1, 2, 3, 4]), np.array([1, 4])
+        order = reverse_cuthill_mckee(owner, neighbour, 5)
+        np.testing.assert_array_equal(np.sort(order), np.arange(5))
+
+    def test_case_mesh_zones_and_fields_stay_consistent(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 512, n_times=2, regions=("solid",))
+            poly_mesh_dir = case_dir / "constant" / "solid" / "polyMesh"
+            points, mesh, patches = shuffled_hex_mesh(8, 8, 8, seed=4)
+            write_poly_mesh(poly_mesh_dir, points, mesh.face_points.reshape(-1, 4),
+                            mesh.owner, mesh.neighbour, patches, {"lower": np.arange(0, 512, 2)},
+                            location="constant/solid/polyMesh")
+            centres = zones.cell_centres(poly_mesh_dir)
+            # Fields that are a function of the position, one binary and one ASCII
+            values = centres * [1.0, 10.0, 100.0]
+            for time in ("0", "1"):
+                write_binary_field(case_dir / time / "solid" / "D", "volVectorField", values, "[0 1 0 0 0 0 0]",
+                                   {name: "zeroGradient" for name in patches}, time)
+            ascii_field = case_dir / "1" / "solid" / "T"
+            ascii_field.write_text(
+                "FoamFile\n{\n    format ascii;\n    class volScalarField;\n    object T;\n}\n"
+                "dimensions [0 0 0 1 0 0 0];\ninternalField nonuniform List<scalar> 512\n(\n"
+                + "\n".join(repr(float(value)) for value in centres[:, 2]) + "\n)\n;\nboundaryField\n{\n}\n",
+                encoding="utf-8",
+            )
+            lower = centres[np.arange(0, 512, 2)]
+
+            results = renumber_case(case_dir)
+            self.assertEqual(len(results), 1)
+            self.assertLess(results[0].bandwidth_after, results[0].bandwidth_before)
+            self.assertEqual(results[0].regions, ["solid"])
+            self.assertEqual(sorted(results[0].fields), ["0/solid/D", "1/solid/D", "1/solid/T"])
+
+            renumbered = read_poly_mesh(poly_mesh_dir)
+            new_centres = zones.cell_centres(poly_mesh_dir)
+            self.assertEqual(bandwidth(renumbered.owner, renumbered.neighbour), results[0].bandwidth_after)
+            np.testing.assert_allclose(read_internal_field(case_dir / "1" / "solid" / "D"), new_centres * [1.0, 10.0, 100.0])
+            np.testing.assert_allclose(read_internal_field(ascii_field).ravel(), new_centres[:, 2])
+            zone_centres = new_centres[renumbered.cell_zones["lower"]]
+            np.testing.assert_allclose(zone_centres[np.lexsort(zone_centres.T)], lower[np.lexsort(lower.T)])
+            self.assertEqual([patch.size for patch in renumbered.patches], [size for _, size in patches.values()])
+            self.assertFalse(list(case_dir.rglob("*.renumber.tmp")))
+
+    def test_gzipped_fields_are_reordered(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 64, n_times=1, regions=("solid",))
+            poly_mesh_dir = case_dir / "constant" / "solid" / "polyMesh"
+            points, mesh, patches = shuffled_hex_mesh(4, 4, 4, seed=3)
+            write_poly_mesh(poly_mesh_dir, points, mesh.face_points.reshape(-1, 4), mesh.owner, mesh.neighbour,
+                            patches, location="constant/solid/polyMesh")
+            field_path = case_dir / "0" / "solid" / "C"
+            write_binary_field(field_path, "volVectorField", zones.cell_centres(poly_mesh_dir), "[0 1 0 0 0 0 0]",
+                               {name: "zeroGradient" for name in patches}, "0")
+            (case_dir / "0" / "solid" / "C.gz").write_bytes(gzip.compress(field_path.read_bytes()))
+            field_path.unlink()
+
+            results = renumber_case(case_dir)
+            self.assertLess(results[0].bandwidth_after, results[0].bandwidth_before)
+            self.assertIn("0/solid/C", results[0].fields)
+            field_path.write_bytes(gzip.decompress((case_dir / "0" / "solid" / "C.gz").read_bytes()))
+            np.testing.assert_allclose(read_internal_field(field_path), zones.cell_centres(poly_mesh_dir))
+
+    def test_well_ordered_mesh_keeps_the_previous_record(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 64, n_times=1, regions=("solid",))
+            poly_mesh_dir = case_dir / "constant" / "solid" / "polyMesh"
+            points, mesh, patches = shuffled_hex_mesh(4, 4, 4, seed=2)
+            write_poly_mesh(poly_mesh_dir, points, mesh.face_points.reshape(-1, 4), mesh.owner, mesh.neighbour,
+                            patches, location="constant/solid/polyMesh")
+            record = record_renumbering(case_dir, renumber_case(case_dir))
+            self.assertIsNotNone(record)
+
+            owner = (poly_mesh_dir / "owner").read_bytes()
+            results = renumber_case(case_dir)
+            self.assertGreaterEqual(results[0].bandwidth_after, results[0].bandwidth_before)
+            self.assertEqual((poly_mesh_dir / "owner").read_bytes(), owner)
+            self.assertIsNone(record_renumbering(case_dir, results))
+            self.assertEqual(load_renumber_record(case_dir), record)
+
+    def test_surface_fields_are_refused_before_writing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 64, n_times=1, regions=("solid",))
+            (case_dir / "0" / "solid" / "phi").write_text("FoamFile\n{\n    class surfaceScalarField;\n}\n")
+            owner = (case_dir / "constant" / "solid" / "polyMesh" / "owner").read_bytes()
+            with self.assertRaises(ValueError):
+                renumber_case(case_dir)
+            self.assertEqual((case_dir / "constant" / "solid" / "polyMesh" / "owner").read_bytes(), owner)
+
+    def test_step_times_from_the_solver_log(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "log"
+            log.write_text("Time = 1\nExecutionTime = 2.5 s  ClockTime = 3 s\n\nTime = 2\n"
+                           "ExecutionTime = 3 s  ClockTime = 4 s\nTime = 3\nExecutionTime = 3.75 s  ClockTime = 5 s\n")
+            np.testing.assert_allclose(solver_step_times(log), [0.5, 0.75])
+        self.assertEqual(len(solver_step_times(None)), 0)
+
+
+class ZoneScanTests(unittest.TestCase):
+    def test_scan_lists_zones_without_reading_labels(self):
+        points, faces, owner, neighbour, patches = hex_mesh(2, 2, 2)
+        labels = "\n".join(str(label) for label in range(5000))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_poly_mesh(Path(tmpdir) / "binary", points, faces, owner, neighbour, patches,
+                            {"upper": np.arange(4, 8), "lower": np.arange(4)})
+            ascii_path = Path(tmpdir) / "cellZones"
+            ascii_path.write_text(
+                "FoamFile\n{\n    format ascii;\n    class regIOobject;\n}\n// stray { brace\n2\n(\n"
+                f"big\n{{\n    type cellZone;\n    cellLabels List<label> 5000\n(\n{labels}\n)\n;\n}}\n"
+                "small { type cellZone; cellLabels List<label> 3(1 2 3); flipMap List<bool> 3(0 0 0); }\n)\n",
+                encoding="utf-8",
+            )
+
+            self.assertEqual(scan_zones(Path(tmpdir) / "binary" / "cellZones"),
+                             [ZoneSummary("upper", "cellZone", 4), ZoneSummary("lower", "cellZone", 4)])
+            self.assertEqual(scan_zones(ascii_path),
+                             [ZoneSummary("big", "cellZone", 5000), ZoneSummary("small", "cellZone", 3)])
+
+            zones = read_cell_zones(ascii_path)
+            self.assertEqual(list(zones), ["big", "small"])
+            np.testing.assert_array_equal(zones["big"], np.arange(5000))
+            np.testing.assert_array_equal(zones["small"], [1, 2, 3])
+            zones = read_cell_zones(Path(tmpdir) / "binary" / "cellZones")
+            np.testing.assert_array_equal(zones["upper"], np.arange(4, 8))
+            np.testing.assert_array_equal(zones["lower"], np.arange(4))
+
+
+class MeshViewerUrlTests(unittest.TestCase):
+    def test_viewer_url_follows_the_request_host_or_public_url(self):
+        with mock.patch.dict(os.environ, {TRAME_PUBLIC_URL_ENV: ""}):
+            self.assertEqual(viewer_url(9000), "http://localhost:9000/")
+            self.assertEqual(viewer_url(9000, "gpu-box.lan:8501", "https"), "https://gpu-box.lan:9000/")
+            self.assertEqual(viewer_url(9000, "[::1]:8501"), "http://[::1]:9000/")
+        with mock.patch.dict(os.environ, {TRAME_PUBLIC_URL_ENV: "https://example.org/trame/{port}/"}):
+            self.assertEqual(viewer_url(9000, "gpu-box.lan:8501"), "https://example.org/trame/9000/")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,461 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+import numpy as np
+import pyvista as pv
+
+from benchmarks.synthetic import write_synthetic_case
+from OpenFOAMVisualizer import OpenFOAMVisualizer, VisualizerRegistry
+from foam_io import read_internal_field, time_signature
+from models.hydraulic_laws import HYDRAULIC_LAWS
+from postprocessing.catalog import PostProcessingCatalog
+from postprocessing.derived import DerivedContext, HydraulicProperties, SaturationModel, add_derived_array, saturation
+from postprocessing.envelopes import EnvelopeStore, compute_envelopes
+from postprocessing.export import ExportStore, export_case
+from postprocessing.glyphs import uniform_sample_ids
+from postprocessing.locator import CellLocator
+from postprocessing.probes import ProbeFileReader, ProbeSeriesReader
+from postprocessing.sets import read_xy_files, set_field_names
+from postprocessing.spacetime import cumulative_distance, stack_profiles
+from postprocessing.statistics import StatisticsJob, field_range, load_field_statistics, update_field_statistics
+
+
+def write_scalar_field(path: Path, values) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = "\n".join(str(value) for value in values)
+    path.write_text(
+        "FoamFile\n{\n    version 2.0;\n    format ascii;\n    class volScalarField;\n    object p_rgh;\n}\n"
+        f"dimensions [1 -1 -2 0 0 0 0];\ninternalField nonuniform List<scalar> {len(values)}\n(\n{body}\n)\n;\n"
+        "boundaryField\n{\n}\n",
+        encoding="utf-8",
+    )
+
+
+class DerivedFieldTests(unittest.TestCase):
+    def test_stress_invariants_use_vtk_component_order(self):
+        # OpenFOAM (xx xy xz yy yz zz) = (1 2 3 4 5 6) in VTK order
+        grid = pv.ImageData(dimensions=(2, 2, 2)).cast_to_unstructured_grid()
+        grid.cell_data["sigmaEff"] = np.array([[1.0, 4.0, 6.0, 2.0, 5.0, 3.0]])
+        context = DerivedContext(Path("."))
+
+        self.assertTrue(add_derived_array(grid, "vonMises(sigmaEff)", context))
+        self.assertTrue(add_derived_array(grid, "meanEffectiveStress", context))
+        self.assertFalse(add_derived_array(grid, "mag(D)", context))
+        self.assertAlmostEqual(grid.cell_data["vonMises(sigmaEff)"][0], np.sqrt(133.0))
+        self.assertAlmostEqual(grid.cell_data["meanEffectiveStress"][0], -11.0 / 3.0)
+
+    def test_saturation_follows_the_swcc_of_each_zone(self):
+        template = Path(__file__).resolve().parents[1] / "templates/base/constant/poroFluid/poroHydraulicProperties"
+        from foamlib import FoamFile
+
+        global_properties = HydraulicProperties.from_dict(FoamFile(template).as_dict())
+        self.assertEqual(global_properties.saturation.law, "vanGenuchten")
+        self.assertEqual(global_properties.gamma_water, 1e4)
+        self.assertEqual(global_properties.href, 14.0)
+
+        van_genuchten = SaturationModel("vanGenuchten", {"n": 2.0, "alpha": 1e-4, "S_0": 1.0, "S_r": 0.1})
+        pressure = np.array([1e3, -1e4, -1e4, -1e4])
+        np.testing.assert_allclose(saturation(pressure, van_genuchten), [1.0] + [0.1 + 0.9 / np.sqrt(2.0)] * 3)
+
+        context = DerivedContext(Path("."))
+        context._hydraulics = HydraulicProperties(zone_saturation={"wet": SaturationModel("saturated"), "dry": van_genuchten})
+        context._cell_zones = {"wet": np.array([0, 1]), "dry": np.array([2, 3])}
+        grid = pv.ImageData(dimensions=(5, 2, 2)).cast_to_unstructured_grid()
+        grid.cell_data["p_rgh"] = pressure
+        grid.point_data["p_rgh"] = np.zeros(grid.n_points)
+
+        self.assertTrue(add_derived_array(grid, "saturation", context, internal_mesh=True))
+        np.testing.assert_allclose(grid.cell_data["saturation"], [1.0, 1.0, 0.1 + 0.9 / np.sqrt(2.0), 0.1 + 0.9 / np.sqrt(2.0)])
+        # Point values cannot be mapped to zones with different laws
+        self.assertNotIn("saturation", grid.point_data)
+
+    def test_saturation_defaults_come_from_the_hydraulic_laws(self):
+        pressure = np.array([1e3, -4e3, -8.8e3])
+        brooks_corey = HYDRAULIC_LAWS["SWCC"]["brooksCorey"].parameters
+        s_r, p_e, n = (brooks_corey[name].default_value for name in ("S_r", "p_e", "n"))
+        np.testing.assert_allclose(saturation(pressure, SaturationModel("brooksCorey")),
+                                   [1.0, 1.0, s_r + (1.0 - s_r) * (p_e / -8.8e3) ** n])
+
+        van_genuchten = HYDRAULIC_LAWS["SWCC"]["vanGenuchten"].parameters
+        residual = saturation(np.array([-1e12]), SaturationModel("vanGenuchten", {"S_0": 1.0}))
+        self.assertAlmostEqual(residual[0], van_genuchten["S_r"].default_value, places=6)
+        with self.assertRaises(ValueError):
+            saturation(pressure, SaturationModel("unknown"))
+
+
+class ProbeReaderTests(unittest.TestCase):
+    def test_probe_reader_parses_only_appended_complete_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            probe_path = Path(tmpdir) / "p.dat"
+            probe_path.write_text("# Probe 0 (0 0 0)\n# Time p0 U0x U0y U0z\n0.1 1.0 (1 2 3)\n0.2 2.0 (4", encoding="utf-8")
+
+            reader = ProbeFileReader(probe_path)
+            self.assertEqual(reader.update(), 1)
+            self.assertEqual(reader.columns, ["Time", "p0", "U0x", "U0y", "U0z"])
+
+            with probe_path.open("a", encoding="utf-8") as handle:
+                handle.write(" 5 6)\n0.3 3.0 (7 8 9)\n")
+
+            self.assertEqual(reader.update(), 2)
+            self.assertEqual(reader.update(), 0)
+            np.testing.assert_allclose(reader.data[:, 0], [0.1, 0.2, 0.3])
+            np.testing.assert_allclose(reader.data[1], [0.2, 2.0, 4.0, 5.0, 6.0])
+
+    def test_probe_series_merges_restart_folders(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample_dir = Path(tmpdir)
+            (sample_dir / "0").mkdir()
+            (sample_dir / "0" / "p.dat").write_text("# Time p\n1 10\n2 20\n3 30\n", encoding="utf-8")
+
+            reader = ProbeSeriesReader(sample_dir)
+            self.assertTrue(reader.update())
+            self.assertEqual(len(reader.data), 3)
+
+            (sample_dir / "2").mkdir()
+            (sample_dir / "2" / "p.dat").write_text("# Time p\n2 21\n3 31\n4 41\n", encoding="utf-8")
+
+            self.assertTrue(reader.update())
+            np.testing.assert_allclose(reader.data, [[1, 10], [2, 21], [3, 31], [4, 41]])
+            self.assertFalse(reader.update())
+
+
+class CatalogTests(unittest.TestCase):
+    def test_catalog_keeps_original_time_names_and_refreshes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample_dir = Path(tmpdir) / "postProcessing" / "line"
+            for time in ("100", "2.5e-1"):
+                (sample_dir / time).mkdir(parents=True)
+                (sample_dir / time / "line_p_rgh.xy").write_text("0 0 0 1\n", encoding="utf-8")
+
+            catalog = PostProcessingCatalog(tmpdir).refresh()
+            entry = catalog.get("line")
+            self.assertEqual(entry.kind, "sets")
+            self.assertEqual(entry.times, ["2.5e-1", "100"])
+            self.assertEqual(entry.fields, ["p_rgh"])
+            self.assertEqual(entry.exact(100.0), "100")
+            self.assertEqual(entry.exact("0.25"), "2.5e-1")
+            self.assertEqual(entry.nearest(60), "100")
+
+            (sample_dir / "200").mkdir()
+            (sample_dir / "200" / "line_p_rgh.xy").write_text("0 0 0 2\n", encoding="utf-8")
+            catalog.refresh()
+            self.assertEqual(entry.nearest(), "200")
+            self.assertEqual(catalog.names("sets"), ["line"])
+
+
+class FieldStatisticsTests(unittest.TestCase):
+    def test_statistics_index_updates_incrementally(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "poroFluid" / "p_rgh", [1.0, 2.0, 3.0])
+
+            index = update_field_statistics(case_dir, max_workers=1)
+            self.assertEqual(list(index["entries"]), ["1/poroFluid/p_rgh"])
+            self.assertEqual(field_range(index, "p_rgh", "poroFluid"), (1.0, 3.0))
+
+            write_scalar_field(case_dir / "2" / "poroFluid" / "p_rgh", [-4.0, 0.0, 8.0])
+            index = update_field_statistics(case_dir, max_workers=1)
+
+            self.assertEqual(len(index["entries"]), 2)
+            self.assertEqual(field_range(index, "p_rgh", "poroFluid"), (-4.0, 8.0))
+            self.assertAlmostEqual(index["entries"]["2/poroFluid/p_rgh"]["components"]["value"]["mean"], 4.0 / 3.0)
+
+    def test_partly_written_field_is_pending_until_complete(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "poroFluid" / "p_rgh", [1.0, 2.0, 3.0])
+            field_path = case_dir / "2" / "poroFluid" / "p_rgh"
+            write_scalar_field(field_path, [-4.0, 0.0, 8.0])
+            content = field_path.read_bytes()
+            field_path.write_bytes(content[:content.index(b"0.0")])
+
+            index = update_field_statistics(case_dir, max_workers=1)
+            self.assertEqual(list(index["entries"]), ["1/poroFluid/p_rgh"])
+            self.assertEqual(list(index["pending"]), ["2/poroFluid/p_rgh"])
+            self.assertEqual(list(load_field_statistics(case_dir)["entries"]), ["1/poroFluid/p_rgh"])
+
+            field_path.write_bytes(content)
+            index = update_field_statistics(case_dir, max_workers=1)
+            self.assertNotIn("pending", index)
+            self.assertEqual(field_range(index, "p_rgh", "poroFluid"), (-4.0, 8.0))
+
+
+    def test_background_job_indexes_changed_time_directories(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "poroFluid" / "p_rgh", [1.0, 2.0, 3.0])
+            signature = time_signature(case_dir)
+
+            job = StatisticsJob(case_dir, max_workers=1).start()
+            job._thread.join()
+            self.assertIsNone(job.error)
+            self.assertEqual((job.done, job.total), (1, 1))
+            self.assertEqual(list(load_field_statistics(case_dir)["entries"]), ["1/poroFluid/p_rgh"])
+
+            self.assertEqual(time_signature(case_dir), signature)
+            write_scalar_field(case_dir / "1" / "poroFluid" / "D", [0.0, 0.0, 0.0])
+            self.assertNotEqual(time_signature(case_dir), signature)
+
+
+class BinaryFieldTests(unittest.TestCase):
+    def test_binary_field_is_memory_mapped_with_header_arch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "D"
+            values = np.arange(12, dtype=">f4").reshape(4, 3)
+            path.write_bytes(
+                b'FoamFile\n{\n    version 2.0;\n    format binary;\n    arch "MSB;label=32;scalar=32";\n'
+                b"    class volVectorField;\n    object D;\n}\ndimensions [0 1 0 0 0 0 0];\n"
+                b"internalField nonuniform List<vector> \n4\n(" + values.tobytes() + b")\n;\nboundaryField\n{\n}\n"
+            )
+
+            mapped = read_internal_field(path)
+
+            self.assertIsInstance(mapped, np.memmap)
+            self.assertEqual(mapped.shape, (4, 3))
+            np.testing.assert_array_equal(mapped[[1, 3]], [[3, 4, 5], [9, 10, 11]])
+
+
+class ExportTests(unittest.TestCase):
+    def test_export_resumes_and_serves_cells(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "poroFluid" / "p_rgh", [1.0, 2.0, 3.0])
+            write_scalar_field(case_dir / "2" / "poroFluid" / "p_rgh", [4.0, 5.0, 6.0])
+
+            calls = []
+            export_case(case_dir, max_workers=1, progress=lambda done, total: calls.append((done, total)))
+            self.assertEqual(calls[-1], (2, 2))
+
+            calls.clear()
+            export_case(case_dir, max_workers=1, progress=lambda done, total: calls.append((done, total)))
+            self.assertEqual(calls, [])
+
+            paths = [case_dir / time / "poroFluid" / "p_rgh" for time in ("1", "2")]
+            values = ExportStore(case_dir).read_cells("poroFluid", "p_rgh", np.array([2, 0]), ["1", "2"], paths)
+            np.testing.assert_allclose(values[:, :, 0], [[3.0, 1.0], [6.0, 4.0]])
+
+            write_scalar_field(paths[1], [7.0, 8.0, 9.0, 10.0])
+            self.assertIsNone(ExportStore(case_dir).read_cells("poroFluid", "p_rgh", np.array([0]), ["2"], paths[1:]))
+            with self.assertRaisesRegex(ValueError, "has 4 values"):
+                export_case(case_dir, max_workers=1)
+
+    def test_export_of_an_edited_mesh_is_recreated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 64, n_times=1, n_probes=0, n_line_points=2)
+            export_case(case_dir, max_workers=1)
+
+            finer = write_synthetic_case(Path(tmpdir) / "finer", 216, n_times=1, n_probes=0, n_line_points=2)
+            for path in finer.rglob("*"):
+                if path.is_file() and not path.is_symlink() and (case_dir / path.relative_to(finer)).is_file():
+                    (case_dir / path.relative_to(finer)).write_bytes(path.read_bytes())
+            export_case(case_dir, max_workers=1)
+
+            path = case_dir / "0" / "poroFluid" / "p_rgh"
+            values = ExportStore(case_dir).read_cells("poroFluid", "p_rgh", np.array([215]), ["0"], [path])
+            np.testing.assert_allclose(values[0, :, 0], read_internal_field(path)[215])
+
+    def test_visualizer_reloads_the_export_store_after_an_export(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "poroFluid" / "p_rgh", [1.0, 2.0, 3.0])
+            visualizer = OpenFOAMVisualizer(case_dir, "poroFluid")
+            self.assertEqual(visualizer.get_export_store().manifest["fields"], {})
+
+            export_case(case_dir, max_workers=1)
+            store = visualizer.get_export_store()
+            self.assertTrue(store.is_current("poroFluid", "p_rgh", "1", case_dir / "1" / "poroFluid" / "p_rgh"))
+            self.assertIs(visualizer.get_export_store(), store)
+
+
+class EnvelopeTests(unittest.TestCase):
+    def test_envelopes_track_extremes_and_extend_with_new_times(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "p_rgh", [1.0, 5.0, -2.0])
+            write_scalar_field(case_dir / "2" / "p_rgh", [3.0, 4.0, -1.0])
+            compute_envelopes(case_dir, max_workers=1)
+
+            store = EnvelopeStore(case_dir)
+            np.testing.assert_array_equal(store.read_array("", "max(p_rgh)"), [3.0, 5.0, -1.0])
+            np.testing.assert_array_equal(store.read_array("", "timeOfMax(p_rgh)"), [2.0, 1.0, 2.0])
+            np.testing.assert_array_equal(store.read_array("", "min(p_rgh)"), [1.0, 4.0, -2.0])
+
+            write_scalar_field(case_dir / "3" / "p_rgh", [0.0, 6.0, -3.0])
+            manifest = compute_envelopes(case_dir, max_workers=1)
+            self.assertEqual(sorted(manifest["envelopes"]["_/p_rgh"]["times"]), ["1", "2", "3"])
+
+            store = EnvelopeStore(case_dir)
+            np.testing.assert_array_equal(store.read_array("", "max(p_rgh)"), [3.0, 6.0, -1.0])
+            np.testing.assert_array_equal(store.read_array("", "timeOfMin(p_rgh)"), [3.0, 2.0, 3.0])
+
+
+    def test_partly_written_time_steps_are_folded_in_later(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            write_scalar_field(case_dir / "1" / "p_rgh", [1.0, 5.0, -2.0])
+            (case_dir / "2").mkdir()
+            (case_dir / "2" / "p_rgh").write_text("FoamFile\n{\n    class volScalarField;\n}\ndimensions", encoding="utf-8")
+            manifest = compute_envelopes(case_dir, max_workers=1)
+            self.assertEqual(sorted(manifest["envelopes"]["_/p_rgh"]["times"]), ["1"])
+
+            write_scalar_field(case_dir / "2" / "p_rgh", [3.0, 4.0, -1.0])
+            manifest = compute_envelopes(case_dir, max_workers=1)
+            self.assertEqual(sorted(manifest["envelopes"]["_/p_rgh"]["times"]), ["1", "2"])
+            np.testing.assert_array_equal(EnvelopeStore(case_dir).read_array("", "max(p_rgh)"), [3.0, 5.0, -1.0])
+
+
+class GlyphSamplingTests(unittest.TestCase):
+    def test_uniform_sampling_ignores_local_refinement(self):
+        rng = np.random.default_rng(0)
+        refined = rng.random((20000, 3)) * [0.1, 0.1, 0.0]
+        coarse = rng.random((2000, 3)) * [1.0, 1.0, 0.0]
+        points = np.concatenate([refined, coarse])
+
+        ids = uniform_sample_ids(points, 100)
+
+        self.assertLessEqual(len(ids), 100)
+        self.assertGreater(len(ids), 50)
+        # The refined corner covers 1% of the area and must not dominate the selection
+        in_corner = np.all(points[ids, :2] < 0.1, axis=1).sum()
+        self.assertLess(in_corner, 10)
+
+
+class LodSurfaceTests(unittest.TestCase):
+    def test_decimated_surfaces_follow_mesh_edits(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            (case_dir / "0").mkdir()
+            owner = case_dir / "constant" / "polyMesh" / "owner"
+            owner.parent.mkdir(parents=True)
+            owner.write_text("first", encoding="utf-8")
+            visualizer = OpenFOAMVisualizer(case_dir)
+
+            small = pv.Cube().cast_to_unstructured_grid()
+            first = visualizer.get_lod_blocks([small], ["internalMesh"], "0", 10_000)[0]
+            self.assertIs(visualizer.get_lod_blocks([small], ["internalMesh"], "0", 10_000)[0], first)
+
+            owner.write_text("second", encoding="utf-8")
+            os.utime(owner, ns=(owner.stat().st_atime_ns, owner.stat().st_mtime_ns + 1_000_000))
+            edited = pv.Sphere().cast_to_unstructured_grid()
+            second = visualizer.get_lod_blocks([edited], ["internalMesh"], "0", 10_000)[0]
+            self.assertEqual(second.n_cells, edited.extract_surface().triangulate().n_cells)
+
+
+class CellLocatorTests(unittest.TestCase):
+    def test_locator_matches_containing_cells(self):
+        mesh = pv.ImageData(dimensions=(6, 5, 4), spacing=(0.2, 0.25, 1.0 / 3.0)).cast_to_unstructured_grid()
+        rng = np.random.default_rng(1)
+        points = np.concatenate([rng.random((200, 3)), [[2.0, 0.5, 0.5], [-0.1, 0.5, 0.5]]])
+
+        cell_ids = CellLocator(mesh).locate(points)
+
+        np.testing.assert_array_equal(cell_ids, mesh.find_containing_cell(points))
+        self.assertEqual(list(cell_ids[-2:]), [-1, -1])
+
+
+class SpaceTimeTests(unittest.TestCase):
+    def test_profiles_stack_onto_first_distance_axis(self):
+        distance = cumulative_distance([[0, 0, 0], [3, 4, 0], [3, 4, 2]])
+        np.testing.assert_allclose(distance, [0, 5, 7])
+
+        times, axis, values = stack_profiles(
+            [2.0, 1.0],
+            [np.array([0.0, 7.0]), distance],
+            [np.array([[0.0], [7.0]]), np.array([[1.0], [2.0], [3.0]])],
+        )
+
+        np.testing.assert_allclose(times, [1.0, 2.0])
+        np.testing.assert_allclose(axis, distance)
+        self.assertEqual(values.shape, (2, 3, 1))
+        np.testing.assert_allclose(values[1, :, 0], [0.0, 5.0, 7.0])
+
+    def test_line_over_time_finds_underscored_field(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir)
+            (case_dir / "0").mkdir()
+            for time, scale in (("1", 1.0), ("2", 2.0)):
+                sample_dir = case_dir / "postProcessing" / "line" / time
+                sample_dir.mkdir(parents=True)
+                (sample_dir / "line_p_rgh.xy").write_text(
+                    f"0 0 0 {scale}\n0 3 4 {2 * scale}\n", encoding="utf-8")
+
+            self.assertEqual(list(read_xy_files(sample_dir).columns), ["x", "y", "z", "p_rgh_0"])
+            line = OpenFOAMVisualizer(case_dir).read_line_over_time("line", "p_rgh")
+
+            self.assertEqual(line.components, ("p_rgh_0",))
+            np.testing.assert_allclose(line.distance, [0.0, 5.0])
+            np.testing.assert_allclose(line.values[:, :, 0], [[1.0, 2.0], [2.0, 4.0]])
+
+
+    def test_set_names_with_underscores_are_stripped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample_dir = Path(tmpdir)
+            (sample_dir / "line_centre_p_rgh.xy").write_text("0 0 0 1\n0 0 1 2\n", encoding="utf-8")
+            (sample_dir / "line_centre_U.xy").write_text("0 0 0 1 0 0\n0 0 1 2 0 0\n", encoding="utf-8")
+            data = read_xy_files(sample_dir)
+            self.assertEqual(list(data.columns), ["x", "y", "z", "U_0", "U_1", "U_2", "p_rgh"])
+            np.testing.assert_allclose(data["U_0"], [1.0, 2.0])
+
+            (sample_dir / "line_centre_U.xy").unlink()
+            self.assertEqual(list(read_xy_files(sample_dir, "line_centre").columns), ["x", "y", "z", "p_rgh_0"])
+            self.assertEqual(set_field_names(["line_centre_p_rgh"]), {"line_centre_p_rgh": "centre_p_rgh"})
+
+
+class VisualizerRegistryTests(unittest.TestCase):
+    def test_registry_shares_and_evicts_unreferenced_visualizers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = Path(tmpdir) / "case"
+            (case_dir / "0").mkdir(parents=True)
+            registry = VisualizerRegistry(idle_timeout=0.0)
+
+            held = registry.acquire(case_dir / ".." / "case")
+            self.assertIs(registry.get(case_dir), held)
+            self.assertIsNot(registry.get(case_dir, "solid"), held)
+
+            (case_dir / "1").mkdir()
+            self.assertEqual(len(registry.invalidate(case_dir)), 2)
+            self.assertEqual(held.latest_time, "1")
+
+            self.assertEqual(registry.evict_idle(), 1)
+            registry.release(case_dir)
+            self.assertEqual(registry.evict_idle(), 1)
+            self.assertIsNot(registry.get(case_dir), held)
+
+    def test_region_visualizers_share_one_reader(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 64, n_times=1, n_probes=0, n_line_points=2)
+            registry = VisualizerRegistry()
+            solid, fluid = registry.get(case_dir, "solid"), registry.get(case_dir, "poroFluid")
+            reader = solid.get_region_reader()
+            self.assertIs(fluid.get_region_reader(), reader)
+            self.assertEqual(reader.regions, ["poroFluid", "solid"])
+            self.assertIs(fluid.read_region("solid"), solid.read_region("solid"))
+
+            registry.invalidate(case_dir)
+            self.assertIsNot(solid.get_region_reader(), reader)
+            self.assertIs(fluid.get_region_reader(), solid.get_region_reader())
+
+    def test_shared_visualizer_drops_caches_of_an_edited_mesh(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            case_dir = write_synthetic_case(Path(tmpdir) / "case", 64, n_times=1, n_probes=0, n_line_points=2)
+            visualizer = VisualizerRegistry().get(case_dir, "poroFluid")
+            self.assertEqual(visualizer.read_full_case()["internalMesh"].n_cells, 64)
+
+            update_field_statistics(case_dir, max_workers=1)
+            self.assertIsNotNone(visualizer.get_field_range("p_rgh"))
+
+            # Rewrite the files in place, which leaves the directory modification times as they are
+            finer = write_synthetic_case(Path(tmpdir) / "finer", 216, n_times=1, n_probes=0, n_line_points=2)
+            for path in finer.rglob("*"):
+                if path.is_file() and not path.is_symlink() and (case_dir / path.relative_to(finer)).is_file():
+                    (case_dir / path.relative_to(finer)).write_bytes(path.read_bytes())
+            self.assertEqual(visualizer.read_full_case()["internalMesh"].n_cells, 216)
+            update_field_statistics(case_dir, max_workers=1)
+            self.assertEqual(visualizer.get_field_range("p_rgh"),
+                             field_range(load_field_statistics(case_dir), "p_rgh", "poroFluid"))
+
+
+if __name__ == "__main__":
+    unittest.main()
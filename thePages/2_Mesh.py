@@ -1,6 +1,6 @@
 import streamlit as st
 from state import get_selected_case_path, get_case_data, has_mesh
-from stages.mesh.mesh import main3D, main2D, plot_foam_mesh
+from stages.mesh.mesh import main3D, main2D, mesh_regions, plot_foam_mesh, render_zone_builder, show_mesh_quality
 from plotting_helpers import add_visu_sidebar
 
 st.title("Mesh")  # Change the title for each page
@@ -10,7 +10,7 @@ if get_selected_case_path() is None:
 elif not get_selected_case_path().exists(): #Better safe than sorry
     st.warning("Case does not exist. Please try Case Selection again.")
 else:
-    st.caption("Supported in alpha: OpenFOAM mesh import, blockMesh, and the current 2D cartesian2DMesh path when its executable is available.")
+    st.caption("Supported in alpha: OpenFOAM mesh import, layered structured meshes, blockMesh, the current 2D cartesian2DMesh path when its executable is available, and geometric cellZones.")
 
     col1, col2 = st.columns(2,gap="medium")
 
@@ -25,10 +25,6 @@ else:
             st.subheader("Load a mesh")
             main2D()
 
-            st.subheader("CellZones")
-            st.caption("Cell zone inspection is available after loading or generating a mesh.")
-            st.write("Current cell zone editing remains outside the alpha scope.")
-
             st.subheader("Refinements")
             st.warning("Advanced 2D refinements are experimental and disabled in alpha.")
             with st.expander("Surface Refinements"):
@@ -38,6 +34,9 @@ else:
                 st.number_input("Volume refinement level", value=0, disabled=True)
                 st.button("Apply Volume Refinements", disabled=True, key="volume_refinements_disabled")
 
+        st.subheader("CellZones")
+        render_zone_builder(get_selected_case_path())
+
     with col2:
         if has_mesh():
 
@@ -50,6 +49,11 @@ else:
                 add_visu_sidebar()
                 st.subheader("Current mesh")
                 vis = st.session_state.vis
+                regions = mesh_regions(get_selected_case_path())
+                region = regions[0] if regions else ""
+                if len(regions) > 1:
+                    region = st.selectbox("Region", regions, format_func=lambda name: name or "default",
+                                          key="mesh_view_region")
 
                 # Use our new visualization function
                 plot_foam_mesh(
@@ -61,5 +65,10 @@ else:
                     color_patches=vis["color_patches"],
                     show_boundaries=vis["show_boundaries"],
                     only_boundaries=vis["only_boundaries"],
-                    opacity=vis["opacity"]
+                    opacity=vis["opacity"],
+                    full_resolution=vis.get("full_resolution", False),
+                    region=region or None,
                 )
+
+            st.subheader("Mesh quality")
+            show_mesh_quality(get_selected_case_path())
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import pandas as pd
 import streamlit as st
 
 from alpha_runtime import (
@@ -10,6 +11,7 @@ from alpha_runtime import (
     tail_run_log,
 )
 from render_inputs import render_input_element
+from stages.mesh.renumber import load_renumber_record, record_renumbering, renumber_case, step_time_comparison
 from state import *
 
 
@@ -85,6 +87,56 @@ def render_run_panel(case_dir: Path):
         st.info("No solver log output yet.")
 
 
+def render_renumbering(case_dir: Path, is_running: bool) -> None:
+    """Optional pre-run stage: renumber the cells with reverse Cuthill-McKee to reduce the matrix bandwidth."""
+    with st.expander("Renumber cells before running (reverse Cuthill-McKee)"):
+        st.caption("Rewrites the polyMesh, cellZones and the volume fields of all time directories in a "
+                   "bandwidth-reducing cell order. Meshes from cartesian2DMesh or imported archives often benefit.")
+        if st.button("Renumber cells", disabled=is_running, key="renumber_cells"):
+            try:
+                with st.spinner("Renumbering cells..."):
+                    results = renumber_case(case_dir)
+                # Only written when a mesh changed, so an earlier comparison is kept otherwise
+                record_renumbering(case_dir, results)
+            except (OSError, ValueError) as exc:
+                st.error(f"Could not renumber the cells: {exc}")
+            else:
+                changed = [result for result in results if result.bandwidth_after < result.bandwidth_before]
+                n_fields = sum(len(result.fields) for result in changed)
+                if changed:
+                    st.success(f"Renumbered {sum(result.n_cells for result in changed):,} cells in {len(changed)} "
+                               f"mesh{'es' if len(changed) > 1 else ''} and {n_fields} field "
+                               f"file{'' if n_fields == 1 else 's'}")
+                else:
+                    st.info("The cells are already well ordered; nothing was changed")
+                for result in results:
+                    if result.skipped:
+                        regions = ", ".join(region or "default" for region in result.regions)
+                        st.warning(f"Not renumbered in the mesh of {regions}: {', '.join(result.skipped)}")
+
+        record = load_renumber_record(case_dir)
+        if record is None:
+            return
+        st.caption(f"Last renumbered at {record['renumbered_at']}")
+        st.dataframe(
+            pd.DataFrame(
+                [(regions, before, after) for regions, (before, after) in record["regions"].items()],
+                columns=["Region", "Bandwidth before", "Bandwidth after"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+        step_times = step_time_comparison(case_dir)
+        col1, col2 = st.columns(2)
+        col1.metric("Step time before [s]", "-" if step_times["before"] is None else f"{step_times['before']:.4g}",
+                    help="Mean ExecutionTime per step of the last run before renumbering")
+        if step_times["after"] is None:
+            col2.metric("Step time after [s]", "-", help="Available once a run after renumbering has written steps")
+        else:
+            delta = None if step_times["before"] is None else f"{step_times['after'] - step_times['before']:+.4g} s"
+            col2.metric("Step time after [s]", f"{step_times['after']:.4g}", delta=delta, delta_color="inverse")
+
+
 st.title("Run Simulation")
 
 case_dir = get_selected_case_path()
@@ -113,4 +165,5 @@ else:
                     st.success("Run settings saved.")
 
     with tabs[1]:
+        render_renumbering(case_dir, sync_run_metadata(case_dir)["status"] == "running")
         render_run_panel(case_dir)
@@ -1,14 +1,27 @@
 from pathlib import Path
 
+import matplotlib.pyplot as plt
+import pandas as pd
 import streamlit as st
 
 from alpha_runtime import get_post_processing_path, list_time_directories
+from foam_io import time_signature
+from plotting_helpers import get_openfoam_visualizer
+from postprocessing.envelopes import EnvelopeJob, EnvelopeStore, envelope_dir
+from postprocessing.export import ExportJob, export_dir
+from postprocessing.statistics import (
+    STATS_INDEX_NAME, StatisticsJob, load_field_statistics, stats_index_path, summarise_fields,
+)
 from state import get_selected_case_path
 
 
 st.title("Post Processing")
-st.warning("Post-processing actions are experimental and disabled in alpha.")
-st.caption("The alpha build focuses on setup plus solver launch. This page stays read-only so you can inspect passive case outputs.")
+st.warning("Post-processing is experimental in alpha.")
+st.caption(
+    "Solver outputs are never modified. Field statistics of new time directories are indexed "
+    f"in the background into {STATS_INDEX_NAME}; exports and envelopes are only written to the "
+    "case when you start them."
+)
 
 case_dir = get_selected_case_path()
 if case_dir is None:
@@ -25,6 +38,67 @@ else:
     if time_dirs:
         st.write("Available time directories:")
         st.code("\n".join(time_dirs), language="text")
+
+        st.subheader("Field Statistics")
+        # Indexed again only when a time directory changed, or on request
+        statistics_jobs = st.session_state.setdefault("statistics_jobs", {})
+        signature = time_signature(case_dir)
+        indexed_signature, statistics_job = statistics_jobs.get(str(case_dir), (None, None))
+        if statistics_job is not None and statistics_job.running:
+            st.progress(statistics_job.done / statistics_job.total if statistics_job.total else 0.0,
+                        text=f"Indexing field files {statistics_job.done}/{statistics_job.total}")
+            st.button("Refresh statistics progress")
+        else:
+            if statistics_job is not None and statistics_job.error:
+                st.warning(f"Could not update the field statistics: {statistics_job.error}")
+            if signature != indexed_signature or st.button("Update statistics"):
+                statistics_jobs[str(case_dir)] = (signature, StatisticsJob(case_dir).start())
+                st.rerun()
+        stats_index = load_field_statistics(case_dir)
+        if stats_index.get("pending"):
+            st.caption("Not indexed yet, probably still being written: " + ", ".join(sorted(stats_index["pending"])))
+        stats_rows = summarise_fields(stats_index)
+        if stats_rows:
+            st.caption(f"Statistics index: {stats_index_path(case_dir)}")
+            st.dataframe(pd.DataFrame(stats_rows), hide_index=True, use_container_width=True)
+        else:
+            st.info("No volume fields were found in the time directories.")
+
+        st.subheader("Export")
+        st.caption(f"Fields, cellZone means, probes and line samples are exported to {export_dir(case_dir)}")
+        export_jobs = st.session_state.setdefault("export_jobs", {})
+        export_job = export_jobs.get(str(case_dir))
+        if export_job is not None and export_job.running:
+            st.progress(export_job.done / export_job.total if export_job.total else 0.0,
+                        text=f"Exporting {export_job.done}/{export_job.total}")
+            st.button("Refresh export progress")
+        else:
+            if export_job is not None:
+                if export_job.error:
+                    st.error(f"Export failed: {export_job.error}")
+                else:
+                    st.success(f"Export finished ({export_job.total} items)")
+            if st.button("Export results"):
+                export_jobs[str(case_dir)] = ExportJob(case_dir).start()
+                st.rerun()
+
+        st.subheader("Envelopes")
+        st.caption(f"Per-cell extremes over all time steps are stored in {envelope_dir(case_dir)}")
+        envelope_jobs = st.session_state.setdefault("envelope_jobs", {})
+        envelope_job = envelope_jobs.get(str(case_dir))
+        if envelope_job is not None and envelope_job.running:
+            st.progress(envelope_job.done / envelope_job.total if envelope_job.total else 0.0,
+                        text=f"Reducing fields {envelope_job.done}/{envelope_job.total}")
+            st.button("Refresh envelope progress")
+        else:
+            if envelope_job is not None and envelope_job.error:
+                st.error(f"Envelope computation failed: {envelope_job.error}")
+            envelope_rows = EnvelopeStore(case_dir).summary()
+            if envelope_rows:
+                st.dataframe(pd.DataFrame(envelope_rows), hide_index=True, use_container_width=True)
+            if st.button("Update envelopes"):
+                envelope_jobs[str(case_dir)] = EnvelopeJob(case_dir).start()
+                st.rerun()
     else:
         st.info("No OpenFOAM time directories were found yet.")
 
@@ -33,6 +107,24 @@ else:
         if children:
             st.write("Current postProcessing entries:")
             st.code("\n".join(children), language="text")
+
+            line_samples = [
+                name for name in children
+                if any(Path(post_processing_path, name).glob("*/*.xy"))
+            ]
+            if line_samples:
+                st.subheader("Space-Time Profile")
+                sample_name = st.selectbox("Line sample", line_samples)
+                field_name = st.text_input("Field", value="p_rgh")
+                if field_name:
+                    try:
+                        visualizer = get_openfoam_visualizer(case_dir)
+                        line = visualizer.read_line_over_time(sample_name, field_name)
+                        ax = visualizer.plot_space_time(line)
+                        st.pyplot(ax.figure)
+                        plt.close(ax.figure)
+                    except (FileNotFoundError, ValueError) as exc:
+                        st.info(str(exc))
         else:
             st.info("The postProcessing directory exists but is empty.")
     else:
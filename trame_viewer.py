@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import threading
+import uuid
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import pyvista as pv
+
+from OpenFOAMVisualizer import VISUALIZER_REGISTRY
+
+# Meshes above this cell count are rendered on the server and streamed as images
+REMOTE_RENDERING_CELLS = 500_000
+
+# Seconds to wait for the trame server to bind its port
+SERVER_START_TIMEOUT = 30.0
+
+# Address the trame servers bind to; all interfaces, like the Streamlit server itself
+TRAME_HOST_ENV = "PMF_TRAME_HOST"
+DEFAULT_TRAME_HOST = "0.0.0.0"
+
+# Address of the viewer as seen by the browser, e.g. "https://example.org/trame/{port}/" behind a proxy
+TRAME_PUBLIC_URL_ENV = "PMF_TRAME_PUBLIC_URL"
+
+# Seconds to wait when checking that a viewer port accepts connections
+REACHABLE_TIMEOUT = 0.5
+
+
+def viewer_url(port: int, request_host: str | None = None, scheme: str = "http") -> str:
+    """
+    Address of a viewer for the browser.
+
+    ``PMF_TRAME_PUBLIC_URL`` takes precedence, with ``{port}`` replaced by the
+    viewer port. Otherwise the host name the browser used to reach Streamlit
+    (its Host header) is combined with the viewer port.
+    """
+    public_url = os.environ.get(TRAME_PUBLIC_URL_ENV)
+    if public_url:
+        return public_url.replace("{port}", str(port))
+    host = urlsplit(f"//{request_host}").hostname if request_host else None
+    if not host:
+        host = "localhost"
+    elif ":" in host:
+        host = f"[{host}]"
+    return f"{scheme}://{host}:{port}/"
+
+
+def url_reachable(url: str, timeout: float = REACHABLE_TIMEOUT) -> bool:
+    """Whether the host and port of a URL accept TCP connections from this machine."""
+    parts = urlsplit(url)
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        with socket.create_connection((parts.hostname, port), timeout=timeout):
+            return True
+    except (OSError, ValueError):
+        return False
+
+
+class MeshViewerSession:
+    """
+    Long-lived trame server showing the mesh of one case.
+
+    The session owns an off-screen PyVista plotter with one actor per mesh block.
+    View settings are applied to the existing actors in place, so changing opacity,
+    colouring or style never rebuilds or re-serialises the geometry. Large meshes
+    are rendered server-side and streamed to the browser as images. Unless
+    ``full_resolution`` is set, the blocks are the decimated outer surfaces of
+    the static export.
+    """
+
+    def __init__(self, case_path: Path | str, region: str | None = None, full_resolution: bool = False):
+        from trame.app import get_server
+
+        self.case_path = Path(case_path)
+        self.region = region or None
+        self.full_resolution = full_resolution
+        # Hold the shared visualizer for the lifetime of the server
+        self.visualizer = VISUALIZER_REGISTRY.acquire(self.case_path, self.region)
+        self.server = get_server(f"pmf_mesh_{uuid.uuid4().hex}", client_type="vue2")
+        self.plotter = pv.Plotter(off_screen=True)
+        self.block_names: list[str] = []
+        self.remote = False
+        self.signature: tuple = ()
+        self.settings: dict[str, Any] = {}
+
+        self._view = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def url(self, request_host: str | None = None, scheme: str = "http") -> str:
+        return viewer_url(self.server.port, request_host, scheme)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, signature: tuple = ()) -> "MeshViewerSession":
+        """Build the actors, lay out the page and start the server in a background thread."""
+        from trame.ui.vuetify import SinglePageLayout
+        from trame.widgets import vtk as vtk_widgets
+
+        self.load_mesh(signature)
+
+        with SinglePageLayout(self.server) as layout:
+            layout.toolbar.hide()
+            layout.footer.hide()
+            with layout.content:
+                if self.remote:
+                    self._view = vtk_widgets.VtkRemoteView(self.plotter.ren_win, interactive_ratio=1)
+                else:
+                    self._view = vtk_widgets.VtkLocalView(self.plotter.ren_win)
+
+        self.server.controller.on_server_ready.add(lambda **_: self._ready.set())
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+        if not self._ready.wait(SERVER_START_TIMEOUT):
+            raise RuntimeError("The trame mesh viewer did not start in time")
+        return self
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self.server.start(
+            port=0,
+            thread=True,
+            open_browser=False,
+            show_connection_info=False,
+            disable_logging=True,
+            timeout=0,
+            host=os.environ.get(TRAME_HOST_ENV, DEFAULT_TRAME_HOST),
+        )
+
+    def load_mesh(self, signature: tuple = ()) -> None:
+        """Create one actor per mesh block. Only needed once per mesh."""
+        self.visualizer.visualize_mesh(
+            plotter=self.plotter,
+            show_boundaries=True,
+            only_boundaries=False,
+            lod_target=None if self.full_resolution else self.visualizer.LOD_TARGET_TRIANGLES,
+        )
+        self.plotter.view_isometric()
+
+        data = self.visualizer.read_full_case()
+        self.block_names = [name for name in data.keys() if name in self.plotter.actors]
+        n_cells = sum(self.plotter.actors[name].mapper.dataset.n_cells for name in self.block_names)
+        self.remote = n_cells > REMOTE_RENDERING_CELLS
+        self.signature = signature
+
+    def apply_settings(self, show_mesh: bool = True, bg_darkness: float = 0.35,
+                       selected_palette: str = "deep", style: str = "surface",
+                       color_patches: bool = False, show_boundaries: bool = True,
+                       only_boundaries: bool = False, opacity: float = 1.0, **_ignored) -> None:
+        """Update the existing actors in place and push the change to the browser."""
+        settings = {
+            "show_mesh": show_mesh,
+            "bg_darkness": bg_darkness,
+            "selected_palette": selected_palette,
+            "style": style,
+            "color_patches": color_patches,
+            "show_boundaries": show_boundaries,
+            "only_boundaries": only_boundaries,
+            "opacity": opacity,
+        }
+        if settings == self.settings:
+            return
+
+        bg_value = 1.0 - bg_darkness
+        self.plotter.background_color = (bg_value, bg_value, bg_value)
+        edge_color = "black" if bg_darkness < 0.25 else "white"
+
+        visible = [
+            name for name in self.block_names
+            if not (only_boundaries and "internalmesh" in name.lower())
+            and (show_boundaries or "internalmesh" in name.lower())
+        ]
+        colors = dict(zip(visible, self.visualizer.get_patch_colors(len(visible), selected_palette)))
+
+        for name in self.block_names:
+            prop = self.plotter.actors[name].prop
+            self.plotter.actors[name].visibility = name in visible
+            prop.style = style
+            prop.show_edges = (show_mesh or style == "wireframe") and style != "points"
+            prop.edge_color = edge_color
+            prop.opacity = opacity
+            prop.color = colors[name] if color_patches and name in colors else "lightgray"
+
+        self.settings = settings
+        self.push()
+
+    def push(self) -> None:
+        """Send the current scene to the client from the server's event loop."""
+        if self._loop is None or self._view is None:
+            return
+        self._loop.call_soon_threadsafe(self._view.update)
+
+    def close(self) -> None:
+        if self._loop is not None and self.running:
+            asyncio.run_coroutine_threadsafe(self.server.stop(), self._loop)
+        self.plotter.close()
+        if self.visualizer is not None:
+            VISUALIZER_REGISTRY.release(self.case_path, self.region)
+            self.visualizer = None
+
+
+def get_mesh_viewer(sessions: dict, case_path: Path | str, signature: tuple = (), region: str | None = None,
+                    full_resolution: bool = False) -> MeshViewerSession:
+    """
+    Return the running viewer for a case from a per-session store, starting one if needed.
+
+    Viewers of other cases in the same store are shut down. A viewer is replaced
+    when the mesh signature, the region or the resolution changes, otherwise it
+    is reused as is.
+    """
+    key = str(Path(case_path).resolve())
+    for other_key in [other for other in sessions if other != key]:
+        sessions.pop(other_key).close()
+
+    session = sessions.get(key)
+    if session is not None and (not session.running or session.signature != signature
+                                or session.region != (region or None) or session.full_resolution != full_resolution):
+        sessions.pop(key).close()
+        session = None
+
+    if session is None:
+        session = MeshViewerSession(case_path, region, full_resolution).start(signature)
+        sessions[key] = session
+    return session